@@ -0,0 +1,273 @@
+import json
+import multiprocessing
+import multiprocessing.queues
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+from bluepynt import GraphCache, mapping
+from bluepynt.hot_reload import ModuleWatcher
+from bluepynt.manifest import load_nodes_from_plugins
+from bluepynt.parallel import ParallelEvaluator
+from bluepynt.session import GraphSession
+# Imported from the same root as the engine modules using them (pins, bluepynt.session), a second copy of a
+# module would keep its own caches and classes
+from optimizer import Optimizer
+from output_cache import OutputCache
+from profiler import Profiler
+
+
+class JobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job:
+    def __init__(self, data: dict | None, sid: str | None = None, profile: bool = False, stream_profile: bool = False,
+                 session: GraphSession | None = None):
+        self.job_id = uuid.uuid4().hex
+        self.data = data
+        # Runs the live graph of an editor instead of data
+        self.session = session
+        self.sid = sid
+        self.profile = profile
+        self.stream_profile = stream_profile
+        self.status = JobStatus.PENDING
+        self.result = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        # Resolved with the job once it has finished, so it can be awaited
+        self.finished: Future = Future()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def to_json(self):
+        return {
+            "jobId": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+# Every worker process keeps its own cache, threads share this one
+graph_cache = GraphCache(optimizer=Optimizer())
+mapping.ON_NODES_LOADED.append(graph_cache.invalidate)
+# Outputs of nodes with CACHE_OUTPUTS, worker processes keep their own memory tier and share the disk tier
+output_cache = OutputCache()
+mapping.ON_NODES_LOADED.append(output_cache.invalidate)
+# Evaluates independent expensive pure branches at once when enabled, every worker process has its own pool
+parallel_evaluator: ParallelEvaluator | None = None
+
+
+def execute_graph(data: dict, progress_callback: Callable[[str, dict], None] | None = None, profile: bool = False,
+                  stream_profile: bool = False):
+    graphs = graph_cache.load(data)
+    if not profile:
+        result = graphs[0].execute(progress_callback, output_cache=output_cache,
+                                   parallel=parallel_evaluator).to_json()
+    else:
+        on_update = None
+        if stream_profile and progress_callback is not None:
+            on_update = partial(progress_callback, "profile")
+        profiler = Profiler(on_update)
+        result = {**profiler.run(graphs[0], progress_callback, output_cache).to_json(), "profile": profiler.to_json()}
+
+    # Results leave the worker as JSON, values that cannot be represented are sent as their string form
+    return json.loads(json.dumps(result, default=str))
+
+
+def execute_session(session: GraphSession, progress_callback: Callable[[str, dict], None] | None = None):
+    frame = session.execute(progress_callback)
+    return json.loads(json.dumps({"result": frame.to_json(), **session.stats()}, default=str))
+
+
+# region Process workers
+
+_progress_queue: multiprocessing.queues.Queue | None = None
+
+
+def _initialize_process(progress_queue: multiprocessing.queues.Queue, module_paths: list[str],
+                        manifest_paths: list[str], graph_cache_size: int, optimize: bool, trusted: bool,
+                        hot_reload: bool, output_cache_size: int, output_cache_disk_size: int, pure_workers: int):
+    global _progress_queue, parallel_evaluator
+    _progress_queue = progress_queue
+    graph_cache.max_nodes = graph_cache_size
+    graph_cache.optimizer = Optimizer() if optimize else None
+    graph_cache.trusted = trusted
+    output_cache.max_bytes = output_cache_size
+    output_cache.max_disk_bytes = output_cache_disk_size
+    if pure_workers > 0:
+        parallel_evaluator = ParallelEvaluator(pure_workers)
+    for module_path in module_paths:
+        if module_path not in mapping.LOADED_MODULES:
+            mapping.load_nodes_from_module(module_path)
+    for manifest_path in manifest_paths:
+        if manifest_path not in mapping.LOADED_MANIFESTS:
+            load_nodes_from_plugins(manifest_path)
+    if hot_reload:
+        ModuleWatcher().start()
+
+
+def _execute_graph_in_process(job_id: str, data: dict, profile: bool, stream_profile: bool):
+    return execute_graph(data, lambda event, event_data: _progress_queue.put((job_id, event, event_data)),
+                         profile, stream_profile)
+# endregion
+
+
+class JobQueue:
+    """
+    Runs submitted graphs on a pool of worker threads or processes, so executions never block the event loop.
+    At most max_workers jobs run at once, further jobs wait in a queue of max_queued_jobs. Sessions live in this
+    process, their executions share the queue and the limit but always run on threads.
+    """
+    def __init__(self, web_server, max_workers: int = 1, worker_type: str = "thread", max_queued_jobs: int = 100,
+                 max_finished_jobs: int = 1000, graph_cache_size: int = 100_000, optimize: bool = True,
+                 trusted: bool = False, hot_reload: bool = False, output_cache_size: int = 256 * 1024 * 1024,
+                 output_cache_disk_size: int = 1024 * 1024 * 1024, pure_workers: int = 0):
+        if worker_type not in ("thread", "process"):
+            raise ValueError(f"Unknown worker type {worker_type}, expected thread or process")
+
+        self.web_server = web_server
+        self.max_workers = max_workers
+        self.worker_type = worker_type
+        self.max_finished_jobs = max_finished_jobs
+        graph_cache.max_nodes = graph_cache_size
+        graph_cache.optimizer = Optimizer() if optimize else None
+        graph_cache.trusted = trusted
+        output_cache.max_bytes = output_cache_size
+        output_cache.max_disk_bytes = output_cache_disk_size
+
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.lock = threading.Lock()
+        self.pending: queue.Queue[Job] = queue.Queue(maxsize=max_queued_jobs)
+        self.running = threading.BoundedSemaphore(max_workers)
+
+        self.executor: Executor
+        if worker_type == "process":
+            self.progress_queue = multiprocessing.Queue()
+            self.executor = ProcessPoolExecutor(max_workers, initializer=_initialize_process,
+                                                initargs=(self.progress_queue, list(mapping.LOADED_MODULES),
+                                                          list(mapping.LOADED_MANIFESTS),
+                                                          graph_cache_size, optimize, trusted, hot_reload,
+                                                          output_cache_size, output_cache_disk_size,
+                                                          pure_workers))
+            threading.Thread(target=self.forward_progress, daemon=True).start()
+        else:
+            self.progress_queue = None
+            if pure_workers > 0:
+                global parallel_evaluator
+                parallel_evaluator = ParallelEvaluator(pure_workers)
+            self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="bluepynt-job")
+        self.session_executor: Executor = (self.executor if worker_type == "thread" else
+                                           ThreadPoolExecutor(max_workers, thread_name_prefix="bluepynt-session"))
+
+    def submit(self, data: dict, sid: str | None = None, profile: bool = False, stream_profile: bool = False) -> Job:
+        """
+        Queues the graph structure for execution. Raises queue.Full when too many jobs are waiting.
+        """
+        return self.enqueue(Job(data, sid, profile, stream_profile))
+
+    def submit_session(self, session: GraphSession, sid: str | None = None) -> Job:
+        """
+        Queues an execution of the session. Raises queue.Full when too many jobs are waiting.
+        """
+        return self.enqueue(Job(None, sid, session=session))
+
+    def enqueue(self, job: Job) -> Job:
+        # Only submitters put jobs under the lock, a queue that is not full cannot fill up before the put. The client
+        # is told the job is pending before the runner can take it
+        with self.lock:
+            if self.pending.full():
+                raise queue.Full
+            self.jobs[job.job_id] = job
+            self.send_status(job)
+            self.pending.put_nowait(job)
+        return job
+
+    def job(self, job_id: str) -> Job | None:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def job_json(self, job: Job, result: bool = False) -> dict:
+        """
+        Consistent snapshot of the job while the runner may change it, with its result once it has finished if
+        result is set.
+        """
+        with self.lock:
+            data = job.to_json()
+            if result and job.is_finished:
+                data["result"] = job.result
+            return data
+
+    def run(self):
+        """
+        Dispatches queued jobs to the pool, blocks forever - run it on a dedicated thread.
+        """
+        while True:
+            job = self.pending.get()
+            self.running.acquire()
+
+            with self.lock:
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                self.send_status(job)
+
+            if job.session is not None:
+                future = self.session_executor.submit(execute_session, job.session, partial(self.send_progress, job))
+            elif self.worker_type == "process":
+                future = self.executor.submit(_execute_graph_in_process, job.job_id, job.data, job.profile,
+                                              job.stream_profile)
+            else:
+                future = self.executor.submit(execute_graph, job.data, partial(self.send_progress, job), job.profile,
+                                              job.stream_profile)
+            future.add_done_callback(partial(self.finish, job))
+
+    def finish(self, job: Job, future: Future):
+        self.running.release()
+
+        exception = future.exception()
+        with self.lock:
+            if exception is None:
+                job.result = future.result()
+                job.status = JobStatus.COMPLETED
+            else:
+                job.error = "".join(traceback.format_exception(exception))
+                job.status = JobStatus.FAILED
+            job.finished_at = time.time()
+            self.send_status(job)
+        if exception is not None:
+            print(f"Job {job.job_id} failed:\n{job.error}")
+        job.finished.set_result(job)
+
+        with self.lock:
+            finished = [job_id for job_id, queued_job in self.jobs.items() if queued_job.is_finished]
+            for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self.jobs[job_id]
+
+    def forward_progress(self):
+        while True:
+            job_id, event, data = self.progress_queue.get()
+            job = self.job(job_id)
+            if job is not None:
+                self.send_progress(job, event, data)
+
+    def send_progress(self, job: Job, event: str, data: dict):
+        self.web_server.send_sync(event, {**data, "jobId": job.job_id}, job.sid)
+
+    def send_status(self, job: Job):
+        self.web_server.send_sync("job_status", job.to_json(), job.sid)
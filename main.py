@@ -1,13 +1,17 @@
+import argparse
 import asyncio
 import os
 import threading
 
-import mapping
+from bluepynt import mapping
+from bluepynt.hot_reload import ModuleWatcher
+from bluepynt.manifest import load_nodes_from_plugins
+from jobs import JobQueue
 from server import WebServer
 
 
-def prompt_worker():
-    pass
+def prompt_worker(job_queue: JobQueue):
+    job_queue.run()
 
 
 async def run(web_server: WebServer, address: str = "", port=8188, verbose=True):
@@ -15,20 +19,55 @@ async def run(web_server: WebServer, address: str = "", port=8188, verbose=True)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1, help="Number of graphs executed at the same time")
+    parser.add_argument("--worker-type", choices=("thread", "process"), default="thread",
+                        help="Execute graphs on worker threads or in worker processes")
+    parser.add_argument("--max-queued-jobs", type=int, default=100,
+                        help="Number of jobs that can wait for a worker before new ones are rejected")
+    parser.add_argument("--graph-cache-size", type=int, default=100_000,
+                        help="Number of nodes of loaded graphs kept in the cache of every worker")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="Execute graphs exactly as they were built, without running the optimizer passes")
+    parser.add_argument("--trusted", action="store_true",
+                        help="Check the types of graphs once when they are loaded instead of on every value set")
+    parser.add_argument("--node-manifest", default=os.path.join("tmp", "node_manifest.json"),
+                        help="Cache of the nodes of installed plugins, plugins recorded in it are imported only "
+                             "when one of their nodes is used")
+    parser.add_argument("--output-cache-size", type=int, default=256,
+                        help="Megabytes of node outputs kept in memory by every worker, for nodes that cache them")
+    parser.add_argument("--output-cache-disk-size", type=int, default=1024,
+                        help="Megabytes of node outputs kept in ~/.cache/bluepynt/node_outputs")
+    parser.add_argument("--pure-workers", type=int, default=0,
+                        help="Threads evaluating independent expensive pure branches of a graph at once, 0 evaluates "
+                             "them one after another")
+    parser.add_argument("--hot-reload", action="store_true",
+                        help="Load node modules again when their files change, without restarting the server")
+    args = parser.parse_args()
+
     mapping.load_nodes_from_module(os.path.join(os.path.dirname(os.path.realpath(__file__)), "src/bluepynt", "builtin",
                                                 "macros.py"))
     mapping.load_nodes_from_module(os.path.join(os.path.dirname(os.path.realpath(__file__)), "src/bluepynt", "builtin",
                                                 "nodes.py"))
     mapping.load_nodes_from_module(os.path.join(os.path.dirname(os.path.realpath(__file__)), "src/bluepynt", "builtin",
                                                 "pure_nodes.py"))
+    load_nodes_from_plugins(args.node_manifest)
+    if args.hot_reload:
+        ModuleWatcher().start()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     server = WebServer(loop)
 
+    server.job_queue = JobQueue(server, max_workers=args.workers, worker_type=args.worker_type,
+                                max_queued_jobs=args.max_queued_jobs, graph_cache_size=args.graph_cache_size,
+                                optimize=not args.no_optimize, trusted=args.trusted, hot_reload=args.hot_reload,
+                                output_cache_size=args.output_cache_size * 1024 * 1024,
+                                output_cache_disk_size=args.output_cache_disk_size * 1024 * 1024,
+                                pure_workers=args.pure_workers)
     server.add_routes()
 
-    threading.Thread(target=prompt_worker, daemon=True, args=()).start()
+    threading.Thread(target=prompt_worker, daemon=True, args=(server.job_queue,)).start()
 
     call_on_start = None
 
@@ -25,4 +25,5 @@ setup(
             "Stable Diffusion = stable_diffusion.stable_diffusion:StableDiffusion",
         ]
     },
+    test_suite="tests",
 )
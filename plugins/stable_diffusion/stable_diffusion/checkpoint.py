@@ -0,0 +1,84 @@
+import os
+from collections.abc import Iterator, Mapping
+
+import torch
+
+from bluepynt import report_progress
+
+# Progress is reported about this many times while the weights are copied
+PROGRESS_STEPS = 100
+
+
+class Checkpoint(Mapping):
+    """
+    State dict of a checkpoint file that is memory-mapped instead of read. Tensors are only read from the file
+    when they are accessed, so the weights are never held twice and the first ones can be used before the file
+    is read to the end. .safetensors files are opened with safetensors, other checkpoints with torch.load in mmap
+    mode (checkpoints saved with torch.save since PyTorch 1.6).
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata: dict = {}
+        self._safetensors = None
+        self._tensors: dict[str, torch.Tensor] = {}
+
+        if os.path.splitext(path)[1] == ".safetensors":
+            try:
+                from safetensors import safe_open
+            except ImportError:
+                raise Exception(f"Install safetensors to load {path}")
+            self._safetensors = safe_open(path, framework="pt", device="cpu")
+            self.metadata = self._safetensors.metadata() or {}
+            self._keys = list(self._safetensors.keys())
+        else:
+            checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=False)
+            state_dict = checkpoint.get("state_dict", checkpoint)
+            self.metadata = {key: value for key, value in checkpoint.items() if key != "state_dict"} \
+                if state_dict is not checkpoint else {}
+            self._tensors = {key: value for key, value in state_dict.items() if isinstance(value, torch.Tensor)}
+            self._keys = list(self._tensors)
+
+    def __getitem__(self, key: str) -> torch.Tensor:
+        if self._safetensors is not None:
+            if key not in self._keys:
+                raise KeyError(key)
+            return self._safetensors.get_tensor(key)
+        return self._tensors[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self):
+        self._safetensors = None
+        self._tensors = {}
+        self._keys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def load_state_dict(model: torch.nn.Module, checkpoint: Mapping[str, torch.Tensor]) -> tuple[list[str], list[str]]:
+    """
+    Copies the weights of the checkpoint into the model one tensor at a time, reporting "model_loading" progress to
+    the execution. Works like model.load_state_dict(checkpoint, strict=False), returns the missing and unexpected
+    keys.
+    """
+    model_state = model.state_dict(keep_vars=True)
+    keys = [key for key in model_state if key in checkpoint]
+    missing = [key for key in model_state if key not in checkpoint]
+    unexpected = [key for key in checkpoint if key not in model_state]
+    path = getattr(checkpoint, "path", None)
+
+    step = max(1, len(keys) // PROGRESS_STEPS)
+    with torch.no_grad():
+        for i, key in enumerate(keys):
+            model_state[key].copy_(checkpoint[key])
+            if (i + 1) % step == 0 or i + 1 == len(keys):
+                report_progress("model_loading", {"path": path, "loaded": i + 1, "total": len(keys)})
+    return missing, unexpected
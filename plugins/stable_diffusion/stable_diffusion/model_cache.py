@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+DEFAULT_MAX_BYTES = int(os.environ.get("BLUEPYNT_MODEL_CACHE_MB", "8192")) * 1024 * 1024
+
+
+def model_size(model: Any) -> int:
+    """
+    Bytes taken by the weights of a torch module (parameters and buffers), or the shallow size of other objects.
+    """
+    if hasattr(model, "parameters"):
+        tensors = list(model.parameters())
+        if hasattr(model, "buffers"):
+            tensors += list(model.buffers())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+    return sys.getsizeof(model)
+
+
+def config_key(config: Any) -> str:
+    """
+    Hash of a model config. Paths of config files include the modification time of the file.
+    """
+    if isinstance(config, (str, os.PathLike)) and os.path.isfile(config):
+        config = f"{os.path.realpath(config)}:{os.stat(config).st_mtime_ns}"
+    serialized = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class ModelCache:
+    """
+    Models loaded in this process, shared by every execution and graph. Keyed by the checkpoint path, its
+    modification time and the config, so a changed checkpoint is loaded again. The size of the cache is the size of
+    the weights of the cached models, least recently used models are evicted once it exceeds max_bytes. Models are
+    only dropped from the cache, executions using an evicted model keep it until they finish.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, size_of: Callable[[Any], int] = model_size):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        # key -> (model, size)
+        self.entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        # Keys being loaded, executions asking for the same model wait for the first load
+        self.loading: dict[tuple, threading.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(checkpoint_path: str, config: Any = None) -> tuple:
+        checkpoint_path = os.path.realpath(checkpoint_path)
+        return checkpoint_path, os.stat(checkpoint_path).st_mtime_ns, config_key(config)
+
+    def get(self, checkpoint_path: str, config: Any, load: Callable[[], Any]) -> Any:
+        """
+        Returns the cached model of the checkpoint and config, calling load to load it if it is not cached.
+        """
+        key = ModelCache.key(checkpoint_path, config)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            key_lock = self.loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+
+            try:
+                model = load()
+                self.put(key, model)
+            finally:
+                with self.lock:
+                    self.loading.pop(key, None)
+            return model
+
+    def put(self, key: tuple, model: Any):
+        size = self.size_of(model)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                return
+
+            self.entries[key] = (model, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "maxSize": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Shared by every graph executed in this process
+model_cache = ModelCache()
@@ -1,6 +1,8 @@
 import torch
 
 from bluepynt import BaseFunctionNode, InputArgumentPin, OutputArgumentPin
+from stable_diffusion.checkpoint import Checkpoint, load_state_dict
+from stable_diffusion.model_cache import model_cache
 
 
 class LoadModelNode(BaseFunctionNode):
@@ -18,13 +20,20 @@ class LoadModelNode(BaseFunctionNode):
         self.output_pin("model").set_value(self.argument_pin("path").value)
 
     def load_model_from_config(self, config, ckpt, device=torch.device("cuda"), verbose=False):
+        """
+        Returns the model of the checkpoint, shared with every other execution through the model cache.
+        """
+        return model_cache.get(ckpt, {"config": config, "device": str(device)},
+                               lambda: self.load_model_from_checkpoint(config, ckpt, device, verbose))
+
+    def load_model_from_checkpoint(self, config, ckpt, device=torch.device("cuda"), verbose=False):
         print(f"Loading model from {ckpt}")
-        pl_sd = torch.load(ckpt, map_location="cpu")
-        if "global_step" in pl_sd:
-            print(f"Global Step: {pl_sd['global_step']}")
-        sd = pl_sd["state_dict"]
-        model = instantiate_from_config(config.model)
-        m, u = model.load_state_dict(sd, strict=False)
+        # Memory-mapped, tensors are read from the file while they are copied into the model
+        with Checkpoint(ckpt) as sd:
+            if "global_step" in sd.metadata:
+                print(f"Global Step: {sd.metadata['global_step']}")
+            model = instantiate_from_config(config.model)
+            m, u = load_state_dict(model, sd)
         if len(m) > 0 and verbose:
             print("missing keys:")
             print(m)
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+try:
+    import torch
+    from stable_diffusion.checkpoint import Checkpoint, load_state_dict
+except ImportError:
+    torch = None
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        torch.manual_seed(0)
+        self.model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Linear(8, 2))
+
+    def test_torch_checkpoint(self):
+        path = os.path.join(self.directory, "model.ckpt")
+        torch.save({"state_dict": {**self.model.state_dict(), "extra": torch.ones(1)}, "global_step": 3}, path)
+
+        model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Linear(8, 2))
+        with patch("stable_diffusion.checkpoint.report_progress") as report_progress, Checkpoint(path) as sd:
+            self.assertEqual(3, sd.metadata["global_step"])
+            missing, unexpected = load_state_dict(model, sd)
+
+        self.assertEqual(([], ["extra"]), (missing, unexpected))
+        for key, value in self.model.state_dict().items():
+            self.assertTrue(torch.equal(value, model.state_dict()[key]))
+        report_progress.assert_called_with("model_loading", {"path": path, "loaded": 4, "total": 4})
+
+    def test_safetensors_checkpoint(self):
+        try:
+            from safetensors.torch import save_file
+        except ImportError:
+            self.skipTest("safetensors is not installed")
+        path = os.path.join(self.directory, "model.safetensors")
+        save_file(self.model.state_dict(), path)
+
+        model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Linear(8, 2))
+        with Checkpoint(path) as sd:
+            self.assertEqual(([], []), load_state_dict(model, sd))
+        self.assertTrue(torch.equal(self.model[1].weight, model[1].weight))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from stable_diffusion.model_cache import ModelCache, model_size
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+
+class TinyModel:
+    def __init__(self, size: int):
+        self.size = size
+
+
+def size_of(model: TinyModel) -> int:
+    return model.size
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.checkpoints = []
+        for i in range(3):
+            path = os.path.join(directory, f"model_{i}.ckpt")
+            with open(path, "wb") as f:
+                f.write(b"weights")
+            self.checkpoints.append(path)
+
+    def test_shared_models(self):
+        cache = ModelCache(max_bytes=100, size_of=size_of)
+        model = cache.get(self.checkpoints[0], {"device": "cpu"}, lambda: TinyModel(10))
+        self.assertIs(model, cache.get(self.checkpoints[0], {"device": "cpu"}, lambda: TinyModel(10)))
+        self.assertIsNot(model, cache.get(self.checkpoints[0], {"device": "cuda"}, lambda: TinyModel(10)))
+        self.assertEqual({"entries": 2, "size": 20, "maxSize": 100, "hits": 1, "misses": 2, "evictions": 0},
+                         cache.stats())
+
+    def test_changed_checkpoint_is_loaded_again(self):
+        cache = ModelCache(max_bytes=100, size_of=size_of)
+        model = cache.get(self.checkpoints[0], None, lambda: TinyModel(10))
+        os.utime(self.checkpoints[0], ns=(0, os.stat(self.checkpoints[0]).st_mtime_ns + 1_000_000_000))
+        self.assertIsNot(model, cache.get(self.checkpoints[0], None, lambda: TinyModel(10)))
+
+    def test_budget_eviction(self):
+        cache = ModelCache(max_bytes=25, size_of=size_of)
+        first = cache.get(self.checkpoints[0], None, lambda: TinyModel(10))
+        cache.get(self.checkpoints[1], None, lambda: TinyModel(10))
+        cache.get(self.checkpoints[0], None, lambda: TinyModel(10))
+        cache.get(self.checkpoints[2], None, lambda: TinyModel(10))
+
+        self.assertEqual(1, cache.stats()["evictions"])
+        self.assertEqual(20, cache.stats()["size"])
+        self.assertIs(first, cache.get(self.checkpoints[0], None, lambda: TinyModel(10)))
+        # Larger than the whole budget, returned without being cached
+        cache.get(self.checkpoints[1], None, lambda: TinyModel(30))
+        self.assertEqual(2, cache.stats()["entries"])
+
+    def test_concurrent_loads(self):
+        cache = ModelCache(max_bytes=100, size_of=size_of)
+        loads = []
+        started = threading.Event()
+
+        def load():
+            started.wait(5)
+            loads.append(1)
+            return TinyModel(10)
+
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(cache.get(self.checkpoints[0], None, load)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        started.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(loads))
+        self.assertEqual(1, len({id(model) for model in models}))
+
+    @unittest.skipIf(torch is None, "torch is not installed")
+    def test_torch_model_size(self):
+        model = torch.nn.Linear(4, 2)
+        model.register_buffer("scale", torch.ones(3))
+        self.assertEqual((4 * 2 + 2 + 3) * 4, model_size(model))
+
+
+if __name__ == '__main__':
+    unittest.main()
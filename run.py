@@ -1,20 +1,10 @@
-from importlib.metadata import entry_points
+import os
 
-from src.bluepynt import PluginBase, Node
-
-print("Loading plugins...")
-plugins: list[PluginBase] = []
-plugin_eps = entry_points(group="bluepynt.plugins")
-for plugin_ep in plugin_eps:
-    plugins.append(plugin_ep.load()())
-    print(f"Loaded plugin - {plugin_ep.name}")
-
-NODE_MAP: dict[str, Node] = {}
+from bluepynt import mapping
+from bluepynt.manifest import load_nodes_from_plugins
 
 print("Loading nodes...")
-for plugin in plugins:
-    new_nodes = plugin.load_nodes()
-    NODE_MAP.update(map(lambda node: (node.ID, node), new_nodes))
-    print(f"Loaded {len(new_nodes)} nodes from {plugin.name}")
+count = load_nodes_from_plugins(os.path.join("tmp", "node_manifest.json"))
+print(f"Loaded {count} nodes")
 
-print(NODE_MAP)
+print(mapping.NODE_MAP)
@@ -1,6 +1,7 @@
 import asyncio
 import mimetypes
 import os
+import queue
 import struct
 import uuid
 from asyncio import AbstractEventLoop
@@ -10,8 +11,11 @@ from PIL import Image, ImageOps
 import aiohttp
 from aiohttp import web
 
-import mapping
-from bluepynt import Bluepynt
+import jobs
+from jobs import JobStatus
+from bluepynt import mapping
+from bluepynt.catalog import NodeCatalog, accepts_encoding
+from bluepynt.session import GraphSession
 
 routes = web.RouteTableDef()
 
@@ -53,6 +57,11 @@ class WebServer:
         self.routes = routes
         self.last_node_id = None
         self.client_id = None
+        self.job_queue = None
+        self.catalog = NodeCatalog()
+        mapping.ON_NODES_LOADED.append(self.catalog.invalidate)
+        # Live graphs of the editors, by the sid of their websocket
+        self.sessions: dict[str, GraphSession] = {}
 
         @routes.get('/ws')
         async def websocket_handler(request):
@@ -76,6 +85,7 @@ class WebServer:
                         print('ws connection closed with exception %s' % ws.exception())
             finally:
                 self.sockets.pop(sid, None)
+                self.sessions.pop(sid, None)
             return ws
 
         @routes.get("/")
@@ -84,18 +94,104 @@ class WebServer:
 
         @routes.get("/api/nodes")
         async def get_nodes(request):
-            nodes = []
-            for node_id in mapping.NODE_MAP:
-                node = mapping.NODE_MAP[node_id]()
-                nodes.append(node.to_json())
-            return web.json_response(nodes)
+            category = request.rel_url.query.get("category")
+            # Only a changed registry has to be serialized again, that happens off the event loop
+            payload = self.catalog.cached_payload(category) or await asyncio.to_thread(self.catalog.payload, category)
+
+            headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+            if payload.matches(request.headers.get("If-None-Match", "")):
+                return web.Response(status=304, headers=headers)
+            if accepts_encoding(request.headers.get("Accept-Encoding", ""), "gzip"):
+                return web.Response(body=payload.compressed, content_type="application/json",
+                                    headers={**headers, "Content-Encoding": "gzip"})
+            return web.Response(body=payload.body, content_type="application/json", headers=headers)
 
         @routes.post("/api/execute")
         async def post_execute(request):
             data = await request.json()
-            graphs = Bluepynt.load_graph_from_structure(data)
-            graphs[0].execute()
-            return web.json_response({})
+            sid = request.rel_url.query.get('clientId', data.get("clientId"))
+            try:
+                job = self.job_queue.submit(data, sid)
+            except queue.Full:
+                return web.json_response({"error": "Too many queued jobs, try again later"}, status=503)
+            return web.json_response(self.job_queue.job_json(job), status=202)
+
+        @routes.post("/api/profile")
+        async def post_profile(request):
+            data = await request.json()
+            sid = request.rel_url.query.get('clientId', data.get("clientId"))
+            try:
+                job = self.job_queue.submit(data, sid, profile=True, stream_profile=bool(data.get("stream", False)))
+            except queue.Full:
+                return web.json_response({"error": "Too many queued jobs, try again later"}, status=503)
+
+            await asyncio.wrap_future(job.finished)
+            if job.status == JobStatus.FAILED:
+                return web.json_response(job.to_json(), status=500)
+            return web.json_response({**job.to_json(), "profile": job.result["profile"]})
+
+        @routes.get("/api/cache")
+        async def get_cache(request):
+            return web.json_response({"graphs": jobs.graph_cache.stats(), "outputs": jobs.output_cache.stats()})
+
+        @routes.get("/api/jobs/{job_id}")
+        async def get_job(request):
+            job = self.job_queue.job(request.match_info["job_id"])
+            if job is None:
+                return web.json_response({"error": "Job not found"}, status=404)
+            return web.json_response(self.job_queue.job_json(job))
+
+        @routes.post("/api/session")
+        async def post_session(request):
+            data = await request.json()
+            sid = request.rel_url.query.get('clientId', data.get("clientId"))
+            if sid not in self.sockets:
+                return web.json_response({"error": "Sessions need a connected websocket"}, status=400)
+            try:
+                session = await asyncio.to_thread(GraphSession, data, jobs.output_cache)
+            except Exception as e:
+                return web.json_response({"error": str(e)}, status=400)
+            self.sessions[sid] = session
+            return web.json_response(session.stats())
+
+        @routes.post("/api/session/edits")
+        async def post_session_edits(request):
+            data = await request.json()
+            session = self.sessions.get(request.rel_url.query.get('clientId', data.get("clientId")))
+            if session is None:
+                return web.json_response({"error": "Session not found"}, status=404)
+            try:
+                # Waits for a running execution of the session
+                await asyncio.to_thread(session.apply, data["edits"])
+            except Exception as e:
+                return web.json_response({"error": str(e)}, status=400)
+            return web.json_response(session.stats())
+
+        @routes.post("/api/session/execute")
+        async def post_session_execute(request):
+            sid = request.rel_url.query.get('clientId')
+            session = self.sessions.get(sid)
+            if session is None:
+                return web.json_response({"error": "Session not found"}, status=404)
+            try:
+                job = self.job_queue.submit_session(session, sid)
+            except queue.Full:
+                return web.json_response({"error": "Too many queued jobs, try again later"}, status=503)
+
+            await asyncio.wrap_future(job.finished)
+            if job.status == JobStatus.FAILED:
+                return web.json_response(job.to_json(), status=500)
+            return web.json_response({**job.to_json(), **job.result})
+
+        @routes.get("/api/jobs/{job_id}/result")
+        async def get_job_result(request):
+            job = self.job_queue.job(request.match_info["job_id"])
+            if job is None:
+                return web.json_response({"error": "Job not found"}, status=404)
+            data = self.job_queue.job_json(job, result=True)
+            if "result" not in data:
+                return web.json_response(data, status=409)
+            return web.json_response(data)
 
     async def start(self, address: str = "", port: int = None):
         if port is None:
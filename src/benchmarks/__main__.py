@@ -0,0 +1,164 @@
+"""
+Benchmark suite for the graph engine.
+
+Run from the src directory:
+    PYTHONPATH=bluepynt:. python -m benchmarks run --output before.json
+    PYTHONPATH=bluepynt:. python -m benchmarks compare before.json after.json
+    PYTHONPATH=bluepynt:. python -m benchmarks memory --nodes 50000
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generators import SCENARIOS, register_builtin_nodes, variable_heavy
+from bluepynt import Bluepynt
+from profiler import Profiler
+
+# Metrics compared between revisions, lower is better for all of them
+METRICS = ("loadTime", "executionTime", "peakMemory", "perNodeOverhead")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_time(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scenario(data: dict, repeat: int) -> dict:
+    load_time = best_time(lambda: Bluepynt.load_graph_from_structure(data), repeat)
+
+    graph = Bluepynt.load_graph_from_structure(data)[0]
+    execution_time = best_time(graph.execute, repeat)
+
+    # Counted in a separate run, the profiler itself slows the execution down
+    profiler = Profiler()
+    profiler.run(graph)
+    node_executions = sum(profile.call_count for profile in profiler.profiles.values())
+
+    tracemalloc.start()
+    Bluepynt.load_graph_from_structure(data)[0].execute()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "nodes": sum(len(data_graph["nodes"]) for data_graph in data["graphs"]),
+        "nodeExecutions": node_executions,
+        "loadTime": load_time,
+        "executionTime": execution_time,
+        "peakMemory": peak_memory,
+        "perNodeOverhead": execution_time / max(node_executions, 1),
+    }
+
+
+def run(args):
+    register_builtin_nodes()
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':<24} {'nodes':>7} {'load':>10} {'execute':>10} {'peak memory':>12} {'per node':>10}")
+    for name in names:
+        result = results["scenarios"][name] = run_scenario(SCENARIOS[name](), args.repeat)
+        print(f"{name:<24} {result['nodes']:>7} {result['loadTime'] * 1000:>8.2f}ms "
+              f"{result['executionTime'] * 1000:>8.2f}ms {result['peakMemory'] / 1024:>10.0f}kB "
+              f"{result['perNodeOverhead'] * 1e6:>8.2f}us")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    print(f"Comparing {baseline.get('revision')} -> {current.get('revision')}")
+    regressions = []
+    for name, result in current["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            continue
+        changes = []
+        for metric in METRICS:
+            ratio = result[metric] / baseline["scenarios"][name][metric] if baseline["scenarios"][name][metric] \
+                else 1.0
+            changes.append(f"{metric} {ratio - 1:+.1%}")
+            if ratio > 1 + args.threshold:
+                regressions.append(f"{name} {metric}")
+        print(f"{name:<24} " + ", ".join(changes))
+
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: " + ", ".join(regressions))
+        sys.exit(1)
+
+
+def memory(args):
+    """
+    Memory retained by a loaded graph, the variable_heavy structure scaled to the requested number of nodes.
+    """
+    register_builtin_nodes()
+    data = variable_heavy(100, args.nodes // 4)
+    nodes = sum(len(data_graph["nodes"]) for data_graph in data["graphs"])
+
+    gc.collect()
+    tracemalloc.start()
+    graphs = Bluepynt.load_graph_from_structure(data)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    frame = graphs[0].execute()
+    frame_size = tracemalloc.get_traced_memory()[0] - retained
+    tracemalloc.stop()
+
+    print(f"{nodes} nodes: {retained / 2 ** 20:.1f}MB retained ({retained / nodes:.0f}B per node), "
+          f"{peak / 2 ** 20:.1f}MB peak while loading, {frame_size / 2 ** 20:.1f}MB per execution frame")
+    del frame
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmark suite for the graph engine.")
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--scenario", choices=list(SCENARIOS), nargs="+")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help="Save the results as JSON")
+    run_parser.set_defaults(command=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two saved results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Relative slowdown reported as a regression (default 0.1 = 10%%)")
+    compare_parser.set_defaults(command=compare)
+
+    memory_parser = subparsers.add_parser("memory", help="Measure the memory of a loaded graph")
+    memory_parser.add_argument("--nodes", type=int, default=50_000)
+    memory_parser.set_defaults(command=memory)
+
+    args = parser.parse_args()
+    args.command(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Synthetic graph structures (the JSON format the editor posts) used by the benchmarks. Every generator returns a
+structure that can be loaded with Bluepynt.load_graph_from_structure once the builtin nodes are registered.
+"""
+from bluepynt import mapping
+from bluepynt.builtin import macros, nodes, pure_nodes
+
+
+def register_builtin_nodes():
+    for module in (macros, nodes, pure_nodes):
+        mapping.register_nodes(module.NODE_MAP)
+
+
+class StructureBuilder:
+    def __init__(self):
+        self.nodes = [{"nodeId": "bluepynt.builtin.BeginNode", "uniqueId": "begin"}]
+        self.connections = []
+        self.variables = []
+
+    def node(self, name: str, unique_id: str, **arguments) -> str:
+        self.nodes.append({
+            "nodeId": f"bluepynt.builtin.{name}",
+            "uniqueId": unique_id,
+            "arguments": arguments,
+        })
+        return unique_id
+
+    def connect(self, from_node: str, from_pin: str, to_node: str, to_pin: str):
+        self.connections.append({"fromNode": from_node, "fromPin": from_pin, "toNode": to_node, "toPin": to_pin})
+
+    def variable(self, name: str, variable_type: str = "int", value=0):
+        self.variables.append({"name": name, "type": variable_type, "value": value})
+
+    def build(self) -> dict:
+        return {
+            "graphs": [
+                {
+                    "nodes": self.nodes,
+                    "connections": self.connections,
+                    "variables": self.variables,
+                }
+            ]
+        }
+
+
+def exec_chain(length: int) -> dict:
+    """
+    Begin node followed by a chain of Write Variable nodes with literal values - pure flow dispatch.
+    """
+    builder = StructureBuilder()
+    builder.variable("value")
+    previous = "begin"
+    for i in range(length):
+        write = builder.node("WriteVariableNode", f"write.{i}", variable="value", value=i)
+        builder.connect(previous, "exec_out", write, "exec_in")
+        previous = write
+    return builder.build()
+
+
+def pure_dag(width: int, depth: int) -> dict:
+    """
+    Layers of Add nodes, each node reading two neighbours of the previous layer, consumed by a chain of Write
+    Variable nodes at the bottom - pure pulls with a lot of fan-out.
+    """
+    builder = StructureBuilder()
+    builder.variable("value")
+    layer = [builder.node("ConstantIntNode", f"0.{i}", value=i) for i in range(width)]
+    for level in range(1, depth + 1):
+        next_layer = []
+        for i in range(width):
+            add = builder.node("AddNode", f"{level}.{i}")
+            builder.connect(layer[i], "result", add, "a")
+            builder.connect(layer[(i + 1) % width], "result", add, "b")
+            next_layer.append(add)
+        layer = next_layer
+
+    previous = "begin"
+    for i, source in enumerate(layer):
+        write = builder.node("WriteVariableNode", f"write.{i}", variable="value")
+        builder.connect(source, "result", write, "value")
+        builder.connect(previous, "exec_out", write, "exec_in")
+        previous = write
+    return builder.build()
+
+
+def nested_loops(depth: int, iterations: int, body_length: int, for_each: bool = False) -> dict:
+    """
+    Loops nested depth times, the innermost body accumulates the loop index (or item) into a variable
+    body_length times. With for_each the loops iterate over a literal list instead of a range.
+    """
+    builder = StructureBuilder()
+    builder.variable("sum")
+    previous, previous_pin = "begin", "exec_out"
+    index_node, index_pin = None, None
+    for level in range(depth):
+        if for_each:
+            loop = builder.node("ForEachLoopNode", f"loop.{level}", list=list(range(iterations)))
+            index_pin = "item"
+        else:
+            loop = builder.node("ForLoopNode", f"loop.{level}", start=0, end=iterations - 1, step=1)
+            index_pin = "i"
+        builder.connect(previous, previous_pin, loop, "exec_in")
+        previous, previous_pin = loop, "exec_body"
+        index_node = loop
+
+    for i in range(body_length):
+        read = builder.node("ReadVariableNode", f"read.{i}", variable="sum")
+        add = builder.node("AddNode", f"add.{i}")
+        write = builder.node("WriteVariableNode", f"write.{i}", variable="sum")
+        builder.connect(read, "value", add, "a")
+        builder.connect(index_node, index_pin, add, "b")
+        builder.connect(add, "result", write, "value")
+        builder.connect(previous, previous_pin, write, "exec_in")
+        previous, previous_pin = write, "exec_out"
+    return builder.build()
+
+
+def variable_heavy(variable_count: int, writes: int) -> dict:
+    """
+    Many variables, each write increments one of them through Read Variable -> Add -> Write Variable.
+    """
+    builder = StructureBuilder()
+    for i in range(variable_count):
+        builder.variable(f"var.{i}")
+
+    previous = "begin"
+    for i in range(writes):
+        name = f"var.{i % variable_count}"
+        read = builder.node("ReadVariableNode", f"read.{i}", variable=name)
+        one = builder.node("ConstantIntNode", f"one.{i}", value=1)
+        add = builder.node("AddNode", f"add.{i}")
+        write = builder.node("WriteVariableNode", f"write.{i}", variable=name)
+        builder.connect(read, "value", add, "a")
+        builder.connect(one, "result", add, "b")
+        builder.connect(add, "result", write, "value")
+        builder.connect(previous, "exec_out", write, "exec_in")
+        previous = write
+    return builder.build()
+
+
+SCENARIOS = {
+    "exec_chain_1k": lambda: exec_chain(1000),
+    "exec_chain_10k": lambda: exec_chain(10000),
+    "pure_dag_64x16": lambda: pure_dag(64, 16),
+    "nested_for_loops": lambda: nested_loops(3, 10, 5),
+    "nested_for_each_loops": lambda: nested_loops(3, 10, 5, for_each=True),
+    "variable_heavy": lambda: variable_heavy(100, 2000),
+}
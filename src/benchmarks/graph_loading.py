@@ -0,0 +1,72 @@
+"""
+Measures how long Bluepynt.load_graph_from_structure takes for generated graphs of growing size.
+
+The graphs are an exec chain of Write Variable nodes, each of them fed by a small tree of pure math nodes, so
+the number of connections grows linearly with the number of nodes.
+
+Run from the src directory: PYTHONPATH=bluepynt:. python -m benchmarks.graph_loading --nodes 1000 10000 100000
+"""
+import argparse
+import time
+
+from benchmarks.generators import register_builtin_nodes
+from bluepynt import Bluepynt
+
+
+def generate_structure(node_count: int) -> dict:
+    data_nodes = [{"nodeId": "bluepynt.builtin.BeginNode", "uniqueId": "begin"}]
+    connections = []
+    previous_exec = "begin"
+    index = 0
+    # Every step adds four nodes: two constants, an add node and the write variable node
+    while len(data_nodes) + 4 <= node_count:
+        a, b, add, write = (f"{index}.{name}" for name in ("a", "b", "add", "write"))
+        data_nodes += [
+            {"nodeId": "bluepynt.builtin.ConstantIntNode", "uniqueId": a, "arguments": {"value": str(index)}},
+            {"nodeId": "bluepynt.builtin.ConstantIntNode", "uniqueId": b, "arguments": {"value": "1"}},
+            {"nodeId": "bluepynt.builtin.AddNode", "uniqueId": add},
+            {"nodeId": "bluepynt.builtin.WriteVariableNode", "uniqueId": write, "arguments": {"variable": "result"}},
+        ]
+        connections += [
+            {"fromNode": a, "fromPin": "result", "toNode": add, "toPin": "a"},
+            {"fromNode": b, "fromPin": "result", "toNode": add, "toPin": "b"},
+            {"fromNode": add, "fromPin": "result", "toNode": write, "toPin": "value"},
+            {"fromNode": previous_exec, "fromPin": "exec_out", "toNode": write, "toPin": "exec_in"},
+        ]
+        previous_exec = write
+        index += 1
+
+    return {
+        "graphs": [
+            {
+                "nodes": data_nodes,
+                "connections": connections,
+                "variables": [{"name": "result", "type": "int", "value": 0}],
+            }
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    register_builtin_nodes()
+    print(f"{'nodes':>8} {'connections':>12} {'load':>12} {'per node':>10}")
+    for node_count in args.nodes:
+        data = generate_structure(node_count)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            Bluepynt.load_graph_from_structure(data)
+            best = min(best, time.perf_counter() - start)
+
+        data_graph = data["graphs"][0]
+        print(f"{len(data_graph['nodes']):>8} {len(data_graph['connections']):>12} {best * 1000:>10.1f}ms "
+              f"{best / len(data_graph['nodes']) * 1e6:>8.2f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Measures the throughput and latency of graphs executed through the JobQueue the server submits /api/execute to.
+
+Every run submits the same structure --jobs times to a queue of thread or process workers and waits for all of
+them, as clients posting the graph of an editor do. Latency is the time from the submission of a job until it has
+finished, split into the time it waited for a worker and the time it ran. The direct column is the execution of
+the structure in this thread through the same code, the difference is the cost of queueing, dispatching and, for
+processes, sending the structure and the result between processes. The HTTP handler itself is not measured, it
+only parses the request and submits it.
+
+Run from the src directory: PYTHONPATH=bluepynt:.:.. python -m benchmarks.job_queue --workers 1 4
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import threading
+import time
+from concurrent.futures import wait
+
+import jobs
+from benchmarks.__main__ import best_time, git_revision
+from benchmarks.generators import SCENARIOS
+from bluepynt import mapping
+
+
+class MessageCounter:
+    """
+    Stands in for the WebServer, counts the messages the queue would send to the clients.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = 0
+
+    def send_sync(self, event: str, data: dict, sid: str | None = None):
+        with self.lock:
+            self.messages += 1
+
+
+def load_builtin_nodes():
+    # Loaded by path as main.py does, so process workers load them again
+    builtin = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "bluepynt", "builtin")
+    for module_name in ("macros.py", "nodes.py", "pure_nodes.py"):
+        mapping.load_nodes_from_module(os.path.join(builtin, module_name))
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_queue(data: dict, job_count: int, workers: int, worker_type: str) -> dict:
+    web_server = MessageCounter()
+    job_queue = jobs.JobQueue(web_server, max_workers=workers, worker_type=worker_type, max_queued_jobs=job_count)
+    threading.Thread(target=job_queue.run, daemon=True).start()
+    try:
+        # Starts the workers and fills their graph caches
+        wait([job_queue.submit(data).finished for _ in range(workers)])
+        web_server.messages = 0
+
+        start = time.perf_counter()
+        submitted = [job_queue.submit(data) for _ in range(job_count)]
+        wait([job.finished for job in submitted])
+        duration = time.perf_counter() - start
+    finally:
+        job_queue.executor.shutdown()
+
+    failed = [job for job in submitted if job.error is not None]
+    if failed:
+        raise RuntimeError(f"{len(failed)} jobs failed:\n{failed[0].error}")
+
+    latencies = [job.finished_at - job.created_at for job in submitted]
+    return {
+        "workerType": worker_type,
+        "workers": workers,
+        "jobs": job_count,
+        "throughput": job_count / duration,
+        "medianLatency": statistics.median(latencies),
+        "p95Latency": percentile(latencies, 0.95),
+        "medianWaitTime": statistics.median(job.started_at - job.created_at for job in submitted),
+        "medianRunTime": statistics.median(job.finished_at - job.started_at for job in submitted),
+        "messagesPerJob": web_server.messages / job_count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=list(SCENARIOS), default="exec_chain_1k")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--worker-type", choices=("thread", "process"), nargs="+", default=["thread", "process"])
+    parser.add_argument("--output", help="Save the results as JSON")
+    args = parser.parse_args()
+
+    load_builtin_nodes()
+    data = SCENARIOS[args.scenario]()
+    direct = best_time(lambda: jobs.execute_graph(data), 5)
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "scenario": args.scenario,
+        "directTime": direct,
+        "runs": [],
+    }
+
+    print(f"{args.scenario}: {direct * 1000:.2f}ms per direct execution")
+    print(f"{'workers':<12} {'jobs/s':>8} {'latency':>10} {'p95':>10} {'waiting':>10} {'running':>10}")
+    for worker_type in args.worker_type:
+        for workers in args.workers:
+            result = run_queue(data, args.jobs, workers, worker_type)
+            results["runs"].append(result)
+            print(f"{workers:>2} {worker_type:<9} {result['throughput']:>8.1f} "
+                  f"{result['medianLatency'] * 1000:>8.2f}ms {result['p95Latency'] * 1000:>8.2f}ms "
+                  f"{result['medianWaitTime'] * 1000:>8.2f}ms {result['medianRunTime'] * 1000:>8.2f}ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
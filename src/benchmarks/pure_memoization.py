@@ -0,0 +1,70 @@
+"""
+Compares pulling a deep diamond of pure nodes with and without per-epoch memoization.
+
+Every level of the diamond is an AddNode whose both inputs are connected to the previous level, so without
+memoization the bottom node evaluates 2^depth nodes.
+
+Run from the src directory: PYTHONPATH=bluepynt:. python -m benchmarks.pure_memoization --depth 16
+"""
+import argparse
+import time
+
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, ConstantIntNode, WriteVariableNode
+from pins import Graph, GraphVariable
+
+
+def build_diamond_graph(depth: int) -> Graph:
+    begin_node = BeginNode()
+    constant_node = ConstantIntNode()
+    constant_node.argument_pin("value").set_value(1)
+
+    nodes = [begin_node, constant_node]
+    previous_pin = constant_node.output_pin("result")
+    for _ in range(depth):
+        add_node = AddNode()
+        previous_pin.connect(add_node.argument_pin("a"))
+        previous_pin.connect(add_node.argument_pin("b"))
+        previous_pin = add_node.output_pin("result")
+        nodes.append(add_node)
+
+    write_node = WriteVariableNode()
+    write_node.argument_pin("variable").set_value("result")
+    previous_pin.connect(write_node.argument_pin("value"))
+    begin_node.output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+    nodes.append(write_node)
+
+    return Graph(begin_node, tuple(nodes), (GraphVariable("result", int, 0),))
+
+
+def measure(graph: Graph, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = graph.execute()
+        best = min(best, time.perf_counter() - start)
+        result = frame.variable("result")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, nargs="+", default=[8, 12, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'depth':>6} {'memoized':>12} {'not memoized':>14} {'speedup':>9}")
+    for depth in args.depth:
+        graph = build_diamond_graph(depth)
+        memoized, expected = measure(graph, args.repeat)
+
+        graph.memoize_pure_nodes = False
+        not_memoized, result = measure(graph, args.repeat)
+        assert result == expected
+
+        print(f"{depth:>6} {memoized * 1000:>10.3f}ms {not_memoized * 1000:>12.3f}ms {not_memoized / memoized:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
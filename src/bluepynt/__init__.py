@@ -1,2 +1,4 @@
 from .bluepynt import *
 from .plugin_base import PluginBase
+from .graph_cache import GraphCache
+from pins import BaseFunctionNode, BaseMacroNode, report_progress
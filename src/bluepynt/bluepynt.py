@@ -2,6 +2,8 @@ import json
 import builtins
 
 from bluepynt import mapping
+from optimizer import Optimizer
+from type_inference import infer_types
 from pins import Node, Graph, InputFlowPin, OutputFlowPin, InputArgumentPin, OutputArgumentPin, \
     GraphVariable
 
@@ -22,27 +24,23 @@ def get_type(type_name):
 
 class Bluepynt:
     @staticmethod
-    def load_graph_from_structure(data) -> list[Graph]:
+    def load_graph_from_structure(data, optimizer: Optimizer | None = None, trusted: bool = False) -> list[Graph]:
+        """
+        Builds graphs from the structure posted by the editor and checks the types of their connections. The
+        optimizer, if given, rewrites every graph before it is compiled. Trusted graphs have their types checked
+        here instead of on every value set.
+        """
         graphs: list[Graph] = []
+        node_map = mapping.NODE_MAP
+        begin_node_class = node_map.get("bluepynt.builtin.BeginNode")
 
         for data_graph in data["graphs"]:
             nodes: list[Node] = []
             main_node: Node | None = None
             for data_node in data_graph["nodes"]:
-                if data_node["nodeId"] not in mapping.NODE_MAP:
-                    raise Exception(f"Node type {data_node['nodeId']} not found")
-
-                node_id: type = mapping.NODE_MAP[data_node["nodeId"]]
-                node = node_id()
-                node.unique_id = data_node["uniqueId"]
-
-                if isinstance(node, mapping.NODE_MAP["bluepynt.builtin.BeginNode"]):
+                node = Bluepynt.create_node(data_node, node_map)
+                if begin_node_class is not None and isinstance(node, begin_node_class):
                     main_node = node
-
-                if "arguments" in data_node:
-                    for pinId, value in data_node["arguments"].items():
-                        node.argument_pin(pinId).set_value(value)
-
                 nodes.append(node)
 
             if main_node is None:
@@ -51,26 +49,54 @@ class Bluepynt:
             variables: list[GraphVariable] = []
             if "variables" in data_graph:
                 for data_variable in data_graph["variables"]:
-                    variable_type = get_type(data_variable["type"])
-                    if variable_type is None:
-                        raise Exception(f"Type {data_variable['type']} not found")
-
-                    variable = GraphVariable(data_variable["name"], variable_type, data_variable["value"])
-                    variables.append(variable)
+                    variables.append(Bluepynt.create_variable(data_variable))
 
             graph = Graph(main_node, tuple(nodes), tuple(variables))
+            # Graph and nodes keep hash indexes, so wiring is linear in the number of connections
             for connection in data_graph["connections"]:
-                from_node = graph.node(connection["fromNode"])
-                to_node = graph.node(connection["toNode"])
-                from_pin = from_node.any_output_pin(connection["fromPin"])
-                to_pin = to_node.any_input_pin(connection["toPin"])
+                from_pin, to_pin = Bluepynt.connection_pins(graph, connection)
                 from_pin.connect(to_pin)
 
+            infer_types(graph)
+            if optimizer is not None:
+                optimizer.optimize(graph)
+            if trusted:
+                graph.trust()
+            graph.compile()
             graphs.append(graph)
 
         return graphs
 
     @staticmethod
-    def load_graph_from_json(json_data) -> list[Graph]:
+    def create_node(data_node: dict, node_map: dict | None = None) -> Node:
+        node_class = (node_map if node_map is not None else mapping.NODE_MAP).get(data_node["nodeId"])
+        if node_class is None:
+            raise Exception(f"Node type {data_node['nodeId']} not found")
+
+        node = node_class()
+        node.unique_id = data_node["uniqueId"]
+        if "arguments" in data_node:
+            for pinId, value in data_node["arguments"].items():
+                node.argument_pin(pinId).set_value(value)
+        return node
+
+    @staticmethod
+    def create_variable(data_variable: dict) -> GraphVariable:
+        variable_type = get_type(data_variable["type"])
+        if variable_type is None:
+            raise Exception(f"Type {data_variable['type']} not found")
+        return GraphVariable(data_variable["name"], variable_type, data_variable["value"])
+
+    @staticmethod
+    def connection_pins(graph: Graph, connection: dict) -> tuple:
+        """
+        Returns the output and input pin of a connection of the editor.
+        """
+        from_pin = graph.node(connection["fromNode"]).any_output_pin(connection["fromPin"])
+        to_pin = graph.node(connection["toNode"]).any_input_pin(connection["toPin"])
+        return from_pin, to_pin
+
+    @staticmethod
+    def load_graph_from_json(json_data, optimizer: Optimizer | None = None, trusted: bool = False) -> list[Graph]:
         data = json.loads(json_data)
-        return Bluepynt.load_graph_from_structure(data)
+        return Bluepynt.load_graph_from_structure(data, optimizer, trusted)
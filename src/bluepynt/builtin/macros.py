@@ -1,64 +1,78 @@
-from typing import Any
+import math
+import os
+from typing import Any, get_args
 
-from pins import OutputFlowPin, InputArgumentPin, BaseMacroNode, InputFlowPin, OutputArgumentPin
+from bluepynt.parallel import body_structure, loop_body, run_loop_chunks
+from pins import OutputFlowPin, InputArgumentPin, BaseMacroNode, InputFlowPin, OutputArgumentPin, run_flow
 
 
 class ExecRerouteNode(BaseMacroNode):
-    def __init__(self):
-        super().__init__(node_id="bluepynt.builtin.ExecRerouteNode", name="Exec Reroute",
-                         description="Reroutes the execution flow to another node")
-        self.in_pins = (
-            InputFlowPin(pin_id="exec_in", name="", execute_method=self.execute),
-        )
-        self.out_pins = (
-            OutputFlowPin(pin_id="exec_out", name=""),
-        )
+    __slots__ = ()
+    ID = "bluepynt.builtin.ExecRerouteNode"
+    NAME = "Exec Reroute"
+    DESCRIPTION = "Reroutes the execution flow to another node"
+    REROUTE = True
+    IN_PINS = (
+        InputFlowPin(pin_id="exec_in", name="", execute_method="execute", flow_method="flow"),
+    )
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_out", name=""),
+    )
 
     def execute(self):
-        self.output_flow_pin("exec_out").execute()
+        run_flow(self.flow())
+
+    def flow(self):
+        yield self.output_flow_pin("exec_out")
 
 
 class BranchNode(BaseMacroNode):
-    def __init__(self):
-        super().__init__(node_id="bluepynt.builtin.BranchNode", name="Branch",
-                         description="Executes one of two branches based on a condition")
-        self.in_pins = (
-            InputFlowPin(pin_id="exec_in", name="", execute_method=self.execute),
-            InputArgumentPin(pin_id="condition", name="Condition", argument_type=bool),
-        )
-        self.out_pins = (
-            OutputFlowPin(pin_id="exec_true", name="True"),
-            OutputFlowPin(pin_id="exec_false", name="False"),
-        )
+    __slots__ = ()
+    ID = "bluepynt.builtin.BranchNode"
+    NAME = "Branch"
+    DESCRIPTION = "Executes one of two branches based on a condition"
+    IN_PINS = (
+        InputFlowPin(pin_id="exec_in", name="", execute_method="execute", flow_method="flow"),
+        InputArgumentPin(pin_id="condition", name="Condition", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_true", name="True"),
+        OutputFlowPin(pin_id="exec_false", name="False"),
+    )
 
     def execute(self):
+        run_flow(self.flow())
+
+    def flow(self):
         if self.argument_pin("condition").value:
-            return self.output_flow_pin("exec_true").execute()
-        return self.output_flow_pin("exec_false").execute()
+            yield self.output_flow_pin("exec_true")
+        else:
+            yield self.output_flow_pin("exec_false")
 
 
 class ForLoopNode(BaseMacroNode):
-    def __init__(self):
-        super().__init__(node_id="bluepynt.builtin.ForLoopNode", name="For Loop",
-                         description="Iterates over a range of numbers")
-        self.in_pins = (
-            InputFlowPin(pin_id="exec_in", name="", execute_method=self.execute),
-            InputArgumentPin(pin_id="start", name="Start", argument_type=int),
-            InputArgumentPin(pin_id="end", name="End", argument_type=int),
-            InputArgumentPin(pin_id="step", name="Step", argument_type=int),
-            InputFlowPin(pin_id="exec_break", name="Break", execute_method=self.execute),
-        )
-        self.out_pins = (
-            OutputFlowPin(pin_id="exec_body", name="Loop body"),
-            OutputArgumentPin(pin_id="i", name="Index", argument_type=int),
-            OutputFlowPin(pin_id="exec_out", name="Completed"),
-        )
-
-        # Runtime properties
-        self.should_break = False
+    __slots__ = ()
+    ID = "bluepynt.builtin.ForLoopNode"
+    NAME = "For Loop"
+    DESCRIPTION = "Iterates over a range of numbers"
+    IN_PINS = (
+        InputFlowPin(pin_id="exec_in", name="", execute_method="execute", flow_method="flow"),
+        InputArgumentPin(pin_id="start", name="Start", argument_type=int),
+        InputArgumentPin(pin_id="end", name="End", argument_type=int),
+        InputArgumentPin(pin_id="step", name="Step", argument_type=int),
+        InputFlowPin(pin_id="exec_break", name="Break", execute_method="execute_break"),
+    )
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_body", name="Loop body"),
+        OutputArgumentPin(pin_id="i", name="Index", argument_type=int),
+        OutputFlowPin(pin_id="exec_out", name="Completed"),
+    )
 
     def execute(self):
-        self.should_break = False
+        run_flow(self.flow())
+
+    def flow(self):
+        self.state["should_break"] = False
         start = self.argument_pin("start").value
         end = self.argument_pin("end").value
         step = self.argument_pin("step").value
@@ -75,48 +89,116 @@ class ForLoopNode(BaseMacroNode):
 
         for i in range(start, end + 1, step * 1 if start < end else -1):
             self.output_pin("i").set_value(i)
-            self.output_flow_pin("exec_body").execute()
+            yield self.output_flow_pin("exec_body")
 
-            if self.should_break:
+            if self.state["should_break"]:
                 break
 
-        self.output_flow_pin("exec_out").execute()
+        yield self.output_flow_pin("exec_out")
 
     def execute_break(self):
-        self.should_break = True
+        self.state["should_break"] = True
 
 
 class ForEachLoopNode(BaseMacroNode):
-    def __init__(self):
-        super().__init__(node_id="bluepynt.builtin.ForEachLoopNode", name="For Each Loop",
-                         description="Iterates over a list")
-        self.in_pins = (
-            InputFlowPin(pin_id="exec_in", name="", execute_method=self.execute),
-            InputArgumentPin(pin_id="list", name="List", argument_type=list[Any]),
-            InputFlowPin(pin_id="exec_break", name="", execute_method=self.execute),
-        )
-        self.out_pins = (
-            OutputFlowPin(pin_id="exec_body"),
-            OutputArgumentPin(pin_id="item", name="Item", argument_type=Any),
-            OutputFlowPin(pin_id="exec_out"),
-        )
-
-        # Runtime properties
-        self.should_break = False
+    __slots__ = ()
+    ID = "bluepynt.builtin.ForEachLoopNode"
+    NAME = "For Each Loop"
+    DESCRIPTION = "Iterates over a list"
+    IN_PINS = (
+        InputFlowPin(pin_id="exec_in", name="", execute_method="execute", flow_method="flow"),
+        InputArgumentPin(pin_id="list", name="List", argument_type=list[Any]),
+        InputFlowPin(pin_id="exec_break", name="", execute_method="execute_break"),
+    )
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_body"),
+        OutputArgumentPin(pin_id="item", name="Item", argument_type=Any),
+        OutputFlowPin(pin_id="exec_out"),
+    )
 
     def execute(self):
-        self.should_break = False
+        run_flow(self.flow())
+
+    def flow(self):
+        self.state["should_break"] = False
         for item in self.argument_pin("list").value:
             self.output_pin("item").set_value(item)
-            self.output_flow_pin("exec_body").execute()
+            yield self.output_flow_pin("exec_body")
 
-            if self.should_break:
+            if self.state["should_break"]:
                 break
 
-        self.output_flow_pin("exec_out").execute()
+        yield self.output_flow_pin("exec_out")
 
     def execute_break(self):
-        self.should_break = True
+        self.state["should_break"] = True
+
+    def infer_types(self):
+        types = super().infer_types()
+        list_pin = self.argument_pin("list")
+        if list_pin.source_pin is not None:
+            item_types = get_args(list_pin.source_pin.resolved_type)
+            if len(item_types) == 1:
+                types[self.output_pin("item")] = item_types[0]
+        elif list_pin.value:
+            item_types = {type(item) for item in list_pin.value}
+            if len(item_types) == 1:
+                types[self.output_pin("item")] = item_types.pop()
+        return types
+
+
+class ParallelForEachLoopNode(ForEachLoopNode):
+    """
+    For each loop collecting a result of every item, with the items split into chunks run by a process pool.
+    Every worker process runs a serialized copy of the loop body, inputs from outside the body get the values
+    they have when the loop starts. Bodies whose iterations may see the effects of each other or whose outputs are
+    read outside the body (see bluepynt.parallel.loop_body), lists of a single chunk and a single worker run in
+    this process item by item instead. Items and results must be picklable.
+    """
+    __slots__ = ()
+    ID = "bluepynt.builtin.ParallelForEachLoopNode"
+    NAME = "Parallel For Each Loop"
+    DESCRIPTION = "Runs the loop body for the items of a list in parallel, collecting the results in order"
+    IN_PINS = (
+        InputFlowPin(pin_id="exec_in", name="", execute_method="execute", flow_method="flow"),
+        InputArgumentPin(pin_id="list", name="List", argument_type=list[Any]),
+        InputArgumentPin(pin_id="result", name="Result", argument_type=Any,
+                         description="Read once the body has run for an item"),
+        InputArgumentPin(pin_id="workers", name="Workers", argument_type=int, default_value=0,
+                         description="Number of worker processes, 0 for one per CPU"),
+        InputArgumentPin(pin_id="chunk_size", name="Chunk size", argument_type=int, default_value=0,
+                         description="Number of items sent to a worker at once, 0 for four chunks per worker"),
+    )
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_body"),
+        OutputArgumentPin(pin_id="item", name="Item", argument_type=Any),
+        OutputArgumentPin(pin_id="results", name="Results", argument_type=list[Any]),
+        OutputFlowPin(pin_id="exec_out"),
+    )
+
+    def flow(self):
+        items = list(self.argument_pin("list").value)
+        workers = self.argument_pin("workers").value or os.cpu_count() or 1
+        chunk_size = self.argument_pin("chunk_size").value or max(1, math.ceil(len(items) / (workers * 4)))
+
+        body = loop_body(self, "exec_body", ("result",)) if workers > 1 and len(items) > chunk_size else None
+        if body is None:
+            results = []
+            for item in items:
+                self.output_pin("item").set_value(item)
+                yield self.output_flow_pin("exec_body")
+                results.append(self.argument_pin("result").value)
+        else:
+            # The copies run item by item
+            structure = body_structure(self, body, {"list": [], "workers": 1})
+            chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+            results = run_loop_chunks(structure, self.unique_id, chunks, workers)
+            # As after running the body here, nodes read after the loop see the last item
+            if items:
+                self.output_pin("item").set_value(items[-1])
+
+        self.output_pin("results").set_value(results)
+        yield self.output_flow_pin("exec_out")
 
 
 NODE_MAP = {
@@ -124,4 +206,5 @@ NODE_MAP = {
     "bluepynt.builtin.BranchNode": BranchNode,
     "bluepynt.builtin.ForLoopNode": ForLoopNode,
     "bluepynt.builtin.ForEachLoopNode": ForEachLoopNode,
+    "bluepynt.builtin.ParallelForEachLoopNode": ParallelForEachLoopNode,
 }
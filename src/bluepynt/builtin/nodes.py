@@ -1,27 +1,32 @@
-from pins import Node, OutputFlowPin, BaseFunctionNode, InputArgumentPin
+from pins import Node, OutputFlowPin, BaseFunctionNode, InputArgumentPin, run_flow
 
 
 class BeginNode(Node):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.BeginNode", "Begin",
-                         description="This node is executed when the graph is loaded by the server.",
-                         out_pins=(
-                             OutputFlowPin(pin_id="exec_out"),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.BeginNode"
+    NAME = "Begin"
+    DESCRIPTION = "This node is executed when the graph is loaded by the server."
+    OUT_PINS = (
+        OutputFlowPin(pin_id="exec_out"),
+    )
 
     def execute(self):
-        self.output_flow_pin("exec_out").execute()
+        run_flow(self.flow())
+
+    def flow(self):
+        yield self.output_flow_pin("exec_out")
 
 # region Logging
 
 
 class ConsoleLogNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.ConsoleLogNode", "Console Log",
-                         description="Logs a message to the console.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="message", name="Message", argument_type=str),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.ConsoleLogNode"
+    NAME = "Console Log"
+    DESCRIPTION = "Logs a message to the console."
+    IN_PINS = (
+        InputArgumentPin(pin_id="message", name="Message", argument_type=str),
+    )
 
     def execute(self):
         print(self.argument_pin("message").value)
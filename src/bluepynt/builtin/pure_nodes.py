@@ -1,18 +1,22 @@
 from typing import Any
 
-from pins import BaseFunctionNode, InputArgumentPin, OutputArgumentPin
+from pins import BaseFunctionNode, InputArgumentPin, OutputArgumentPin, GraphVariable
 
 
 class RerouteNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.RerouteNode", "Reroute", is_pure=True,
-                         description="Reroutes the input to the output.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="in", name="", argument_type=Any, type_depends_on="out"),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="out", name="", argument_type=Any, type_depends_on="in"),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.RerouteNode"
+    NAME = "Reroute"
+    DESCRIPTION = "Reroutes the input to the output."
+    IS_PURE = True
+    FOLDABLE = True
+    REROUTE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="in", name="", argument_type=Any, type_depends_on="out"),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="out", name="", argument_type=Any, type_depends_on="in"),
+    )
 
     def execute(self):
         self.output_pin("out").set_value(self.argument_pin("in").value)
@@ -22,209 +26,274 @@ class RerouteNode(BaseFunctionNode):
 
 
 class ReadVariableNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.ReadVariableNode", "Read Variable", is_pure=True,
-                         description="Reads the value of the variable.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="variable", name="Variable name", argument_type=str),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="value", name="Value", argument_type=Any),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.ReadVariableNode"
+    NAME = "Read Variable"
+    DESCRIPTION = "Reads the value of the variable."
+    IS_PURE = True
+    MERGEABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="variable", name="Variable name", argument_type=str),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="value", name="Value", argument_type=Any),
+    )
 
     def execute(self):
         variable = self.argument_pin("variable").value
         self.output_pin("value").set_value(self.parent_graph.variable(variable).value)
 
+    def read_variables(self):
+        variable = variable_of(self)
+        return (variable,) if variable is not None else None
+
+    def infer_types(self):
+        types = super().infer_types()
+        variable = variable_of(self)
+        if variable is not None:
+            types[self.output_pin("value")] = variable.type
+        return types
+
 
 class WriteVariableNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.WriteVariableNode", "Write Variable",
-                         description="Writes the value to the variable.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="variable", name="Variable name", argument_type=str),
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=Any),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="value", name="Value", argument_type=Any),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.WriteVariableNode"
+    NAME = "Write Variable"
+    DESCRIPTION = "Writes the value to the variable."
+    SHARED_SIDE_EFFECTS = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="variable", name="Variable name", argument_type=str),
+        InputArgumentPin(pin_id="value", name="Value", argument_type=Any),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="value", name="Value", argument_type=Any),
+    )
 
     def execute(self):
         variable = self.argument_pin("variable").value
         value = self.argument_pin("value").value
         self.parent_graph.variable(variable).set_value(value)
+
+    def infer_types(self):
+        types = super().infer_types()
+        variable = variable_of(self)
+        if variable is not None:
+            types[self.argument_pin("value")] = variable.type
+            types[self.output_pin("value")] = variable.type
+        return types
+
+
+def variable_of(node: BaseFunctionNode) -> GraphVariable | None:
+    # Only literal variable names can be resolved before the graph runs
+    pin = node.argument_pin("variable")
+    if pin.source_pin is not None or node.parent_graph is None:
+        return None
+    return node.parent_graph.variables_by_name.get(pin.value)
 # endregion
 
 # region Math
 
 
 class AddNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.AddNode", "Add", is_pure=True,
-                         description="Returns the sum of A and B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.AddNode"
+    NAME = "Add"
+    DESCRIPTION = "Returns the sum of A and B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value + self.argument_pin("b").value)
 
 
 class SubtractNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.SubtractNode", "Subtract", is_pure=True,
-                         description="Returns the difference of A and B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.SubtractNode"
+    NAME = "Subtract"
+    DESCRIPTION = "Returns the difference of A and B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value - self.argument_pin("b").value)
 
 
 class MultiplyNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.MultiplyNode", "Multiply", is_pure=True,
-                         description="Returns the product of A and B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.MultiplyNode"
+    NAME = "Multiply"
+    DESCRIPTION = "Returns the product of A and B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value * self.argument_pin("b").value)
 
 
 class DivideNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.DivideNode", "Divide", is_pure=True,
-                         description="Returns the quotient of the division of A by B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.DivideNode"
+    NAME = "Divide"
+    DESCRIPTION = "Returns the quotient of the division of A by B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value / self.argument_pin("b").value)
 
 
 class ModuloNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.ModuloNode", "Modulo", is_pure=True,
-                         description="Returns the remainder of the division of A by B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.ModuloNode"
+    NAME = "Modulo"
+    DESCRIPTION = "Returns the remainder of the division of A by B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value % self.argument_pin("b").value)
 
 
 class PowerNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.PowerNode", "Power", is_pure=True,
-                         description="Returns the value of A raised to the power of B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.PowerNode"
+    NAME = "Power"
+    DESCRIPTION = "Returns the value of A raised to the power of B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("a").value ** self.argument_pin("b").value)
 
 
 class NegateNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.NegateNode", "Negate", is_pure=True,
-                         description="Negates the value.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.NegateNode"
+    NAME = "Negate"
+    DESCRIPTION = "Negates the value."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(-self.argument_pin("value").value)
 
 
 class AbsNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.AbsNode", "Abs", is_pure=True,
-                         description="Returns the absolute value of the given value.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.AbsNode"
+    NAME = "Abs"
+    DESCRIPTION = "Returns the absolute value of the given value."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(abs(self.argument_pin("value").value))
 
 
 class FloorNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.FloorNode", "Floor", is_pure=True,
-                         description="Rounds the value down to the nearest integer.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.FloorNode"
+    NAME = "Floor"
+    DESCRIPTION = "Rounds the value down to the nearest integer."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(int(self.argument_pin("value").value))
 
 
 class CeilNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.CeilNode", "Ceil", is_pure=True,
-                         description="Returns the smallest integer greater than or equal to the given value.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.CeilNode"
+    NAME = "Ceil"
+    DESCRIPTION = "Returns the smallest integer greater than or equal to the given value."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(int(self.argument_pin("value").value) + 1)
 
 
 class RoundNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.RoundNode", "Round", is_pure=True,
-                         description="Rounds the value to the given number of digits.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                             InputArgumentPin(pin_id="n_digits", name="Digits", argument_type=int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.RoundNode"
+    NAME = "Round"
+    DESCRIPTION = "Rounds the value to the given number of digits."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+        InputArgumentPin(pin_id="n_digits", name="Digits", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(round(self.argument_pin("value").value,
@@ -232,16 +301,19 @@ class RoundNode(BaseFunctionNode):
 
 
 class MinNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.MinNode", "Min", is_pure=True,
-                         description="Returns the smallest of the given values.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.MinNode"
+    NAME = "Min"
+    DESCRIPTION = "Returns the smallest of the given values."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -250,16 +322,19 @@ class MinNode(BaseFunctionNode):
 
 
 class MaxNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.MaxNode", "Max", is_pure=True,
-                         description="Returns the greater of two values.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.MaxNode"
+    NAME = "Max"
+    DESCRIPTION = "Returns the greater of two values."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -268,17 +343,20 @@ class MaxNode(BaseFunctionNode):
 
 
 class ClampNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.ClampNode", "Clamp", is_pure=True,
-                         description="Clamps the value between min and max.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                             InputArgumentPin(pin_id="min", name="Min", argument_type=float | int),
-                             InputArgumentPin(pin_id="max", name="Max", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.ClampNode"
+    NAME = "Clamp"
+    DESCRIPTION = "Clamps the value between min and max."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+        InputArgumentPin(pin_id="min", name="Min", argument_type=float | int),
+        InputArgumentPin(pin_id="max", name="Max", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         value = self.argument_pin("value").value
@@ -288,17 +366,20 @@ class ClampNode(BaseFunctionNode):
 
 
 class LerpNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.LerpNode", "Lerp", is_pure=True,
-                         description="Linearly interpolates between A and B by T.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                             InputArgumentPin(pin_id="t", name="T", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.LerpNode"
+    NAME = "Lerp"
+    DESCRIPTION = "Linearly interpolates between A and B by T."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+        InputArgumentPin(pin_id="t", name="T", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=float | int),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -308,15 +389,18 @@ class LerpNode(BaseFunctionNode):
 
 
 class SignNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.SignNode", "Sign", is_pure=True,
-                         description="Returns -1 if the value is less than zero, 1 if the value is greater than zero.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.SignNode"
+    NAME = "Sign"
+    DESCRIPTION = "Returns -1 if the value is less than zero, 1 if the value is greater than zero."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
 
     def execute(self):
         value = self.argument_pin("value").value
@@ -324,15 +408,18 @@ class SignNode(BaseFunctionNode):
 
 
 class IsPositiveNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IsPositiveNode", "Is Positive", is_pure=True,
-                         description="Returns true if the value is greater than zero.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.IsPositiveNode"
+    NAME = "Is Positive"
+    DESCRIPTION = "Returns true if the value is greater than zero."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         value = self.argument_pin("value").value
@@ -340,15 +427,18 @@ class IsPositiveNode(BaseFunctionNode):
 
 
 class IsNegativeNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IsNegativeNode", "Is Negative", is_pure=True,
-                         description="Returns true if the value is negative.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.IsNegativeNode"
+    NAME = "Is Negative"
+    DESCRIPTION = "Returns true if the value is negative."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         value = self.argument_pin("value").value
@@ -356,15 +446,18 @@ class IsNegativeNode(BaseFunctionNode):
 
 
 class IsZeroNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IsZeroNode", "Is Zero", is_pure=True,
-                         description="Returns true if the value is equal to zero.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.IsZeroNode"
+    NAME = "Is Zero"
+    DESCRIPTION = "Returns true if the value is equal to zero."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         value = self.argument_pin("value").value
@@ -372,16 +465,19 @@ class IsZeroNode(BaseFunctionNode):
 
 
 class IsEqualNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IsEqualNode", "Is Equal", is_pure=True,
-                         description="Returns true if A is equal to B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.IsEqualNode"
+    NAME = "Is Equal"
+    DESCRIPTION = "Returns true if A is equal to B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -393,16 +489,19 @@ class IsEqualNode(BaseFunctionNode):
 
 
 class AndNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.AndNode", "And", is_pure=True,
-                         description="Returns true if A and B are true.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=bool),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=bool),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.AndNode"
+    NAME = "And"
+    DESCRIPTION = "Returns true if A and B are true."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=bool),
+        InputArgumentPin(pin_id="b", name="B", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -411,16 +510,19 @@ class AndNode(BaseFunctionNode):
 
 
 class OrNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.OrNode", "Or", is_pure=True,
-                         description="Returns true if A or B are true.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=bool),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=bool),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.OrNode"
+    NAME = "Or"
+    DESCRIPTION = "Returns true if A or B are true."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=bool),
+        InputArgumentPin(pin_id="b", name="B", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -429,15 +531,18 @@ class OrNode(BaseFunctionNode):
 
 
 class NotNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.NotNode", "Not", is_pure=True,
-                         description="Returns true if A is false.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=bool),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.NotNode"
+    NAME = "Not"
+    DESCRIPTION = "Returns true if A is false."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -445,16 +550,19 @@ class NotNode(BaseFunctionNode):
 
 
 class XorNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.XorNode", "Xor", is_pure=True,
-                         description="Returns true if A or B are true, but not both.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=bool),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=bool),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.XorNode"
+    NAME = "Xor"
+    DESCRIPTION = "Returns true if A or B are true, but not both."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=bool),
+        InputArgumentPin(pin_id="b", name="B", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -463,18 +571,21 @@ class XorNode(BaseFunctionNode):
 
 
 class IfNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IfNode", "If", is_pure=True,
-                         description="Returns A if Condition is true, otherwise returns B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="condition", name="Condition", argument_type=bool),
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result",
+    __slots__ = ()
+    ID = "bluepynt.builtin.IfNode"
+    NAME = "If"
+    DESCRIPTION = "Returns A if Condition is true, otherwise returns B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="condition", name="Condition", argument_type=bool),
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result",
                                                argument_type=float | int | str),
-                         ))
+    )
 
     def execute(self):
         condition = self.argument_pin("condition").value
@@ -484,16 +595,19 @@ class IfNode(BaseFunctionNode):
 
 
 class EqualNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.EqualNode", "Equal", is_pure=True,
-                         description="Returns true if A is equal to B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.EqualNode"
+    NAME = "Equal"
+    DESCRIPTION = "Returns true if A is equal to B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -502,16 +616,19 @@ class EqualNode(BaseFunctionNode):
 
 
 class NotEqualNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.NotEqualNode", "Not Equal", is_pure=True,
-                         description="Returns true if A is not equal to B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.NotEqualNode"
+    NAME = "Not Equal"
+    DESCRIPTION = "Returns true if A is not equal to B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int | str),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int | str),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -520,16 +637,19 @@ class NotEqualNode(BaseFunctionNode):
 
 
 class GreaterNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.GreaterNode", "Greater", is_pure=True,
-                         description="Returns true if A is greater than B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.GreaterNode"
+    NAME = "Greater"
+    DESCRIPTION = "Returns true if A is greater than B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -538,16 +658,19 @@ class GreaterNode(BaseFunctionNode):
 
 
 class GreaterEqualNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.GreaterEqualNode", "Greater Equal", is_pure=True,
-                         description="Returns true if A is greater than or equal to B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.GreaterEqualNode"
+    NAME = "Greater Equal"
+    DESCRIPTION = "Returns true if A is greater than or equal to B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -556,16 +679,19 @@ class GreaterEqualNode(BaseFunctionNode):
 
 
 class LessNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.LessNode", "Less", is_pure=True,
-                         description="Returns true if A is less than B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.LessNode"
+    NAME = "Less"
+    DESCRIPTION = "Returns true if A is less than B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -574,16 +700,19 @@ class LessNode(BaseFunctionNode):
 
 
 class LessEqualNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.LessEqualNode", "Less Equal", is_pure=True,
-                         description="Returns true if A is less than or equal to B.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.LessEqualNode"
+    NAME = "Less Equal"
+    DESCRIPTION = "Returns true if A is less than or equal to B."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=float | int),
+        InputArgumentPin(pin_id="b", name="B", argument_type=float | int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = self.argument_pin("a").value
@@ -592,16 +721,19 @@ class LessEqualNode(BaseFunctionNode):
 
 
 class NandNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.NandNode", "Nand", is_pure=True,
-                         description="Returns true if A and B are false.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="a", name="A", argument_type=bool),
-                             InputArgumentPin(pin_id="b", name="B", argument_type=bool),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.NandNode"
+    NAME = "Nand"
+    DESCRIPTION = "Returns true if A and B are false."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="a", name="A", argument_type=bool),
+        InputArgumentPin(pin_id="b", name="B", argument_type=bool),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=bool),
+    )
 
     def execute(self):
         a = not self.argument_pin("a").value
@@ -614,15 +746,18 @@ class NandNode(BaseFunctionNode):
 
 
 class IntToStringNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.IntToStringNode", "Int to String", is_pure=True,
-                         description="Converts the integer value to a string.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=str),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.IntToStringNode"
+    NAME = "Int to String"
+    DESCRIPTION = "Converts the integer value to a string."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=str),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(str(self.argument_pin("value").value))
@@ -632,15 +767,18 @@ class IntToStringNode(BaseFunctionNode):
 
 
 class ConstantIntNode(BaseFunctionNode):
-    def __init__(self):
-        super().__init__("bluepynt.builtin.ConstantIntNode", "Constant Int", is_pure=True,
-                         description="Returns the constant integer value.",
-                         in_pins=(
-                             InputArgumentPin(pin_id="value", name="Value", argument_type=int),
-                         ),
-                         out_pins=(
-                             OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
-                         ))
+    __slots__ = ()
+    ID = "bluepynt.builtin.ConstantIntNode"
+    NAME = "Constant Int"
+    DESCRIPTION = "Returns the constant integer value."
+    IS_PURE = True
+    FOLDABLE = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="value", name="Value", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
 
     def execute(self):
         self.output_pin("result").set_value(self.argument_pin("value").value)
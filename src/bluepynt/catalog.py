@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import json
+import threading
+from typing import Iterable
+
+from bluepynt import mapping
+
+
+class CatalogPayload:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.compressed = gzip.compress(body, compresslevel=6)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        """
+        Whether an If-None-Match header names the ETag of the payload, weak ETags match too.
+        """
+        for etag in if_none_match.split(","):
+            etag = etag.strip()
+            if etag == "*" or etag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows the content coding, an explicit q=0 refuses it.
+    """
+    wildcard = False
+    for token in accept_encoding.split(","):
+        coding, *parameters = [part.strip() for part in token.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.lower() == encoding:
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+class NodeCatalog:
+    """
+    The node catalog served by /api/nodes. The JSON of every node type is serialized once and kept until the
+    type changes in the registry, payloads (optionally filtered by category) are kept serialized and gzipped
+    together with their ETag until anything in the registry changes.
+    """
+    def __init__(self, node_map: dict[str, type] | None = None):
+        self._node_map = node_map
+        self.lock = threading.Lock()
+        # node id -> (node class, category, serialized JSON)
+        self.entries: dict[str, tuple[type, str, bytes]] = {}
+        self.payloads: dict[str | None, CatalogPayload] = {}
+        self.entry_builds = 0
+
+    @property
+    def node_map(self) -> dict[str, type]:
+        # The registry is swapped on changes, so it is looked up every time
+        return self._node_map if self._node_map is not None else mapping.NODE_MAP
+
+    def invalidate(self, node_ids: Iterable[str] | None = None):
+        """
+        Drops the cached JSON of the node types, or of all of them. Registered with mapping.ON_NODES_LOADED, so
+        modules loaded again replace only their own entries.
+        """
+        with self.lock:
+            if node_ids is None:
+                self.entries.clear()
+            else:
+                for node_id in node_ids:
+                    self.entries.pop(node_id, None)
+            self.payloads.clear()
+
+    def cached_payload(self, category: str | None = None) -> CatalogPayload | None:
+        """
+        Returns the payload if it is built and up to date, without building anything.
+        """
+        with self.lock:
+            node_map = self.node_map
+            if self._stale_node_ids(node_map) or len(self.entries) != len(node_map):
+                return None
+            return self.payloads.get(category)
+
+    def payload(self, category: str | None = None) -> CatalogPayload:
+        """
+        Returns the catalog of all node types, or of those in the category (and its subcategories).
+        """
+        with self.lock:
+            self._refresh()
+            payload = self.payloads.get(category)
+            if payload is None:
+                body = b"[" + b",".join(serialized for _, node_category, serialized in self.entries.values()
+                                        if category is None or node_category == category
+                                        or node_category.startswith(category + "|")) + b"]"
+                payload = self.payloads[category] = CatalogPayload(body)
+            return payload
+
+    def _stale_node_ids(self, node_map: dict[str, type]) -> list[str]:
+        return [node_id for node_id, node_class in node_map.items()
+                if node_id not in self.entries or self.entries[node_id][0] is not node_class]
+
+    def _refresh(self):
+        node_map = self.node_map
+        stale_node_ids = self._stale_node_ids(node_map)
+        removed_node_ids = self.entries.keys() - node_map.keys()
+        if not stale_node_ids and not removed_node_ids:
+            return
+
+        self.payloads.clear()
+        for node_id in removed_node_ids:
+            del self.entries[node_id]
+        for node_id in stale_node_ids:
+            node_class = node_map[node_id]
+            serialized = json.dumps(node_class.catalog_json(), separators=(",", ":")).encode("utf-8")
+            self.entries[node_id] = (node_class, getattr(node_class, "CATEGORY", ""), serialized)
+            self.entry_builds += 1
+
+        # Keep the order of the registry
+        if list(self.entries) != list(node_map):
+            self.entries = {node_id: self.entries[node_id] for node_id in node_map}
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from bluepynt.bluepynt import Bluepynt
+from optimizer import Optimizer
+from pins import Graph
+
+
+class GraphCache:
+    """
+    LRU cache of loaded and compiled graphs, keyed by the hash of their canonical structure. Graphs only hold
+    definitions, every execution of a cached graph gets a fresh ExecutionFrame. The size of the cache is the
+    number of nodes of the cached graphs, least recently used graphs are evicted once it exceeds max_nodes.
+    Graphs using node types that are reloaded are dropped, see invalidate.
+    """
+    def __init__(self, max_nodes: int = 100_000, optimizer: Optimizer | None = None, trusted: bool = False):
+        self.max_nodes = max_nodes
+        self.optimizer = optimizer
+        self.trusted = trusted
+        self.entries: OrderedDict[str, list[Graph]] = OrderedDict()
+        self.size = 0
+        # node id -> keys of the cached graphs with nodes of that type, and the other way round
+        self.keys_by_node_id: dict[str, set[str]] = {}
+        self.node_ids_by_key: dict[str, set[str]] = {}
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Changed by every invalidation, graphs loaded meanwhile may use replaced node types and are not cached
+        self.generation = 0
+
+    @staticmethod
+    def canonicalize(data) -> dict:
+        """
+        Keeps only what the loader reads - editor-only fields such as node positions do not change the graph.
+        """
+        return {
+            "graphs": [
+                {
+                    "nodes": [
+                        {
+                            "nodeId": data_node["nodeId"],
+                            "uniqueId": data_node["uniqueId"],
+                            "arguments": data_node.get("arguments", {}),
+                        } for data_node in data_graph["nodes"]
+                    ],
+                    "variables": [
+                        {
+                            "name": data_variable["name"],
+                            "type": data_variable["type"],
+                            "value": data_variable["value"],
+                        } for data_variable in data_graph.get("variables", [])
+                    ],
+                    # In their order, a later connection to the same input replaces an earlier one
+                    "connections": [
+                        (connection["fromNode"], connection["fromPin"], connection["toNode"], connection["toPin"])
+                        for connection in data_graph["connections"]
+                    ],
+                } for data_graph in data["graphs"]
+            ]
+        }
+
+    @staticmethod
+    def structure_hash(data) -> str:
+        canonical = json.dumps(GraphCache.canonicalize(data), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def load(self, data) -> list[Graph]:
+        """
+        Returns the graphs of the structure, loading and compiling them only if they are not cached yet.
+        """
+        key = self.structure_hash(data)
+        with self.lock:
+            graphs = self.entries.get(key)
+            if graphs is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return graphs
+            self.misses += 1
+            generation = self.generation
+
+        graphs = Bluepynt.load_graph_from_structure(data, self.optimizer, self.trusted)
+        # Taken from the structure, the optimizer may have removed some of the nodes
+        self.put(key, graphs, {data_node["nodeId"] for data_graph in data["graphs"]
+                               for data_node in data_graph["nodes"]}, generation)
+        return graphs
+
+    def put(self, key: str, graphs: list[Graph], node_ids: set[str] | None = None, generation: int | None = None):
+        size = sum(len(graph.nodes) for graph in graphs)
+        if size > self.max_nodes:
+            return
+
+        with self.lock:
+            if key in self.entries or (generation is not None and generation != self.generation):
+                return
+
+            self.entries[key] = graphs
+            self.size += size
+            if node_ids is None:
+                node_ids = {node.node_id for graph in graphs for node in graph.nodes}
+            self.node_ids_by_key[key] = node_ids
+            for node_id in node_ids:
+                self.keys_by_node_id.setdefault(node_id, set()).add(key)
+            while self.size > self.max_nodes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, node_ids: list[str]):
+        """
+        Drops the graphs with nodes of the node types. Registered with mapping.ON_NODES_LOADED, so graphs are
+        loaded again with reloaded node types while the other cached graphs stay. Executions of dropped graphs
+        that are still running are not affected, they keep their own references.
+        """
+        with self.lock:
+            keys = set()
+            for node_id in node_ids:
+                keys.update(self.keys_by_node_id.get(node_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            self.generation += 1
+
+    def _remove(self, key: str):
+        graphs = self.entries.pop(key)
+        self.size -= sum(len(graph.nodes) for graph in graphs)
+        for node_id in self.node_ids_by_key.pop(key):
+            keys = self.keys_by_node_id[node_id]
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_node_id[node_id]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_node_id.clear()
+            self.node_ids_by_key.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "maxSize": self.max_nodes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
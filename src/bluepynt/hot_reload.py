@@ -0,0 +1,65 @@
+import os
+import threading
+
+from bluepynt import mapping
+
+
+class ModuleWatcher:
+    """
+    Loads node modules again when their files change. Polls the modification times of the loaded modules (every
+    .py file of package modules), only the changed modules are executed again. mapping.load_nodes_from_module
+    swaps the registry and notifies ON_NODES_LOADED listeners of the changed node ids, so caches drop only what
+    uses them. Graphs that are executing keep the node types they were built with.
+
+    Only modules loaded by path (mapping.LOADED_MODULES) are watched, plugins registered through entry points or
+    manifests (see bluepynt.manifest) are not reloaded.
+    """
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.mtimes: dict[str, dict[str, float]] = {}
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    @staticmethod
+    def module_files(module_path: str) -> dict[str, float]:
+        if os.path.isfile(module_path):
+            paths = [module_path]
+        else:
+            paths = [os.path.join(directory, file_name) for directory, _, file_names in os.walk(module_path)
+                     for file_name in file_names if file_name.endswith(".py")]
+
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                pass
+        return mtimes
+
+    def check(self) -> list[str]:
+        """
+        Loads the modules changed since the last check again, returns their paths. Modules are remembered on their
+        first check.
+        """
+        reloaded = []
+        for module_path in list(mapping.LOADED_MODULES):
+            mtimes = ModuleWatcher.module_files(module_path)
+            previous = self.mtimes.get(module_path)
+            self.mtimes[module_path] = mtimes
+            if previous is not None and previous != mtimes:
+                print(f"Reloading {module_path}")
+                if mapping.load_nodes_from_module(module_path):
+                    reloaded.append(module_path)
+        return reloaded
+
+    def start(self):
+        self.check()
+        self.thread = threading.Thread(target=self.run, daemon=True, name="bluepynt-hot-reload")
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from importlib.metadata import EntryPoint, entry_points
+
+from bluepynt import mapping
+
+PLUGIN_GROUP = "bluepynt.plugins"
+
+
+class NodeManifest:
+    """
+    What the installed plugins provide, cached on disk so the registry and the catalog can be built without
+    importing plugin code. Plugins are keyed by distribution name and version, installing another version of a
+    plugin makes its nodes be recorded again.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        # "name==version" -> entry point name -> catalog JSON of every node of the plugin
+        self.plugins: dict[str, dict[str, list[dict]]] = {}
+        if os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.plugins = json.load(f)
+            except (OSError, ValueError):
+                print(f"Cannot read node manifest {path}, plugins will be imported to rebuild it")
+
+    @staticmethod
+    def key(entry_point: EntryPoint) -> str | None:
+        if entry_point.dist is None:
+            return None
+        return f"{entry_point.dist.name}=={entry_point.dist.version}"
+
+    def nodes(self, entry_point: EntryPoint) -> list[dict] | None:
+        key = NodeManifest.key(entry_point)
+        with self.lock:
+            return self.plugins.get(key, {}).get(entry_point.name) if key is not None else None
+
+    def record(self, entry_point: EntryPoint, nodes: list[dict]):
+        key = NodeManifest.key(entry_point)
+        if key is None:
+            return
+        with self.lock:
+            # Versions that are no longer installed are dropped
+            prefix = f"{entry_point.dist.name}=="
+            for stale_key in [k for k in self.plugins if k.startswith(prefix) and k != key]:
+                del self.plugins[stale_key]
+            self.plugins.setdefault(key, {})[entry_point.name] = nodes
+
+    def discard(self, entry_point: EntryPoint):
+        key = NodeManifest.key(entry_point)
+        with self.lock:
+            self.plugins.get(key, {}).pop(entry_point.name, None)
+
+    def save(self):
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.plugins, f, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+
+
+class LazyPlugin:
+    """
+    Plugin known from the manifest. The entry point is loaded, and the plugin created, only when one of its nodes
+    is instantiated.
+    """
+    def __init__(self, entry_point: EntryPoint, manifest: NodeManifest):
+        self.entry_point = entry_point
+        self.manifest = manifest
+        self.lock = threading.Lock()
+        self.node_classes: dict[str, type] | None = None
+
+    def node_class(self, node_id: str) -> type:
+        with self.lock:
+            if self.node_classes is None:
+                print(f"Loading plugin - {self.entry_point.name}")
+                plugin = self.entry_point.load()()
+                self.node_classes = {node_type_id(node_class): node_class for node_class in plugin.load_nodes()}
+                # Replace the placeholders, so the registry holds the real classes from now on
+                node_map = mapping.NODE_MAP
+                mapping.register_nodes({node_id: node_class for node_id, node_class in self.node_classes.items()
+                                        if isinstance(node_map.get(node_id), LazyNodeType)})
+
+        node_class = self.node_classes.get(node_id)
+        if node_class is None:
+            # The plugin changed without changing its version, the next start records it again
+            self.manifest.discard(self.entry_point)
+            self.manifest.save()
+            raise Exception(f"Node type {node_id} not found in plugin {self.entry_point.name}")
+        return node_class
+
+
+class LazyNodeType:
+    """
+    Stands for a plugin node type in the registry until the plugin is loaded. Provides what the catalog needs
+    from the manifest, calling it creates a node of the real type.
+    """
+    __slots__ = ("ID", "CATEGORY", "plugin", "_catalog_json")
+
+    def __init__(self, plugin: LazyPlugin, catalog_json: dict):
+        self.ID = catalog_json["nodeId"]
+        self.CATEGORY = catalog_json.get("category", "")
+        self.plugin = plugin
+        self._catalog_json = catalog_json
+
+    def catalog_json(self) -> dict:
+        return self._catalog_json
+
+    def resolve(self) -> type:
+        return self.plugin.node_class(self.ID)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy node type {self.ID}>"
+
+
+def node_type_id(node_class: type) -> str:
+    return node_class.catalog_json()["nodeId"]
+
+
+def load_nodes_from_plugins(manifest_path: str, plugin_entry_points: list[EntryPoint] | None = None) -> int:
+    """
+    Registers the nodes of every installed plugin. Plugins recorded in the manifest are registered without being
+    imported, the others are loaded and recorded. Returns the number of registered node types.
+    """
+    manifest = NodeManifest(manifest_path)
+    if plugin_entry_points is None:
+        plugin_entry_points = list(entry_points(group=PLUGIN_GROUP))
+
+    count = 0
+    changed = False
+    for entry_point in plugin_entry_points:
+        node_types: dict[str, type | LazyNodeType] = {}
+        recorded = manifest.nodes(entry_point)
+        if recorded is not None:
+            plugin = LazyPlugin(entry_point, manifest)
+            for catalog_json in recorded:
+                node_type = LazyNodeType(plugin, catalog_json)
+                node_types[node_type.ID] = node_type
+        else:
+            try:
+                new_nodes = entry_point.load()().load_nodes()
+                recorded = []
+                for node_class in new_nodes:
+                    catalog_json = node_class.catalog_json()
+                    node_types[catalog_json["nodeId"]] = node_class
+                    recorded.append(catalog_json)
+            except Exception as e:
+                print(f"Cannot load plugin {entry_point.name}:", e)
+                continue
+            manifest.record(entry_point, recorded)
+            changed = True
+            print(f"Loaded plugin - {entry_point.name}")
+
+        mapping.register_nodes(node_types)
+        count += len(node_types)
+
+    if changed:
+        try:
+            manifest.save()
+        except OSError as e:
+            print(f"Cannot write node manifest {manifest_path}:", e)
+    if manifest_path not in mapping.LOADED_MANIFESTS:
+        mapping.LOADED_MANIFESTS.append(manifest_path)
+    return count
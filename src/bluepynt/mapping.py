@@ -2,9 +2,41 @@ import importlib
 import importlib.util
 import os
 import sys
+import threading
 import traceback
+from typing import Callable, Iterable
 
-NODE_MAP = {}
+# Copy-on-write - the registry is never changed in place, changes swap in a new dict. Read mapping.NODE_MAP once
+# and keep the reference to get a consistent view of the registry.
+NODE_MAP: dict[str, type] = {}
+# Paths of the modules loaded so far, worker processes load the same modules on start
+LOADED_MODULES: list[str] = []
+# Node ids registered by every loaded module, reloading a module drops the ids it no longer registers
+MODULE_NODE_IDS: dict[str, list[str]] = {}
+# Paths of the plugin node manifests loaded so far, worker processes register the same plugins on start
+LOADED_MANIFESTS: list[str] = []
+# Called with the node ids of every module loaded (again), e.g. to drop cached catalog entries
+ON_NODES_LOADED: list[Callable[[list[str]], None]] = []
+
+_registry_lock = threading.Lock()
+
+
+def register_nodes(nodes: dict[str, type], removed_node_ids: Iterable[str] = ()):
+    """
+    Adds, replaces and removes node types by swapping in an updated copy of the registry, then notifies
+    ON_NODES_LOADED listeners of the changed node ids.
+    """
+    global NODE_MAP
+    removed_node_ids = [node_id for node_id in removed_node_ids if node_id not in nodes]
+    with _registry_lock:
+        node_map = dict(NODE_MAP)
+        for node_id in removed_node_ids:
+            node_map.pop(node_id, None)
+        node_map.update(nodes)
+        NODE_MAP = node_map
+
+    for listener in ON_NODES_LOADED:
+        listener([*nodes, *removed_node_ids])
 
 
 def load_nodes_from_module(module_path: str) -> bool:
@@ -21,13 +53,18 @@ def load_nodes_from_module(module_path: str) -> bool:
             module_spec = importlib.util.spec_from_file_location(module_name, os.path.join(module_path, "__init__.py"))
             module_dir = module_path
 
+        # Submodules of a package loaded before would be served from sys.modules, they are executed again too
+        for loaded_name in [name for name in sys.modules if name.startswith(f"{module_name}.")]:
+            del sys.modules[loaded_name]
         module = importlib.util.module_from_spec(module_spec)
         sys.modules[module_name] = module
         module_spec.loader.exec_module(module)
 
         if hasattr(module, "NODE_MAP") and getattr(module, "NODE_MAP") is not None:
-            for name in module.NODE_MAP:
-                NODE_MAP[name] = module.NODE_MAP[name]
+            if module_path not in LOADED_MODULES:
+                LOADED_MODULES.append(module_path)
+            register_nodes(dict(module.NODE_MAP), MODULE_NODE_IDS.get(module_path, ()))
+            MODULE_NODE_IDS[module_path] = list(module.NODE_MAP)
             return True
         else:
             print(f"Skip {module_path} module for custom nodes due to the lack of NODE_MAP.")
@@ -36,4 +73,3 @@ def load_nodes_from_module(module_path: str) -> bool:
         print(traceback.format_exc())
         print(f"Cannot import {module_path} module for custom nodes:", e)
     return False
-
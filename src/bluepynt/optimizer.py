@@ -0,0 +1,239 @@
+from typing import Callable
+
+from pins import Graph, Node, InputArgumentPin, OutputArgumentPin, InputFlowPin, OutputFlowPin
+
+
+def argument_consumers(graph: Graph) -> dict[OutputArgumentPin, list[InputArgumentPin]]:
+    """
+    Maps every connected output argument pin to the input pins reading from it.
+    """
+    consumers: dict[OutputArgumentPin, list[InputArgumentPin]] = {}
+    for node in graph.nodes:
+        for pin in node.in_pins:
+            if isinstance(pin, InputArgumentPin) and pin.source_pin is not None:
+                consumers.setdefault(pin.source_pin, []).append(pin)
+    return consumers
+
+
+def argument_sources(node: Node) -> list[Node]:
+    return [pin.source_pin.parent_node for pin in node.in_pins
+            if isinstance(pin, InputArgumentPin) and pin.source_pin is not None]
+
+
+def pure_post_order(graph: Graph, eligible: Callable[[Node], bool]) -> list[Node]:
+    """
+    Returns the eligible nodes of the graph, every node after all of its eligible argument sources.
+    """
+    order: list[Node] = []
+    done: set[Node] = set()
+    visiting: set[Node] = set()
+
+    # Iterative post-order walk, pure chains can be much deeper than the recursion limit
+    for root in graph.nodes:
+        stack = [(root, False)]
+        while stack:
+            node, sources_done = stack.pop()
+            if sources_done:
+                done.add(node)
+                order.append(node)
+                continue
+            # Nodes being visited are either pending already or part of a cycle, which never evaluates anyway
+            if node in done or node in visiting:
+                continue
+            if not eligible(node) or node.parent_graph is not graph:
+                done.add(node)
+                continue
+
+            visiting.add(node)
+            stack.append((node, True))
+            stack.extend((source, False) for source in argument_sources(node) if source not in done)
+    return order
+
+
+def fold_constants(graph: Graph) -> int:
+    """
+    Evaluates foldable pure nodes whose inputs are literals or other folded nodes, replaces the connections to
+    them with the computed literals and removes them from the graph. Nodes that fail to evaluate are kept, so
+    they fail at runtime exactly as before. Returns the number of removed nodes.
+    """
+    consumers = argument_consumers(graph)
+    folded: set[Node] = set()
+    for node in pure_post_order(graph, lambda n: n.is_pure and n.FOLDABLE):
+        if all(source in folded for source in argument_sources(node)) and _evaluate(node, consumers):
+            folded.add(node)
+
+    graph.remove_nodes(folded)
+    return len(folded)
+
+
+def eliminate_common_subexpressions(graph: Graph) -> int:
+    """
+    Merges structurally identical pure nodes - the same node with the same literal arguments reading the same
+    source pins - into one, so the value is computed once. Only foldable and mergeable nodes are merged, other
+    pure nodes may return a different value on every evaluation. Returns the number of removed nodes.
+    """
+    consumers = argument_consumers(graph)
+    representatives: dict[tuple, Node] = {}
+    merged: set[Node] = set()
+    # Sources come first, so the inputs of a node already point to the representatives of its merged sources
+    for node in pure_post_order(graph, lambda n: n.is_pure and (n.FOLDABLE or n.MERGEABLE)):
+        representative = representatives.setdefault(_structure_key(node), node)
+        if representative is node:
+            continue
+
+        for pin in node.out_pins:
+            representative_pin = representative.output_pin(pin.pin_id)
+            for consumer in consumers.pop(pin, ()):
+                consumer.source_pin = representative_pin
+                consumers.setdefault(representative_pin, []).append(consumer)
+        merged.add(node)
+
+    graph.remove_nodes(merged)
+    return len(merged)
+
+
+def _structure_key(node: Node) -> tuple:
+    arguments = []
+    for pin in node.in_pins:
+        if not isinstance(pin, InputArgumentPin):
+            continue
+        if pin.source_pin is not None:
+            arguments.append((pin.pin_id, pin.source_pin))
+        else:
+            # Literals are not necessarily hashable (lists), 1, 1.0 and True must not be merged either
+            arguments.append((pin.pin_id, type(pin._value), repr(pin._value)))
+    return type(node), node.node_id, tuple(arguments)
+
+
+def _evaluate(node: Node, consumers: dict[OutputArgumentPin, list[InputArgumentPin]]) -> bool:
+    # Outside of an execution frame the pins use their own values, all inputs are literals by now
+    try:
+        node.execute()
+    except Exception:
+        return False
+
+    for pin in node.out_pins:
+        for consumer in consumers.get(pin, ()):
+            # Connected inputs are not sanitized at runtime either, the value is taken as it is
+            consumer.source_pin = None
+            consumer._value = pin._value
+    return True
+
+
+def elide_reroutes(graph: Graph) -> int:
+    """
+    Connects the endpoints of reroute nodes directly and removes the reroute nodes, they only exist for the
+    editor layout. Returns the number of removed nodes.
+    """
+    consumers = argument_consumers(graph)
+    elided: set[Node] = set()
+
+    # Sources first, so the input of a reroute is already resolved when its consumers are rewired
+    for node in pure_post_order(graph, lambda n: n.REROUTE and n.is_pure):
+        in_pin = next(pin for pin in node.in_pins if isinstance(pin, InputArgumentPin))
+        out_pin = next(pin for pin in node.out_pins if isinstance(pin, OutputArgumentPin))
+        for consumer in consumers.pop(out_pin, ()):
+            if in_pin.source_pin is not None:
+                consumer.source_pin = in_pin.source_pin
+                consumers.setdefault(in_pin.source_pin, []).append(consumer)
+            else:
+                consumer.source_pin = None
+                consumer._value = in_pin._value
+        elided.add(node)
+
+    for node in graph.nodes:
+        for pin in node.out_pins:
+            if not isinstance(pin, OutputFlowPin) or pin.destination_pin is None:
+                continue
+            destination_pin = _skip_exec_reroutes(pin.destination_pin)
+            if destination_pin is not pin.destination_pin:
+                pin.destination_pin = destination_pin
+                pin.plan = None
+
+    # Exec reroutes are removed once nothing flows into them, which leaves out only reroute cycles
+    reachable = {pin.destination_pin.parent_node for node in graph.nodes if node not in elided
+                 for pin in node.out_pins if isinstance(pin, OutputFlowPin) and pin.destination_pin is not None}
+    elided.update(node for node in graph.nodes
+                  if node.REROUTE and not node.is_pure and node not in reachable and node is not graph.main_node)
+
+    graph.remove_nodes(elided)
+    return len(elided)
+
+
+def _skip_exec_reroutes(destination_pin: InputFlowPin | None) -> InputFlowPin | None:
+    seen = set()
+    while destination_pin is not None and destination_pin.parent_node.REROUTE:
+        if destination_pin in seen:
+            # The flow loops through reroutes only, keep it as it is
+            break
+        seen.add(destination_pin)
+        out_pin = next(pin for pin in destination_pin.parent_node.out_pins if isinstance(pin, OutputFlowPin))
+        destination_pin = out_pin.destination_pin
+    return destination_pin
+
+
+def remove_dead_nodes(graph: Graph) -> int:
+    """
+    Removes nodes that can never run or be read: flow nodes unreachable from the main node and pure nodes no
+    live node reads from. Returns the number of removed nodes.
+    """
+    live: set[Node] = {graph.main_node}
+    stack = [graph.main_node]
+    while stack:
+        node = stack.pop()
+        successors = [pin.destination_pin.parent_node for pin in node.out_pins
+                      if isinstance(pin, OutputFlowPin) and pin.destination_pin is not None]
+        # Outputs of nodes that never run can still be read, their values are the defaults
+        successors += argument_sources(node)
+        for successor in successors:
+            if successor not in live:
+                live.add(successor)
+                stack.append(successor)
+
+    dead = {node for node in graph.nodes if node not in live}
+    graph.remove_nodes(dead)
+    return len(dead)
+
+
+PASSES: list[tuple[str, Callable[[Graph], int]]] = [
+    ("elide_reroutes", elide_reroutes),
+    ("fold_constants", fold_constants),
+    ("eliminate_common_subexpressions", eliminate_common_subexpressions),
+    ("remove_dead_nodes", remove_dead_nodes),
+]
+
+
+def register_pass(name: str, optimization_pass: Callable[[Graph], int], before: str | None = None):
+    """
+    Adds a pass to the default pipeline, at the end or in front of the pass called before. Plugins call this
+    when they are loaded, optimizers created afterwards run the pass.
+    """
+    names = [pass_name for pass_name, _ in PASSES]
+    if name in names:
+        raise ValueError(f"Optimization pass {name} is already registered")
+    index = names.index(before) if before is not None else len(PASSES)
+    PASSES.insert(index, (name, optimization_pass))
+
+
+class Optimizer:
+    """
+    Pipeline of optimization passes run on loaded graphs. A pass takes the graph, rewrites it in place without
+    changing what it computes and returns the number of nodes it removed. Without passes the optimizer runs the
+    registered default pipeline (see register_pass).
+    """
+    def __init__(self, passes: list[tuple[str, Callable[[Graph], int]]] | None = None):
+        self.passes = list(passes) if passes is not None else Optimizer.default_passes()
+
+    @staticmethod
+    def default_passes() -> list[tuple[str, Callable[[Graph], int]]]:
+        return list(PASSES)
+
+    def optimize(self, graph: Graph) -> dict[str, int]:
+        """
+        Runs all passes and compiles the graph again, returns the number of nodes removed by each pass.
+        """
+        report = {}
+        for name, optimization_pass in self.passes:
+            report[name] = optimization_pass(graph)
+        graph.compile()
+        return report
@@ -0,0 +1,257 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+# Private to the user, files in it are unpickled, so anyone able to write to it could run code in every process
+# reading it
+DEFAULT_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+                                 "bluepynt", "node_outputs")
+
+# Node type -> hash of the source of its module, outputs of changed code never match outputs of the old code
+_versions: weakref.WeakKeyDictionary[type, str] = weakref.WeakKeyDictionary()
+
+
+class OutputCache:
+    """
+    Content-addressed cache of the outputs of nodes that opt in with CACHE_OUTPUTS. Outputs are keyed by the node
+    id, the source of the node's module and a hash of the values of the node's inputs, so re-running a graph reuses
+    the outputs of every cacheable node whose inputs did not change, across executions and graphs.
+
+    Outputs are kept pickled in memory, every hit returns a new copy. Least recently used ones are evicted once their
+    size exceeds max_bytes. Every entry is written to directory as well, where least recently used files are
+    deleted once they exceed max_disk_bytes. Processes sharing the directory rescan it after writing a sixteenth
+    of max_disk_bytes, so together they exceed it by at most that much each. Outputs that survive eviction from
+    memory, or a restart, are read back from disk. Inputs or outputs that cannot be pickled are not cached, the
+    cache keeps working from memory when the directory cannot be used.
+
+    Files in the directory are unpickled, so they must only ever be written by the processes of the same user. The
+    directory is created readable by its owner only, and is not used when it is owned by another user or when others
+    may write to it.
+    """
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024,
+                 directory: str | None = DEFAULT_DIRECTORY, max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        # Whether the directory was created or its owner and permissions were checked
+        self.directory_checked = False
+        self.lock = threading.Lock()
+        # key -> pickled output values
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.size = 0
+        # key -> size of the file, least recently used first. Built from the directory on the first disk access
+        # and again whenever other processes may have changed it
+        self.disk_entries: OrderedDict[str, int] | None = None
+        self.disk_size = 0
+        self.written_since_scan = 0
+        # node id -> keys of its outputs this process has seen, dropped when the node type is reloaded
+        self.node_keys: dict[str, set[str]] = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.disk_errors = 0
+
+    @staticmethod
+    def key(node_id: str, input_values: list, version: str = "") -> str | None:
+        try:
+            serialized = pickle.dumps((node_id, version, input_values), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+        return hashlib.sha256(serialized).hexdigest()
+
+    @staticmethod
+    def node_version(node_type: type) -> str:
+        """
+        Hash of the source of the module declaring the node type.
+        """
+        version = _versions.get(node_type)
+        if version is None:
+            module = sys.modules.get(node_type.__module__)
+            try:
+                with open(module.__file__, "rb") as f:
+                    version = hashlib.sha256(f.read()).hexdigest()
+            except (AttributeError, TypeError, OSError):
+                version = ""
+            _versions[node_type] = version
+        return version
+
+    def get(self, key: str, node_id: str | None = None) -> list | None:
+        with self.lock:
+            serialized = self.entries.get(key)
+            if serialized is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            elif self._directory() is None:
+                self.misses += 1
+                return None
+            elif key in self._disk_entries():
+                self.disk_entries.move_to_end(key)
+        if serialized is not None:
+            return pickle.loads(serialized)
+
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                serialized = f.read()
+            output_values = pickle.loads(serialized)
+            # Files are evicted by modification time, across processes
+            os.utime(path)
+        except Exception:
+            # Not written yet, deleted or half written by another process, or written by an incompatible version
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.disk_hits += 1
+            if key not in self.disk_entries:
+                # Written by another process since the last scan
+                self.disk_entries[key] = len(serialized)
+                self.disk_size += len(serialized)
+            self._put_memory(key, serialized, node_id)
+        return output_values
+
+    def put(self, key: str, output_values: list, node_id: str | None = None):
+        try:
+            serialized = pickle.dumps(output_values, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        with self.lock:
+            self._put_memory(key, serialized, node_id)
+            if self._directory() is None or len(serialized) > self.max_disk_bytes or key in self._disk_entries():
+                return
+
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(serialized)
+            os.replace(temp_path, path)
+        except OSError:
+            with self.lock:
+                self.disk_errors += 1
+            return
+
+        with self.lock:
+            if key not in self.disk_entries:
+                self.disk_entries[key] = len(serialized)
+                self.disk_size += len(serialized)
+            self.written_since_scan += len(serialized)
+            if self.disk_size > self.max_disk_bytes or self.written_since_scan > self.max_disk_bytes // 16:
+                # Other processes write to the directory too
+                self.disk_entries = None
+                self._disk_entries()
+            while self.disk_size > self.max_disk_bytes:
+                evicted_key, evicted_size = self.disk_entries.popitem(last=False)
+                self.disk_size -= evicted_size
+                self.disk_evictions += 1
+                self._remove_file(evicted_key)
+
+    def invalidate(self, node_ids: list[str]):
+        """
+        Drops the outputs this process has seen of the node types, e.g. once they were reloaded.
+        """
+        with self.lock:
+            for node_id in node_ids:
+                for key in self.node_keys.pop(node_id, ()):
+                    serialized = self.entries.pop(key, None)
+                    if serialized is not None:
+                        self.size -= len(serialized)
+                    if self.disk_entries is not None and key in self.disk_entries:
+                        self.disk_size -= self.disk_entries.pop(key)
+                        self._remove_file(key)
+
+    def _put_memory(self, key: str, serialized: bytes, node_id: str | None):
+        if node_id is not None:
+            self.node_keys.setdefault(node_id, set()).add(key)
+        if len(serialized) > self.max_bytes or key in self.entries:
+            return
+        self.entries[key] = serialized
+        self.size += len(serialized)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def _directory(self) -> str | None:
+        """
+        The directory, once it was checked to only be writable by this user, or None.
+        """
+        if self.directory is not None and not self.directory_checked:
+            self.directory_checked = True
+            try:
+                os.makedirs(self.directory, mode=0o700, exist_ok=True)
+                stat = os.stat(self.directory)
+            except OSError:
+                stat = None
+            if stat is None or (hasattr(os, "getuid") and stat.st_uid != os.getuid()) or stat.st_mode & 0o022:
+                self.directory = None
+                self.disk_errors += 1
+        return self.directory
+
+    def _disk_entries(self) -> OrderedDict[str, int]:
+        if self.disk_entries is None:
+            files = []
+            for directory, _, file_names in os.walk(self.directory):
+                for file_name in file_names:
+                    if file_name.endswith(".pkl"):
+                        try:
+                            stat = os.stat(os.path.join(directory, file_name))
+                        except OSError:
+                            # Evicted by another process meanwhile
+                            continue
+                        files.append((stat.st_mtime_ns, file_name[:-4], stat.st_size))
+            self.disk_entries = OrderedDict((key, size) for _, key, size in sorted(files))
+            self.disk_size = sum(self.disk_entries.values())
+            self.written_since_scan = 0
+        return self.disk_entries
+
+    def _remove_file(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def clear(self):
+        """
+        Drops every output, in memory and in the directory.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.node_keys.clear()
+            if self._directory() is None:
+                return
+            for key in self._disk_entries():
+                self._remove_file(key)
+            self.disk_entries = None
+            self._disk_entries()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "maxSize": self.max_bytes,
+                "diskEntries": len(self.disk_entries) if self.disk_entries is not None else None,
+                "diskSize": self.disk_size,
+                "maxDiskSize": self.max_disk_bytes,
+                "hits": self.hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "diskEvictions": self.disk_evictions,
+                "diskErrors": self.disk_errors,
+            }
@@ -0,0 +1,351 @@
+import contextvars
+import hashlib
+import multiprocessing
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from bluepynt import mapping
+from bluepynt.bluepynt import Bluepynt
+from bluepynt.manifest import load_nodes_from_plugins
+from optimizer import argument_sources, pure_post_order
+from pins import BaseFunctionNode, ExecutionFrame, ExecutionPlan, Graph, InputArgumentPin, Node, OutputArgumentPin, \
+    OutputFlowPin
+
+# Set in the threads of the pool, branches do not dispatch their own branches again so the pool cannot run out of
+# threads while every thread waits for another
+_in_branch: contextvars.ContextVar[bool] = contextvars.ContextVar("bluepynt_in_branch", default=False)
+
+
+class ParallelEvaluator:
+    """
+    Evaluates the independent branches of a pure pull at the same time. Before a pure node is evaluated, the pure
+    nodes its inputs need are split into branches that share no node, and the branches whose nodes cost at least
+    min_cost together (see Node.COST) run on a thread pool while the evaluating thread runs one of them itself.
+    Cheaper branches are evaluated one after another as without the evaluator, so trivial math is never dispatched.
+
+    Branches and their costs are computed once per execution plan (see PureBranches), a pull only checks which of
+    the branches of the node still have to be evaluated.
+
+    Branches share the frame of the execution, only nodes that release the GIL (torch, PIL, I/O) gain from it.
+    Memoization keeps every node evaluated once, graphs that do not memoize pure nodes are evaluated sequentially.
+    """
+    def __init__(self, max_workers: int | None = None, min_cost: float = 0.01):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="bluepynt-pure")
+        self.min_cost = min_cost
+        self.lock = threading.Lock()
+        # Plans are replaced whenever their graph is rewired, the branches of a plan never change
+        self.plan_branches: weakref.WeakKeyDictionary[ExecutionPlan, PureBranches] = weakref.WeakKeyDictionary()
+
+        self.dispatched = 0
+        self.pulls = 0
+
+    def evaluate_sources(self, node: Node, frame: ExecutionFrame):
+        plan = frame.graph.plan
+        if _in_branch.get() or plan is None or not frame.graph.memoize_pure_nodes:
+            return
+        pure_branches = self.plan_branches.get(plan)
+        if pure_branches is None:
+            with self.lock:
+                pure_branches = self.plan_branches.setdefault(plan, PureBranches(frame.graph))
+        if pure_branches.costs.get(node, 0.0) < self.min_cost:
+            return
+
+        branches = [pins for pins, cost in pure_branches.branches(node) if cost >= self.min_cost
+                    and any(_pending(pin.parent_node, frame) for pin in pins)]
+        if len(branches) < 2:
+            return
+
+        context = contextvars.copy_context()
+        futures = [self.executor.submit(context.copy().run, _evaluate_branch, pins) for pins in branches[1:]]
+        with self.lock:
+            self.pulls += 1
+            self.dispatched += len(futures)
+        try:
+            for pin in branches[0]:
+                pin.value
+        finally:
+            # Every branch writes to the frame, none may still be running once the pull goes on
+            wait(futures)
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "workers": self.max_workers,
+                "minCost": self.min_cost,
+                "pulls": self.pulls,
+                "dispatched": self.dispatched,
+            }
+
+
+class PureBranches:
+    """
+    Static analysis of the pure nodes of a graph for parallel evaluation - the summed COST of the pure nodes
+    every pure node depends on, built in a single pass, and the branches of the nodes that cost enough to be
+    split, built on first use.
+    """
+    def __init__(self, graph: Graph):
+        self.lock = threading.Lock()
+        # Pure node -> summed COST of the pure nodes it reads from, directly or not
+        self.costs: dict[Node, float] = {}
+        self._branches: dict[Node, list[tuple[list[OutputArgumentPin], float]]] = {}
+
+        # Only nodes with a cost are collected, graphs of plain math keep empty sets
+        costly_sources: dict[Node, frozenset[Node]] = {}
+        for node in pure_post_order(graph, _is_pure_function):
+            costly = frozenset()
+            for source in argument_sources(node):
+                if source in costly_sources:
+                    costly = costly | costly_sources[source] | ({source} if source.COST else frozenset())
+            costly_sources[node] = costly
+            self.costs[node] = sum(costly_node.COST for costly_node in costly)
+
+    def branches(self, node: Node) -> list[tuple[list[OutputArgumentPin], float]]:
+        """
+        Splits the pure nodes the inputs of the node read from into branches sharing no node. Returns the output
+        pins the node reads from every branch, with the summed cost of its nodes.
+        """
+        branches = self._branches.get(node)
+        if branches is None:
+            branches = PureBranches.split(node)
+            with self.lock:
+                self._branches[node] = branches
+        return branches
+
+    @staticmethod
+    def split(node: Node) -> list[tuple[list[OutputArgumentPin], float]]:
+        pins: list[list[OutputArgumentPin]] = []
+        costs: list[float] = []
+        # Branches merged into another one point to it
+        parents: list[int] = []
+        owners: dict[Node, int] = {}
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                index = parents[index]
+            return index
+
+        for in_pin in node.in_pins:
+            if not isinstance(in_pin, InputArgumentPin) or in_pin.source_pin is None \
+                    or not _is_pure_function(in_pin.source_pin.parent_node) \
+                    or in_pin.source_pin.parent_node.parent_graph is not node.parent_graph:
+                continue
+            index = len(parents)
+            pins.append([in_pin.source_pin])
+            costs.append(0.0)
+            parents.append(index)
+
+            stack = [in_pin.source_pin.parent_node]
+            while stack:
+                source = stack.pop()
+                owner = owners.get(source)
+                if owner is not None:
+                    branch, other = find(index), find(owner)
+                    if branch != other:
+                        parents[branch] = other
+                        pins[other] += pins[branch]
+                        costs[other] += costs[branch]
+                    continue
+                owners[source] = index
+                costs[find(index)] += source.COST
+                stack.extend(next_source for next_source in argument_sources(source)
+                             if _is_pure_function(next_source) and next_source.parent_graph is node.parent_graph)
+
+        return [(pins[index], costs[index]) for index in range(len(parents)) if parents[index] == index]
+
+
+def _is_pure_function(node: Node) -> bool:
+    return isinstance(node, BaseFunctionNode) and node.is_pure
+
+
+def _pending(node: Node, frame: ExecutionFrame) -> bool:
+    return frame.is_stale(node)
+
+
+def _evaluate_branch(pins: list[OutputArgumentPin]):
+    _in_branch.set(True)
+    for pin in pins:
+        pin.value
+
+
+# region Loop bodies
+
+# Unique id of the Begin node starting serialized loop bodies
+BODY_BEGIN_ID = "bluepynt.parallel.begin"
+
+# Process pools by number of workers, shared by every loop
+_process_pools: dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+# Loop bodies loaded by a worker process, by structure hash
+_body_graphs: OrderedDict[str, Graph] = OrderedDict()
+_MAX_BODY_GRAPHS = 16
+
+
+def loop_body(loop_node: Node, body_pin_id: str, result_pin_ids: tuple[str, ...] = ()) -> list[Node] | None:
+    """
+    Returns the nodes run by the body flow of the loop and the pure nodes they (and the result pins of the loop)
+    read from. Returns None when the body has to run in this process - the iterations may see the effects of each
+    other (the body contains a node with SHARED_SIDE_EFFECTS or its flow leads back to the loop), or nodes outside
+    the body read outputs of the nodes it runs.
+    """
+    body: dict[Node, None] = {}
+    pending = [loop_node.output_flow_pin(body_pin_id)]
+    while pending:
+        destination_pin = pending.pop().destination_pin
+        if destination_pin is None:
+            continue
+        node = destination_pin.parent_node
+        if node is loop_node:
+            return None
+        if node in body:
+            continue
+        body[node] = None
+        pending.extend(pin for pin in node.out_pins if isinstance(pin, OutputFlowPin))
+
+    flow_nodes = list(body)
+    graph = loop_node.parent_graph
+    pending_pins = [loop_node.argument_pin(pin_id) for pin_id in result_pin_ids]
+    pending_pins += [pin for node in body for pin in node.in_pins if isinstance(pin, InputArgumentPin)]
+    while pending_pins:
+        source_pin = pending_pins.pop().source_pin
+        source = source_pin.parent_node if source_pin is not None else None
+        if source is None or source is loop_node or source in body:
+            continue
+        if isinstance(source, BaseFunctionNode) and source.is_pure and source.parent_graph is graph:
+            body[source] = None
+            pending_pins.extend(pin for pin in source.in_pins if isinstance(pin, InputArgumentPin))
+
+    if any(node.SHARED_SIDE_EFFECTS for node in body):
+        return None
+
+    # Outputs of the body flow, and of pure nodes reading them, are never set in this process
+    flow_outputs = set(flow_nodes)
+    changed = True
+    while changed:
+        changed = False
+        for node in body:
+            if node not in flow_outputs and any(source in flow_outputs for source in argument_sources(node)):
+                flow_outputs.add(node)
+                changed = True
+    for node in graph.nodes:
+        if node in body:
+            continue
+        for pin in node.in_pins:
+            if isinstance(pin, InputArgumentPin) and pin.source_pin is not None \
+                    and pin.source_pin.parent_node in flow_outputs \
+                    and not (node is loop_node and pin.pin_id in result_pin_ids):
+                return None
+    return list(body)
+
+
+def body_structure(loop_node: Node, body: list[Node], arguments: dict) -> dict:
+    """
+    Serializes the loop and its body (see loop_body) to a graph structure starting the loop from a Begin node.
+    The loop gets the arguments given instead of its own, other inputs from outside the body are passed the
+    values they have in the current frame, and the variables their current values.
+    """
+    body_nodes = set(body)
+    data_nodes = [{"nodeId": "bluepynt.builtin.BeginNode", "uniqueId": BODY_BEGIN_ID}]
+    connections = [{"fromNode": BODY_BEGIN_ID, "fromPin": "exec_out", "toNode": loop_node.unique_id,
+                    "toPin": "exec_in"}]
+    for node in [loop_node, *body]:
+        data_arguments = dict(arguments) if node is loop_node else {}
+        for pin in node.in_pins:
+            if not isinstance(pin, InputArgumentPin) or pin.pin_id in data_arguments:
+                continue
+            source_node = pin.source_pin.parent_node if pin.source_pin is not None else None
+            if source_node is not None and (source_node is loop_node or source_node in body_nodes):
+                connections.append({"fromNode": source_node.unique_id, "fromPin": pin.source_pin.pin_id,
+                                    "toNode": node.unique_id, "toPin": pin.pin_id})
+            else:
+                value = pin.value
+                if value is not None:
+                    data_arguments[pin.pin_id] = value
+        for pin in node.out_pins:
+            if isinstance(pin, OutputFlowPin) and pin.destination_pin is not None \
+                    and pin.destination_pin.parent_node in body_nodes:
+                connections.append({"fromNode": node.unique_id, "fromPin": pin.pin_id,
+                                    "toNode": pin.destination_pin.parent_node.unique_id,
+                                    "toPin": pin.destination_pin.pin_id})
+        data_nodes.append({"nodeId": node.node_id, "uniqueId": node.unique_id, "arguments": data_arguments})
+
+    graph = loop_node.parent_graph
+    return {
+        "graphs": [{
+            "nodes": data_nodes,
+            "connections": connections,
+            "variables": [{"name": variable.name, "type": variable.type.__name__, "value": variable.value}
+                          for variable in graph.variables],
+        }]
+    }
+
+
+def run_loop_chunks(structure: dict, loop_id: str, chunks: list[list], max_workers: int) -> list:
+    """
+    Runs the serialized loop (see body_structure) once for every chunk of items on a process pool, every run
+    getting the chunk as its list. Returns the results of all runs in the order of the chunks.
+    """
+    key = hashlib.sha256(pickle.dumps(structure, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+    futures = [process_pool(max_workers).submit(_run_loop_chunk, key, structure, loop_id, chunk) for chunk in chunks]
+    results = []
+    try:
+        for future in futures:
+            results.extend(future.result())
+    finally:
+        for future in futures:
+            future.cancel()
+    return results
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    with _process_pools_lock:
+        pool = _process_pools.get(max_workers)
+        if pool is None:
+            # Spawned, forking the threads of the server could copy locks they hold
+            pool = _process_pools[max_workers] = ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialize_process,
+                initargs=(list(mapping.LOADED_MODULES), list(mapping.LOADED_MANIFESTS)))
+        return pool
+
+
+def shutdown_process_pools():
+    with _process_pools_lock:
+        pools = list(_process_pools.values())
+        _process_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _initialize_process(module_paths: list[str], manifest_paths: list[str]):
+    for module_path in module_paths:
+        if module_path not in mapping.LOADED_MODULES:
+            mapping.load_nodes_from_module(module_path)
+    for manifest_path in manifest_paths:
+        if manifest_path not in mapping.LOADED_MANIFESTS:
+            load_nodes_from_plugins(manifest_path)
+
+
+def _run_loop_chunk(key: str, structure: dict, loop_id: str, items: list) -> list:
+    graph = _body_graphs.get(key)
+    if graph is None:
+        graph = Bluepynt.load_graph_from_structure(structure)[0]
+        _body_graphs[key] = graph
+        while len(_body_graphs) > _MAX_BODY_GRAPHS:
+            _body_graphs.popitem(last=False)
+    else:
+        _body_graphs.move_to_end(key)
+
+    loop_node = graph.node(loop_id)
+    frame = ExecutionFrame(graph)
+    frame.values[loop_node.argument_pin("list").slot] = items
+    graph.compile().execute_frame(frame)
+    return frame.values[loop_node.output_pin("results").slot]
+# endregion
@@ -1,158 +1,911 @@
+import threading
+import time
 from abc import abstractmethod
-from types import UnionType
-from typing import Callable, Any
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from types import GenericAlias, UnionType
+from typing import Callable, Any, Generator, get_args, get_origin
+
+_current_frame: ContextVar['ExecutionFrame | None'] = ContextVar("bluepynt_execution_frame", default=None)
+
+
+def current_frame() -> 'ExecutionFrame | None':
+    """
+    Returns the frame of the execution running in the current thread or task, None outside of executions.
+    """
+    return _current_frame.get()
+
+
+def report_progress(event: str, data: dict):
+    """
+    Reports progress of a long-running node to whoever started the current execution, no-op if nobody listens.
+    """
+    frame = _current_frame.get()
+    if frame is not None and frame.progress_callback is not None:
+        frame.progress_callback(event, data)
 
 
 def sanitize_value(value, value_type: type | UnionType):
-    if isinstance(value, str) and not isinstance(value, value_type):
-        if value_type is int:
-            value = int(value)
-        if value_type is float:
-            value = float(value)
-        if value_type is int | float:
-            if "." in value:
-                value = float(value)
-            else:
-                value = int(value)
+    return make_validator(value_type)(value)
 
-    if value_type is Any:
-        return value
 
-    if not isinstance(value, value_type):
-        raise ValueError(f"Value {value} is not of type {value_type} and could not be converted to it")
+@lru_cache(maxsize=None)
+def _type_members(value_type: type | UnionType) -> tuple[type, ...]:
+    # Parametrized generics such as list[Any] can only be checked against their origin
+    if isinstance(value_type, UnionType):
+        return tuple(member for union_type in get_args(value_type) for member in _type_members(union_type))
+    if isinstance(value_type, GenericAlias):
+        return get_origin(value_type),
+    return value_type,
+
 
+@lru_cache(maxsize=None)
+def make_validator(value_type: type | UnionType) -> Callable[[Any], Any]:
+    """
+    Returns a function that checks a value against the type, converting strings to numbers where the type asks
+    for them. Validators are specialized for the type and shared by all pins and variables of that type.
+    """
+    if value_type is Any:
+        return _accept
+
+    members = _type_members(value_type)
+    check_type = members[0] if len(members) == 1 else members
+
+    def error(value) -> ValueError:
+        return ValueError(f"Value {value} is not of type {value_type} and could not be converted to it")
+
+    if int in members and float in members:
+        def validate(value):
+            if isinstance(value, check_type):
+                return value
+            if isinstance(value, str):
+                return float(value) if "." in value else int(value)
+            raise error(value)
+    elif int in members or float in members:
+        convert = int if int in members else float
+
+        def validate(value):
+            if isinstance(value, check_type):
+                return value
+            if isinstance(value, str):
+                return convert(value)
+            raise error(value)
+    else:
+        def validate(value):
+            if isinstance(value, check_type):
+                return value
+            raise error(value)
+    return validate
+
+
+def _accept(value):
     return value
 
 
+@lru_cache(maxsize=None)
+def is_assignable(source_type: type | UnionType, destination_type: type | UnionType) -> bool:
+    """
+    Returns False if no value of the source type can be used where the destination type is expected. Any and
+    unions are optimistic - a float | int output may well produce the int an int input needs.
+    """
+    if source_type is Any or destination_type is Any:
+        return True
+
+    destination_members = _type_members(destination_type)
+    for source in _type_members(source_type):
+        for destination in destination_members:
+            if issubclass(source, destination) or issubclass(destination, source):
+                return True
+            # Connected inputs are not converted, but ints are used as floats throughout the builtin nodes
+            if source is int and destination is float:
+                return True
+    return False
+
+
+def check_connection(pin: 'InputArgumentPin'):
+    """
+    Raises ValueError if the source of the pin produces values the pin cannot take, using inferred types if any.
+    """
+    source_pin = pin.source_pin
+    if not is_assignable(source_pin.resolved_type, pin.resolved_type):
+        raise ValueError(f"Pin {source_pin.parent_node.unique_id}.{source_pin.pin_id} of type "
+                         f"{source_pin.resolved_type} cannot be connected to "
+                         f"{pin.parent_node.unique_id}.{pin.pin_id} of type {pin.resolved_type}")
+
+
+# Profiled executions running in the process, pin lookups only look for the profiler of their frame while there are
+# any, unprofiled executions pay a single check of the counter
+_profiled_executions = 0
+_profiled_executions_lock = threading.Lock()
+
+
+def _count_profiled_execution(delta: int):
+    global _profiled_executions
+    with _profiled_executions_lock:
+        _profiled_executions += delta
+
+
+def _profiled_lookup(node: 'Node', pins: tuple['Pin', ...], index: dict[str, int], pin_id: str, pin_type: type):
+    frame = _current_frame.get()
+    if frame is None or frame.profiler is None:
+        return _lookup_pin(node, pins, index, pin_id, pin_type)
+    start = time.perf_counter()
+    try:
+        return _lookup_pin(node, pins, index, pin_id, pin_type)
+    finally:
+        frame.profiler.add_overhead("lookup", time.perf_counter() - start)
+
+
+def _lookup_pin(node: 'Node', pins: tuple['Pin', ...], index: dict[str, int], pin_id: str, pin_type: type):
+    position = index.get(pin_id)
+    pin = pins[position] if position is not None else None
+    if not isinstance(pin, pin_type):
+        raise Exception(f"Pin {pin_id} not found in node {node.node_id}")
+    return pin
+
+
+def _profiled_validate(validator: Callable[[Any], Any], value):
+    profiler = _current_frame.get().profiler
+    start = time.perf_counter()
+    try:
+        return validator(value)
+    finally:
+        profiler.add_overhead("sanitize", time.perf_counter() - start)
+
+
 class Graph:
+    """
+    Definition of a graph. Nodes, pins and variables only hold the definition (literal values, connections),
+    everything that changes while the graph runs lives in an ExecutionFrame, so a single graph can be executed
+    by many threads or tasks at once. Argument pins, nodes and variables get their frame slots here.
+    """
     def __init__(self,
                  main_node: 'Node', nodes: tuple['Node'] = (),
                  variables: tuple['GraphVariable'] = ()):
         self.main_node = main_node
         self.nodes = nodes
         self.variables = variables
+        self.argument_pins: list[ArgumentPin] = []
+        self.nodes_by_id: dict[str, Node] = {}
+        self.variables_by_name: dict[str, GraphVariable] = {}
+        # Pure nodes are evaluated again only once a value they depend on changed (see ExecutionFrame.is_stale)
+        self.memoize_pure_nodes = True
+        # Trusted graphs had their types checked at load time (see trust), values are not validated while running
+        self.trusted = False
 
-        for node in self.nodes:
-            node.parent_graph = self
+        # Runtime properties
+        self.plan: ExecutionPlan | None = None
 
-    def execute(self):
-        self.main_node.execute()
+        self.reindex()
 
-    def node(self, unique_id: str) -> 'Node':
+    def reindex(self):
+        """
+        Assigns frame slots and rebuilds the lookup indexes, needed whenever nodes are added or removed.
+        """
+        self.argument_pins = []
+        self.nodes_by_id = {}
+        self.variables_by_name = {}
+        self.plan = None
+
+        for slot, node in enumerate(self.nodes):
+            node.parent_graph = self
+            node.slot = slot
+            self.nodes_by_id[node.unique_id] = node
+            for pin in node.in_pins + node.out_pins:
+                if isinstance(pin, ArgumentPin):
+                    pin.slot = len(self.argument_pins)
+                    self.argument_pins.append(pin)
+
+        for slot, variable in enumerate(self.variables):
+            variable.parent_graph = self
+            variable.slot = slot
+            self.variables_by_name[variable.name] = variable
+
+    def remove_nodes(self, nodes: set['Node']):
+        """
+        Removes the nodes from the graph, connections pointing to them have to be removed by the caller.
+        """
+        if not nodes:
+            return
+
+        for node in nodes:
+            node.parent_graph = None
+            node.slot = -1
+            for pin in node.in_pins + node.out_pins:
+                if isinstance(pin, ArgumentPin):
+                    pin.slot = -1
+
+        self.nodes = tuple(node for node in self.nodes if node not in nodes)
+        self.reindex()
+
+    def execute(self, progress_callback: Callable[[str, dict], None] | None = None,
+                profiler=None, output_cache=None, parallel=None) -> 'ExecutionFrame':
+        return self.compile().execute(progress_callback, profiler, output_cache, parallel)
+
+    def trust(self):
+        """
+        Checks the types of the whole graph once - literal and default values as well as every connection, with
+        the types inferred for Any pins (see type_inference) - and marks the graph as trusted, so executions skip
+        validating every value set. Nodes must produce values of the types their output pins declare. Raises
+        ValueError for values or connections of incompatible types.
+        """
+        for variable in self.variables:
+            variable.validator(variable.default_value)
         for node in self.nodes:
-            if node.unique_id == unique_id:
-                return node
+            for pin in node.in_pins:
+                if not isinstance(pin, InputArgumentPin):
+                    continue
+                if pin.source_pin is None:
+                    if pin._value is not None:
+                        pin.validator(pin._value)
+                else:
+                    check_connection(pin)
+        self.trusted = True
+
+    def compile(self) -> 'ExecutionPlan':
+        """
+        Returns the execution plan of this graph, compiling it on first use. The plan snapshots the flow
+        connections, so it has to be compiled again (see ExecutionPlan.compile) after the graph is rewired.
+        """
+        if self.plan is None:
+            self.plan = ExecutionPlan.compile(self)
+        return self.plan
 
-        raise Exception(f"Node {unique_id} not found in graph")
+    def node(self, unique_id: str) -> 'Node':
+        node = self.nodes_by_id.get(unique_id)
+        if node is None:
+            raise Exception(f"Node {unique_id} not found in graph")
+        return node
 
     def variable(self, variable_name: str) -> 'GraphVariable':
-        for variable in self.variables:
-            if variable.name == variable_name:
-                return variable
+        variable = self.variables_by_name.get(variable_name)
+        if variable is None:
+            raise Exception(f"Variable {variable_name} not found in graph")
+        return variable
+
+
+class ExecutionPlan:
+    """
+    Flat representation of the execution flow of a graph. Every input flow pin gets an integer slot and an
+    instruction - the resolved callable to run and the slot to continue with (-1 ends the chain). Chains of
+    function nodes are executed by a single loop without going through the pins.
+
+    Flow nodes (macros) with a flow method get the SUSPEND instruction instead: the flow method is a generator
+    yielding the output flow pins to fire, the scheduler keeps it on an explicit stack while the chain behind
+    the yielded pin runs and resumes it once that chain has ended. The Python stack depth therefore does not
+    depend on the length of the chains or on how deeply the flow nodes are nested.
+    """
+    SUSPEND = -2
+
+    def __init__(self, graph: Graph, instructions: list[tuple[Callable, int]], instruction_nodes: list['Node'],
+                 entry_slot: int):
+        self.graph = graph
+        self.instructions = instructions
+        self.instruction_nodes = instruction_nodes
+        self.entry_slot = entry_slot
+
+        # Instructions reporting to the profiler of the frame, only built once an execution is profiled
+        self._profiled_instructions: list[tuple[Callable, int]] | None = None
+        # Built once a memoized pure node is read again after a change, see pure_dependencies
+        self._pure_dependencies: list[tuple[tuple[int, ...], tuple[int, ...]] | None] | None = None
+
+    @staticmethod
+    def compile(graph: Graph) -> 'ExecutionPlan':
+        input_flow_pins: list[InputFlowPin] = []
+        for node in graph.nodes:
+            for pin in node.in_pins:
+                if isinstance(pin, InputFlowPin):
+                    pin.slot = len(input_flow_pins)
+                    input_flow_pins.append(pin)
+
+        def destination_slot(output_pin: OutputFlowPin) -> int:
+            if output_pin.destination_pin is None:
+                return -1
+            return output_pin.destination_pin.slot
+
+        instructions: list[tuple[Callable, int]] = []
+        for pin in input_flow_pins:
+            node = pin.parent_node
+            if isinstance(node, BaseFunctionNode) and pin.pin_id == "exec_in":
+                method = node.execute if not node.CACHE_OUTPUTS else partial(execute_node, node)
+                instructions.append((method, destination_slot(node.output_flow_pin("exec_out"))))
+            elif pin.flow_method is not None:
+                instructions.append((pin.flow_method, ExecutionPlan.SUSPEND))
+            else:
+                instructions.append((pin.execute_method, -1))
+        instruction_nodes = [pin.parent_node for pin in input_flow_pins]
+
+        # The main node has no input flow pin, it is run by an extra instruction at the end of the plan
+        entry_slot = len(instructions)
+        instructions.append((graph.main_node.flow, ExecutionPlan.SUSPEND))
+        instruction_nodes.append(graph.main_node)
+
+        plan = ExecutionPlan(graph, instructions, instruction_nodes, entry_slot)
+        for node in graph.nodes:
+            for pin in node.out_pins:
+                if isinstance(pin, OutputFlowPin):
+                    pin.plan = plan
+                    pin.destination_slot = destination_slot(pin)
+
+        return plan
+
+    def execute(self, progress_callback: Callable[[str, dict], None] | None = None,
+                profiler=None, output_cache=None, parallel=None) -> 'ExecutionFrame':
+        """
+        Runs the graph in a new frame. Passing a profiler (see bluepynt.profiler) times every node execution,
+        passing an output cache (see bluepynt.output_cache) reuses the outputs of nodes with CACHE_OUTPUTS and
+        passing a parallel evaluator (see bluepynt.parallel) evaluates independent expensive pure branches at once.
+        """
+        return self.execute_frame(ExecutionFrame(self.graph, progress_callback, profiler, output_cache, parallel))
+
+    def execute_frame(self, frame: 'ExecutionFrame') -> 'ExecutionFrame':
+        """
+        Runs the graph in a frame prepared by the caller, e.g. with outputs of pure nodes reused (see
+        ExecutionFrame.reuse_outputs).
+        """
+        profiled = frame.profiler is not None
+        if profiled:
+            _count_profiled_execution(1)
+        token = _current_frame.set(frame)
+        try:
+            self.run(self.entry_slot)
+        finally:
+            _current_frame.reset(token)
+            if profiled:
+                _count_profiled_execution(-1)
+        return frame
+
+    def run(self, slot: int):
+        instructions = self.instructions
+        frame = _current_frame.get()
+        if frame is not None and frame.profiler is not None:
+            instructions = self.profiled_instructions()
+
+        suspended: list[Generator['OutputFlowPin', None, None]] = []
+        while True:
+            while slot >= 0:
+                method, next_slot = instructions[slot]
+                if next_slot == ExecutionPlan.SUSPEND:
+                    suspended.append(method())
+                    slot = -1
+                else:
+                    method()
+                    slot = next_slot
+
+            # The chain has ended, resume the innermost flow node until it fires its next pin
+            while suspended:
+                pin = next(suspended[-1], None)
+                if pin is None:
+                    suspended.pop()
+                    continue
+                slot = pin.destination_slot
+                break
+            else:
+                return
+
+    def pure_dependencies(self) -> list[tuple[tuple[int, ...], tuple[int, ...]] | None]:
+        """
+        For every pure function node (by node slot), the slots of the argument pins and of the variables its outputs
+        are computed from - inputs of pure nodes upstream without a source, outputs of impure nodes and the
+        variables the pure nodes read. Variable slot -1 stands for any variable, None for nodes that are not pure.
+        """
+        if self._pure_dependencies is not None:
+            return self._pure_dependencies
+
+        graph = self.graph
+        dependencies: list[tuple[tuple[int, ...], tuple[int, ...]] | None] = [None] * len(graph.nodes)
+
+        def pure_source(pin: InputArgumentPin) -> 'Node | None':
+            source_pin = pin.source_pin
+            if source_pin is None or not _is_memoized(source_pin.parent_node) or \
+                    source_pin.parent_node.parent_graph is not graph:
+                return None
+            return source_pin.parent_node
+
+        visiting: set[int] = set()
+        for root in graph.nodes:
+            if not _is_memoized(root):
+                continue
+            # Post order without recursion, pure sources first. Cycles are not followed
+            stack: list[tuple[Node, bool]] = [(root, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if dependencies[node.slot] is not None:
+                    continue
+                if not expanded:
+                    if node.slot not in visiting:
+                        visiting.add(node.slot)
+                        stack.append((node, True))
+                        stack.extend((source, False) for pin in node.in_pins if isinstance(pin, InputArgumentPin)
+                                     if (source := pure_source(pin)) is not None)
+                    continue
+
+                pin_slots: set[int] = set()
+                variable_slots: set[int] = set()
+                for pin in node.in_pins:
+                    if not isinstance(pin, InputArgumentPin):
+                        continue
+                    source = pure_source(pin)
+                    if source is not None:
+                        source_pins, source_variables = dependencies[source.slot] or ((), ())
+                        pin_slots.update(source_pins)
+                        variable_slots.update(source_variables)
+                    else:
+                        pin_slots.add(pin.slot if pin.source_pin is None else pin.source_pin.slot)
+                variables = node.read_variables()
+                variable_slots.update((-1,) if variables is None else (variable.slot for variable in variables))
+                dependencies[node.slot] = (tuple(pin_slots), tuple(variable_slots))
+
+        self._pure_dependencies = dependencies
+        return dependencies
+
+    def profiled_instructions(self) -> list[tuple[Callable, int]]:
+        if self._profiled_instructions is None:
+            self._profiled_instructions = [
+                (partial(_profiled_flow if next_slot == ExecutionPlan.SUSPEND else _profiled_call, node, method),
+                 next_slot)
+                for node, (method, next_slot) in zip(self.instruction_nodes, self.instructions)
+            ]
+        return self._profiled_instructions
+
+
+def _profiled_call(node: 'Node', method: Callable):
+    profiler = _current_frame.get().profiler
+    profiler.enter(node)
+    try:
+        method()
+    finally:
+        profiler.exit(node)
+
+
+def _profiled_flow(node: 'Node', method: Callable):
+    # Chains fired by the flow node run while it is suspended and count as nested in the profiler
+    profiler = _current_frame.get().profiler
+    profiler.enter(node)
+    try:
+        yield from method()
+    finally:
+        profiler.exit(node)
+
+
+def execute_node(node: 'Node'):
+    """
+    Executes a function node, nodes with CACHE_OUTPUTS take their outputs from the output cache of the execution
+    if their input values were seen before.
+    """
+    if not node.CACHE_OUTPUTS:
+        node.execute()
+        return
+    frame = _current_frame.get()
+    if frame is None or frame.output_cache is None:
+        node.execute()
+        return
+
+    output_cache = frame.output_cache
+    output_pins = [pin for pin in node.out_pins if isinstance(pin, OutputArgumentPin)]
+    key = output_cache.key(node.node_id, [pin.value for pin in node.in_pins if isinstance(pin, InputArgumentPin)],
+                           output_cache.node_version(type(node)))
+    if key is not None:
+        output_values = output_cache.get(key, node.node_id)
+        if output_values is not None:
+            for pin, value in zip(output_pins, output_values):
+                pin.set_value(value)
+            return
+
+    node.execute()
+    if key is not None:
+        # Read from the frame, reading the pins would evaluate pure nodes again
+        output_cache.put(key, [frame.values[pin.slot] if pin.slot >= 0 else pin._value for pin in output_pins],
+                         node.node_id)
+
+
+def _is_memoized(node: 'Node') -> bool:
+    return isinstance(node, BaseFunctionNode) and node.is_pure
+
+
+def _drop_plan(pin: 'Pin'):
+    # Plans (and what is derived from them, see bluepynt.parallel) snapshot the connections of the graph
+    node = pin.parent_node
+    if node is not None and node.parent_graph is not None:
+        node.parent_graph.plan = None
+
+
+def run_flow(flow: Generator['OutputFlowPin', None, None]):
+    """
+    Fires the pins yielded by a flow method one after another, used when a flow node is executed directly.
+    """
+    for pin in flow:
+        pin.execute()
+
+
+class ExecutionFrame:
+    """
+    Mutable state of a single execution of a graph - values of the argument pins and variables, per node
+    state and memoization epochs, all indexed by the slots assigned by the graph.
+
+    The epoch moves on with every change of a value pure nodes may depend on (values set on argument pins other
+    than outputs of pure nodes, variables), which is stamped with the new epoch. Pure nodes remember the epoch they
+    were evaluated in and are evaluated again only once one of their own dependencies has a later stamp.
+    """
+    # Evaluated epoch of pure nodes whose outputs were provided before the execution, they are never evaluated
+    REUSED = -2
+
+    def __init__(self, graph: Graph, progress_callback: Callable[[str, dict], None] | None = None, profiler=None,
+                 output_cache=None, parallel=None):
+        self.graph = graph
+        self.progress_callback = progress_callback
+        self.profiler = profiler
+        self.output_cache = output_cache
+        # Not used while profiling, the profiler times one node at a time
+        self.parallel = parallel if profiler is None else None
+        self.validate = not graph.trusted
+        self.values = [pin._value for pin in graph.argument_pins]
+        self.variables = [variable.default_value for variable in graph.variables]
+        self.node_states: list[dict | None] = [None] * len(graph.nodes)
+        self.evaluated_epochs = [-1] * len(graph.nodes)
+        self.epoch = 0
+        # Epoch of the last change of every argument pin and variable, the last variable entry is any variable
+        self.value_epochs = [0] * len(graph.argument_pins)
+        self.variable_epochs = [0] * (len(graph.variables) + 1)
+        self.dependencies: list[tuple[tuple[int, ...], tuple[int, ...]] | None] | None = None
+
+    def variable(self, variable_name: str):
+        return self.variables[self.graph.variable(variable_name).slot]
+
+    def is_stale(self, node: 'Node') -> bool:
+        """
+        Whether the pure node has to be evaluated (again) before its outputs are read.
+        """
+        evaluated = self.evaluated_epochs[node.slot]
+        if evaluated == ExecutionFrame.REUSED:
+            return False
+        if evaluated < 0 or not self.graph.memoize_pure_nodes:
+            return True
+        if evaluated == self.epoch:
+            return False
+
+        if self.dependencies is None:
+            self.dependencies = self.graph.compile().pure_dependencies()
+        pin_slots, variable_slots = self.dependencies[node.slot]
+        value_epochs = self.value_epochs
+        for slot in pin_slots:
+            if value_epochs[slot] > evaluated:
+                return True
+        variable_epochs = self.variable_epochs
+        for slot in variable_slots:
+            if variable_epochs[slot] > evaluated:
+                return True
+        # Nothing it depends on changed, checks stay cheap until the next change
+        self.evaluated_epochs[node.slot] = self.epoch
+        return False
+
+    def reuse_outputs(self, node: 'Node', values: list):
+        """
+        Provides the values of the output argument pins of a pure node, which is then not evaluated in this frame.
+        Only valid for nodes whose outputs do not change while the graph runs.
+        """
+        for pin, value in zip([pin for pin in node.out_pins if isinstance(pin, OutputArgumentPin)], values):
+            self.values[pin.slot] = value
+        self.evaluated_epochs[node.slot] = ExecutionFrame.REUSED
+
+    def output_values(self, node: 'Node') -> list:
+        return [self.values[pin.slot] for pin in node.out_pins if isinstance(pin, OutputArgumentPin)]
 
-        raise Exception(f"Variable {variable_name} not found in graph")
+    def to_json(self):
+        return {
+            "variables": {variable.name: self.variables[variable.slot] for variable in self.graph.variables},
+        }
 
 
 class GraphVariable:
+    __slots__ = ("name", "_type", "validator", "default_value", "_value", "parent_graph", "slot")
+
     def __init__(self, name: str, variable_type: type | UnionType, default_value=None):
         self.name = name
         self.type = variable_type
         self.default_value = default_value
         self._value = self.default_value
 
+        # Runtime properties
+        self.parent_graph: Graph | None = None
+        self.slot = -1
+
     @property
     def value(self):
-        return self._value
+        frame = _current_frame.get()
+        if frame is None or self.slot < 0:
+            return self._value
+        return frame.variables[self.slot]
+
+    @property
+    def type(self) -> type | UnionType:
+        return self._type
+
+    @type.setter
+    def type(self, variable_type: 'type | UnionType'):
+        self._type = variable_type
+        self.validator = make_validator(variable_type)
 
     def set_value(self, value):
-        self._value = sanitize_value(value, self.type)
+        frame = _current_frame.get()
+        if frame is None or self.slot < 0:
+            self._value = self.validator(value)
+            return
+
+        if frame.validate:
+            value = self.validator(value) if frame.profiler is None else _profiled_validate(self.validator, value)
+        frame.variables[self.slot] = value
+        frame.epoch += 1
+        frame.variable_epochs[self.slot] = frame.variable_epochs[-1] = frame.epoch
 
 
 class Node:
+    """
+    Base of all nodes. Node types declare what they are at class level - ID, NAME, DESCRIPTION, CATEGORY,
+    IS_PURE and the IN_PINS / OUT_PINS templates, which are validated once when the class is created. Creating
+    a node then only copies the pin templates, and the catalog is built from the class (see catalog_json).
+    Nodes that build their pins in __init__ and pass them to the constructor are supported as well.
+    """
     ID: str = "undefined"
+    NAME: str = ""
+    DESCRIPTION: str = ""
+    CATEGORY: str = ""
+    IS_PURE: bool = False
+    IN_PINS: tuple['Pin', ...] | None = None
+    OUT_PINS: tuple['Pin', ...] | None = None
+    # Foldable nodes are pure and deterministic, with only literal inputs they are evaluated once at load time
+    FOLDABLE: bool = False
+    # Mergeable nodes are pure and give the same outputs for the same inputs within one epoch, so identical
+    # instances can share one evaluation. Foldable nodes are always mergeable
+    MERGEABLE: bool = False
+    # Reroute nodes pass their only input to their only output, they exist for the editor layout
+    REROUTE: bool = False
+    # Nodes that give the same outputs for the same input values, and are expensive enough for their outputs to be
+    # kept in the output cache across executions (see bluepynt.output_cache). Outputs must be picklable
+    CACHE_OUTPUTS: bool = False
+    # Estimated seconds one evaluation takes, pure branches costing more than the threshold of a parallel evaluator
+    # are evaluated at the same time as their siblings (see bluepynt.parallel)
+    COST: float = 0.0
+    # Nodes with effects later executions of other nodes see, such as writing a graph variable. Loop bodies
+    # containing them are never split across processes (see bluepynt.parallel)
+    SHARED_SIDE_EFFECTS: bool = False
+
+    # Subclasses declare empty __slots__ to stay compact, they can still add their own attributes without them
+    __slots__ = ("node_id", "name", "is_pure", "description", "category", "unique_id", "parent_graph", "slot",
+                 "_state", "_in_pins", "_out_pins", "_in_index", "_out_index")
+
+    # Validated pin templates of declared node types, None for nodes that build their pins in __init__
+    _in_templates: tuple['Pin', ...] | None = None
+    _out_templates: tuple['Pin', ...] | None = None
+    _declared_in_index: dict[str, int] = {}
+    _declared_out_index: dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.IN_PINS is None and cls.OUT_PINS is None:
+            return
 
-    def __init__(self, node_id: str, name: str,
-                 in_pins: tuple['Pin'] | tuple = (), out_pins: tuple['Pin'] | tuple = (),
-                 is_pure: bool = False, description: str = "", category: str = ""):
-        self.node_id = node_id
-        self.name = name
-        self.is_pure = is_pure
-        self.in_pins = in_pins
-        self.out_pins = out_pins
-        self.description = description
-        self.category = category
+        in_pins, out_pins = cls.declared_pins(tuple(cls.IN_PINS or ()), tuple(cls.OUT_PINS or ()))
+        for pins in (in_pins, out_pins):
+            pin_ids = [pin.pin_id for pin in pins]
+            if len(set(pin_ids)) != len(pin_ids):
+                raise Exception(f"Node {cls.ID} declares duplicate pin ids {pin_ids}")
+        for pin in in_pins + out_pins:
+            if isinstance(pin, ArgumentPin) and pin.type_depends_on is not None and \
+                    pin.type_depends_on not in (pin.pin_id for pin in in_pins + out_pins):
+                raise Exception(f"Pin {pin.pin_id} of node {cls.ID} depends on unknown pin {pin.type_depends_on}")
+            if isinstance(pin, InputFlowPin):
+                for method in (pin.execute_method, pin.flow_method):
+                    if method is not None and not (isinstance(method, str) and callable(getattr(cls, method, None))):
+                        raise Exception(f"Flow pin {pin.pin_id} of node {cls.ID} has to name a method of the "
+                                        f"node, got {method}")
+
+        cls._in_templates, cls._out_templates = in_pins, out_pins
+        cls._declared_in_index = _pin_index(tuple(pin.pin_id for pin in in_pins))
+        cls._declared_out_index = _pin_index(tuple(pin.pin_id for pin in out_pins))
+
+    @classmethod
+    def declared_pins(cls, in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]) \
+            -> tuple[tuple['Pin', ...], tuple['Pin', ...]]:
+        """
+        Completes and checks the pins declared by a node type, base classes add their own pins here.
+        """
+        return in_pins, out_pins
+
+    def __init__(self, node_id: str | None = None, name: str | None = None,
+                 in_pins: tuple['Pin'] | tuple | None = None, out_pins: tuple['Pin'] | tuple | None = None,
+                 is_pure: bool | None = None, description: str | None = None, category: str | None = None):
+        cls = type(self)
+        self.node_id = node_id if node_id is not None else cls.ID
+        self.name = name if name is not None else cls.NAME
+        self.is_pure = is_pure if is_pure is not None else cls.IS_PURE
+        self.description = description if description is not None else cls.DESCRIPTION
+        self.category = category if category is not None else cls.CATEGORY
+
+        if in_pins is None and cls._in_templates is not None:
+            self._in_pins = tuple([pin.instantiate(self) for pin in cls._in_templates])
+            self._in_index = cls._declared_in_index
+        else:
+            self.in_pins = in_pins or ()
+        if out_pins is None and cls._out_templates is not None:
+            self._out_pins = tuple([pin.instantiate(self) for pin in cls._out_templates])
+            self._out_index = cls._declared_out_index
+        else:
+            self.out_pins = out_pins or ()
 
         # Runtime properties
         self.unique_id = None
         self.parent_graph: Graph | None = None
+        self.slot = -1
+        self._state: dict | None = None
 
-        for pin in self.in_pins:
+    @property
+    def in_pins(self) -> tuple['Pin'] | tuple:
+        return self._in_pins
+
+    @in_pins.setter
+    def in_pins(self, pins: tuple['Pin'] | tuple):
+        self._in_pins = pins
+        self._in_index = _pin_index(tuple(pin.pin_id for pin in pins))
+        for pin in pins:
             pin.parent_node = self
 
-        for pin in self.out_pins:
+    @property
+    def out_pins(self) -> tuple['Pin'] | tuple:
+        return self._out_pins
+
+    @out_pins.setter
+    def out_pins(self, pins: tuple['Pin'] | tuple):
+        self._out_pins = pins
+        self._out_index = _pin_index(tuple(pin.pin_id for pin in pins))
+        for pin in pins:
             pin.parent_node = self
 
-    def output_flow_pin(self, pin_id: str) -> 'OutputFlowPin':
-        for pin in self.out_pins:
-            if pin.pin_id == pin_id and isinstance(pin, OutputFlowPin):
-                return pin
+    @property
+    def state(self) -> dict:
+        """
+        Per execution state of the node (e.g. loop flags), the node itself is shared between executions.
+        """
+        frame = _current_frame.get()
+        if frame is None or self.slot < 0:
+            if self._state is None:
+                self._state = {}
+            return self._state
+
+        state = frame.node_states[self.slot]
+        if state is None:
+            state = frame.node_states[self.slot] = {}
+        return state
 
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+    def output_flow_pin(self, pin_id: str) -> 'OutputFlowPin':
+        if _profiled_executions:
+            return _profiled_lookup(self, self._out_pins, self._out_index, pin_id, OutputFlowPin)
+        index = self._out_index.get(pin_id)
+        pin = self._out_pins[index] if index is not None else None
+        if not isinstance(pin, OutputFlowPin):
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def input_flow_pin(self, pin_id: str) -> 'InputFlowPin':
-        for pin in self.in_pins:
-            if pin.pin_id == pin_id and isinstance(pin, InputFlowPin):
-                return pin
-
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        if _profiled_executions:
+            return _profiled_lookup(self, self._in_pins, self._in_index, pin_id, InputFlowPin)
+        index = self._in_index.get(pin_id)
+        pin = self._in_pins[index] if index is not None else None
+        if not isinstance(pin, InputFlowPin):
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def argument_pin(self, pin_id: str) -> 'InputArgumentPin':
-        for pin in self.in_pins:
-            if pin.pin_id == pin_id and isinstance(pin, InputArgumentPin):
-                return pin
-
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        if _profiled_executions:
+            return _profiled_lookup(self, self._in_pins, self._in_index, pin_id, InputArgumentPin)
+        index = self._in_index.get(pin_id)
+        pin = self._in_pins[index] if index is not None else None
+        if not isinstance(pin, InputArgumentPin):
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def output_pin(self, pin_id: str) -> 'OutputArgumentPin':
-        for pin in self.out_pins:
-            if pin.pin_id == pin_id and isinstance(pin, OutputArgumentPin):
-                return pin
-
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        if _profiled_executions:
+            return _profiled_lookup(self, self._out_pins, self._out_index, pin_id, OutputArgumentPin)
+        index = self._out_index.get(pin_id)
+        pin = self._out_pins[index] if index is not None else None
+        if not isinstance(pin, OutputArgumentPin):
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def any_output_pin(self, pin_id: str) -> 'Pin':
-        for pin in self.out_pins:
-            if pin.pin_id == pin_id:
-                return pin
-
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        if _profiled_executions:
+            return _profiled_lookup(self, self._out_pins, self._out_index, pin_id, Pin)
+        index = self._out_index.get(pin_id)
+        pin = self._out_pins[index] if index is not None else None
+        if pin is None:
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def any_input_pin(self, pin_id: str) -> 'Pin':
-        for pin in self.in_pins:
-            if pin.pin_id == pin_id:
-                return pin
-
-        raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        if _profiled_executions:
+            return _profiled_lookup(self, self._in_pins, self._in_index, pin_id, Pin)
+        index = self._in_index.get(pin_id)
+        pin = self._in_pins[index] if index is not None else None
+        if pin is None:
+            raise Exception(f"Pin {pin_id} not found in node {self.node_id}")
+        return pin
 
     def execute(self):
         pass
 
+    def read_variables(self) -> tuple['GraphVariable', ...] | None:
+        """
+        Graph variables a pure node reads, its memoized outputs go stale when they change. None if they are only
+        known while the graph runs, any variable change makes the outputs stale then.
+        """
+        return ()
+
+    def infer_types(self) -> dict['ArgumentPin', type | UnionType]:
+        """
+        Returns concrete types of Any pins that follow from the types resolved so far (see type_inference). The
+        default resolves pins declaring type_depends_on to the type of the pin they depend on.
+        """
+        types = {}
+        for pin in (*self.in_pins, *self.out_pins):
+            if not isinstance(pin, ArgumentPin) or pin.type_depends_on is None:
+                continue
+            pins, index = (self._in_pins, self._in_index) if pin.is_output else (self._out_pins, self._out_index)
+            depends_on = pins[index[pin.type_depends_on]] if pin.type_depends_on in index else None
+            if isinstance(depends_on, ArgumentPin) and depends_on.resolved_type is not Any:
+                types[pin] = depends_on.resolved_type
+        return types
+
+    def flow(self) -> Generator['OutputFlowPin', None, None]:
+        """
+        Generator form of execute for nodes that fire output flow pins - instead of calling pin.execute() it
+        yields the pin and continues once everything connected to it has run. The default runs execute().
+        """
+        self.execute()
+        yield from ()
+
     def to_json(self):
+        return self.node_json(self.node_id, self.name, self.description, self.category, self.is_pure,
+                              self.in_pins, self.out_pins)
+
+    @classmethod
+    def catalog_json(cls) -> dict:
+        """
+        JSON of the node type for the editor, built from the class declaration without creating a node.
+        """
+        if cls._in_templates is None:
+            return cls().to_json()
+        return cls.node_json(cls.ID, cls.NAME, cls.DESCRIPTION, cls.CATEGORY, cls.IS_PURE, cls._in_templates,
+                             cls._out_templates)
+
+    @classmethod
+    def node_json(cls, node_id: str, name: str, description: str, category: str, is_pure: bool,
+                  in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]) -> dict:
         return {
-            "id": self.node_id,
-            "nodeId": self.node_id,
-            "name": self.name,
-            "description": self.description,
-            "category": self.category,
-            "inPins": [pin.to_json() for pin in self.in_pins],
-            "outPins": [pin.to_json() for pin in self.out_pins]
+            "id": node_id,
+            "nodeId": node_id,
+            "name": name,
+            "description": description,
+            "category": category,
+            "inPins": [pin.to_json() for pin in in_pins],
+            "outPins": [pin.to_json() for pin in out_pins]
         }
 
 
 class BaseFunctionNode(Node):
-    def __init__(self, node_id: str, name: str,
-                 in_pins: tuple['Pin'] | tuple = (), out_pins: tuple['Pin'] | tuple = (),
-                 is_pure: bool = False, description: str = "", category: str = ""):
+    __slots__ = ()
+
+    @classmethod
+    def declared_pins(cls, in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]) \
+            -> tuple[tuple['Pin', ...], tuple['Pin', ...]]:
+        BaseFunctionNode.check_pins(in_pins, out_pins)
+        if not cls.IS_PURE:
+            in_pins = (InputFlowPin(pin_id="exec_in", name="", execute_method="internal_execute"),) + in_pins
+            out_pins = (OutputFlowPin(pin_id="exec_out", name=""),) + out_pins
+        return in_pins, out_pins
+
+    @staticmethod
+    def check_pins(in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]):
         if any(isinstance(i, FlowPin) for i in in_pins):
             raise Exception("Input pins cannot be flow pins for functions nodes. If you want to use flow pins, "
                             "extend BaseMacroNode instead.")
@@ -160,57 +913,130 @@ class BaseFunctionNode(Node):
             raise Exception("Output pins cannot be flow pins for functions nodes. If you want to use flow pins, "
                             "extend BaseMacroNode instead.")
 
-        if not is_pure:
-            in_pins = (InputFlowPin(pin_id="exec_in", name="", execute_method=self.execute),) + in_pins
+    def __init__(self, node_id: str | None = None, name: str | None = None,
+                 in_pins: tuple['Pin'] | tuple | None = None, out_pins: tuple['Pin'] | tuple | None = None,
+                 is_pure: bool | None = None, description: str | None = None, category: str | None = None):
+        if in_pins is None and out_pins is None and type(self)._in_templates is not None:
+            # Declared node type, the pins were checked and completed when the class was created
+            super().__init__(node_id, name, None, None, is_pure, description, category)
+            return
+
+        in_pins, out_pins = in_pins or (), out_pins or ()
+        BaseFunctionNode.check_pins(in_pins, out_pins)
+        if not (is_pure if is_pure is not None else type(self).IS_PURE):
+            in_pins = (InputFlowPin(pin_id="exec_in", name="", execute_method=self.internal_execute),) + in_pins
             out_pins = (OutputFlowPin(pin_id="exec_out", name=""),) + out_pins
 
         super().__init__(node_id, name, in_pins, out_pins, is_pure, description, category)
 
     def internal_execute(self):
-        self.execute()
+        execute_node(self)
         self.output_flow_pin("exec_out").execute()
 
     @abstractmethod
     def execute(self):
         pass
 
-    def to_json(self):
+    @classmethod
+    def node_json(cls, node_id: str, name: str, description: str, category: str, is_pure: bool,
+                  in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]) -> dict:
         return {
-            "id": self.node_id,
-            "nodeId": self.node_id,
+            "id": node_id,
+            "nodeId": node_id,
             "baseType": "functions",
-            "isPure": self.is_pure,
-            "name": self.name,
-            "description": self.description,
-            "inPins": [pin.to_json() for pin in self.in_pins],
-            "outPins": [pin.to_json() for pin in self.out_pins]
+            "isPure": is_pure,
+            "name": name,
+            "description": description,
+            "inPins": [pin.to_json() for pin in in_pins],
+            "outPins": [pin.to_json() for pin in out_pins]
         }
 
 
 class BaseMacroNode(Node):
-    def __init__(self, node_id: str, name: str = "Default node name",
-                 in_pins: tuple['Pin'] | tuple = (), out_pins: tuple['Pin'] | tuple = (), description: str = "",
-                 category: str = ""):
+    __slots__ = ()
+    NAME = "Default node name"
+
+    def __init__(self, node_id: str | None = None, name: str | None = None,
+                 in_pins: tuple['Pin'] | tuple | None = None, out_pins: tuple['Pin'] | tuple | None = None,
+                 description: str | None = None, category: str | None = None):
         super().__init__(node_id, name, in_pins, out_pins, False, description, category)
 
-    def to_json(self):
+    @classmethod
+    def node_json(cls, node_id: str, name: str, description: str, category: str, is_pure: bool,
+                  in_pins: tuple['Pin', ...], out_pins: tuple['Pin', ...]) -> dict:
         return {
-            "id": self.node_id,
-            "nodeId": self.node_id,
+            "id": node_id,
+            "nodeId": node_id,
             "baseType": "macro",
-            "name": self.name,
-            "description": self.description,
-            "inPins": [pin.to_json() for pin in self.in_pins],
-            "outPins": [pin.to_json() for pin in self.out_pins]
+            "name": name,
+            "description": description,
+            "inPins": [pin.to_json() for pin in in_pins],
+            "outPins": [pin.to_json() for pin in out_pins]
         }
 
 
-class Pin:
-    def __init__(self, pin_id: str, name: str, description: str = ""):
-        self.parent_node: Node | None = None
+class PinSchema:
+    """
+    Static description of a pin, shared by the pins of all instances of a node type (see pin_schema).
+    """
+    __slots__ = ("pin_id", "name", "description", "type", "type_depends_on", "validator")
+
+    def __init__(self, pin_id: str, name: str, description: str = "", pin_type: type | UnionType | None = None,
+                 type_depends_on: str | None = None):
         self.pin_id = pin_id
         self.name = name
         self.description = description
+        self.type = pin_type
+        self.type_depends_on = type_depends_on
+        self.validator = make_validator(pin_type) if pin_type is not None else None
+
+
+def pin_schema(pin_id: str, name: str, description: str = "", pin_type: type | UnionType | None = None,
+               type_depends_on: str | None = None) -> PinSchema:
+    # int | float equals float | int (in list[...] too), the type name is part of the key so the catalog keeps the
+    # declared order
+    return _pin_schema(pin_id, name, description, pin_type, str(pin_type), type_depends_on)
+
+
+@lru_cache(maxsize=None)
+def _pin_schema(pin_id: str, name: str, description: str, pin_type: type | UnionType | None, type_name: str,
+                type_depends_on: str | None) -> PinSchema:
+    return PinSchema(pin_id, name, description, pin_type, type_depends_on)
+
+
+@lru_cache(maxsize=None)
+def _pin_index(pin_ids: tuple[str, ...]) -> dict[str, int]:
+    # Shared by all nodes with the same pins, never modified
+    return {pin_id: index for index, pin_id in enumerate(pin_ids)}
+
+
+class Pin:
+    __slots__ = ("schema", "parent_node")
+
+    def __init__(self, pin_id: str, name: str, description: str = ""):
+        self.schema = pin_schema(pin_id, name, description)
+        self.parent_node: Node | None = None
+
+    def instantiate(self, node: Node) -> 'Pin':
+        """
+        Copy of a pin template declared by a node type, owned by the node.
+        """
+        pin = object.__new__(type(self))
+        pin.schema = self.schema
+        pin.parent_node = node
+        return pin
+
+    @property
+    def pin_id(self) -> str:
+        return self.schema.pin_id
+
+    @property
+    def name(self) -> str:
+        return self.schema.name
+
+    @property
+    def description(self) -> str:
+        return self.schema.description
 
     def to_json(self):
         return {
@@ -221,24 +1047,79 @@ class Pin:
 
 
 class ArgumentPin(Pin):
+    __slots__ = ("_value", "slot", "inferred_type")
+    is_output = False
+
     def __init__(self, pin_id: str, name: str, argument_type: type | UnionType, description: str = "",
                  type_depends_on: str = None):
-        super().__init__(pin_id, name, description)
-        self.type = argument_type
-        self.type_depends_on = type_depends_on
+        self.schema = pin_schema(pin_id, name, description, argument_type, type_depends_on)
+        self.parent_node: Node | None = None
 
         # Runtime properties
         self._value = None
+        self.slot = -1
+        # Concrete type of an Any pin, resolved by type inference when the graph is loaded
+        self.inferred_type: type | UnionType | None = None
+
+    def instantiate(self, node: Node) -> 'ArgumentPin':
+        pin = object.__new__(type(self))
+        pin.schema = self.schema
+        pin.parent_node = node
+        pin._value = self._value
+        pin.slot = -1
+        pin.inferred_type = None
+        return pin
 
     @property
     def value(self):
-        return self._value
+        frame = _current_frame.get()
+        if frame is None or self.slot < 0:
+            return self._value
+        return frame.values[self.slot]
+
+    @property
+    def type(self) -> type | UnionType:
+        return self.schema.type
+
+    @type.setter
+    def type(self, argument_type: 'type | UnionType'):
+        # The schema is shared, a pin with a different type gets its own
+        schema = self.schema
+        self.schema = pin_schema(schema.pin_id, schema.name, schema.description, argument_type,
+                                 schema.type_depends_on)
+
+    @property
+    def type_depends_on(self) -> str | None:
+        return self.schema.type_depends_on
+
+    @property
+    def validator(self) -> Callable[[Any], Any]:
+        return self.schema.validator
+
+    @property
+    def resolved_type(self) -> 'type | UnionType':
+        return self.inferred_type if self.inferred_type is not None else self.schema.type
 
     def set_value(self, value):
-        self._value = sanitize_value(value, self.type)
+        frame = _current_frame.get()
+        if frame is None or self.slot < 0:
+            self._value = self.schema.validator(value)
+            return
+
+        if frame.validate:
+            validator = self.schema.validator
+            value = validator(value) if frame.profiler is None else _profiled_validate(validator, value)
+        frame.values[self.slot] = value
+        # Values produced by pure nodes are derived, anything else invalidates the memoized pure nodes using it
+        if not (self.is_output and self.parent_node.is_pure):
+            frame.epoch += 1
+            frame.value_epochs[self.slot] = frame.epoch
 
 
 class OutputArgumentPin(ArgumentPin):
+    __slots__ = ()
+    is_output = True
+
     def __init__(self, pin_id: str, name: str, argument_type: type | UnionType, description: str = "",
                  type_depends_on: str = None):
         super().__init__(pin_id, name, argument_type, description, type_depends_on)
@@ -246,10 +1127,26 @@ class OutputArgumentPin(ArgumentPin):
 
     @property
     def value(self):
-        # self._value is None and
-        if isinstance(self.parent_node, BaseFunctionNode) and self.parent_node.is_pure:
-            self.parent_node.execute()
-        return self._value
+        node = self.parent_node
+        frame = _current_frame.get()
+        if isinstance(node, BaseFunctionNode) and node.is_pure:
+            if frame is None or node.slot < 0:
+                node.execute()
+            elif frame.is_stale(node):
+                if frame.profiler is None:
+                    if frame.parallel is not None:
+                        frame.parallel.evaluate_sources(node, frame)
+                    if node.CACHE_OUTPUTS:
+                        execute_node(node)
+                    else:
+                        node.execute()
+                else:
+                    _profiled_call(node, partial(execute_node, node))
+                frame.evaluated_epochs[node.slot] = frame.epoch
+
+        if frame is None or self.slot < 0:
+            return self._value
+        return frame.values[self.slot]
 
     def connect(self, destination_pin: 'InputArgumentPin'):
         destination_pin.connect(self)
@@ -267,6 +1164,8 @@ class OutputArgumentPin(ArgumentPin):
 
 
 class InputArgumentPin(ArgumentPin):
+    __slots__ = ("source_pin",)
+
     def __init__(self, pin_id: str, name: str, argument_type: type | UnionType,
                  description: str = "", default_value=None, type_depends_on: str = None):
         super().__init__(pin_id, name, argument_type, description, type_depends_on)
@@ -275,14 +1174,29 @@ class InputArgumentPin(ArgumentPin):
         # Runtime properties
         self.source_pin: OutputArgumentPin | None = None
 
+    def instantiate(self, node: Node) -> 'InputArgumentPin':
+        pin = object.__new__(type(self))
+        pin.schema = self.schema
+        pin.parent_node = node
+        pin._value = self._value
+        pin.slot = -1
+        pin.inferred_type = None
+        pin.source_pin = None
+        return pin
+
     @property
     def value(self):
         if self.source_pin is not None:
             return self.source_pin.value
-        return self._value
+        return super().value
 
     def connect(self, source_pin: OutputArgumentPin):
         self.source_pin = source_pin
+        _drop_plan(self)
+
+    def disconnect(self):
+        self.source_pin = None
+        _drop_plan(self)
 
     def to_json(self):
         return {
@@ -297,6 +1211,8 @@ class InputArgumentPin(ArgumentPin):
 
 
 class FlowPin(Pin):
+    __slots__ = ()
+
     def __init__(self, pin_id, name, description: str = ""):
         super().__init__(pin_id, name, description)
 
@@ -310,25 +1226,66 @@ class FlowPin(Pin):
 
 
 class InputFlowPin(FlowPin):
-    def __init__(self, pin_id: str, name: str, execute_method: Callable, description: str = ""):
+    __slots__ = ("execute_method", "flow_method", "slot")
+
+    def __init__(self, pin_id: str, name: str, execute_method: Callable | str, description: str = "",
+                 flow_method: Callable[[], Generator['OutputFlowPin', None, None]] | str | None = None):
+        """
+        Pins declared at class level (Node.IN_PINS) name the methods of the node instead of passing them.
+        """
         super().__init__(pin_id, name, description)
         self.execute_method = execute_method
+        self.flow_method = flow_method
+
+        # Runtime properties
+        self.slot = -1
+
+    def instantiate(self, node: Node) -> 'InputFlowPin':
+        pin = object.__new__(type(self))
+        pin.schema = self.schema
+        pin.parent_node = node
+        pin.execute_method = getattr(node, self.execute_method)
+        pin.flow_method = getattr(node, self.flow_method) if self.flow_method is not None else None
+        pin.slot = -1
+        return pin
 
     def connect(self, source_pin: 'OutputFlowPin'):
         source_pin.connect(self)
 
 
 class OutputFlowPin(FlowPin):
+    __slots__ = ("destination_pin", "plan", "destination_slot")
+
     def __init__(self, pin_id: str, name: str = "", description: str = ""):
         super().__init__(pin_id, name, description)
 
         # Runtime properties
         self.destination_pin: InputFlowPin | None = None
+        self.plan: ExecutionPlan | None = None
+        self.destination_slot = -1
+
+    def instantiate(self, node: Node) -> 'OutputFlowPin':
+        pin = object.__new__(type(self))
+        pin.schema = self.schema
+        pin.parent_node = node
+        pin.destination_pin = None
+        pin.plan = None
+        pin.destination_slot = -1
+        return pin
 
     def connect(self, destination_pin: InputFlowPin):
         self.destination_pin = destination_pin
+        self.plan = None
+        _drop_plan(self)
+
+    def disconnect(self):
+        self.destination_pin = None
+        self.plan = None
+        _drop_plan(self)
 
     def execute(self):
+        if self.plan is not None:
+            return self.plan.run(self.destination_slot)
         if self.destination_pin is None:
             return
         self.destination_pin.execute_method()
@@ -0,0 +1,203 @@
+import threading
+from typing import Callable
+
+from bluepynt.bluepynt import Bluepynt
+from optimizer import argument_sources, pure_post_order
+from output_cache import OutputCache
+from pins import ArgumentPin, ExecutionFrame, InputArgumentPin, Node
+from type_inference import infer_types
+
+
+class GraphSession:
+    """
+    Graph kept loaded for one client of the editor, which sends the edits it makes instead of the whole graph on
+    every run. Edits change the loaded graph in place, an edit only costs the nodes and connections it touches.
+
+    The session remembers the outputs of the pure nodes that only depend on literal values - FOLDABLE nodes and
+    nodes with CACHE_OUTPUTS, without any input from a variable or an impure node - from the last run. An edit
+    drops them for the edited node and every node downstream of it, the next run evaluates only those again and
+    reuses the rest. The execution flow itself runs from the Begin node every time, as the values of the
+    variables depend on all of it. Every other node with CACHE_OUTPUTS, impure ones included, is reused through
+    the output cache whenever its input values did not change - sessions without a shared cache keep their own in
+    memory. Other impure nodes run again on every run.
+
+    Sessions are not optimized, the optimizer would remove or merge the nodes the editor refers to.
+    """
+    def __init__(self, data: dict, output_cache=None):
+        self.graph = Bluepynt.load_graph_from_structure(data)[0]
+        self.output_cache = output_cache if output_cache is not None else OutputCache(directory=None)
+        self.lock = threading.Lock()
+        # Every connection of the graph, indexed by both of its nodes
+        self.connections: dict[str, set[tuple[str, str, str, str]]] = {node.unique_id: set()
+                                                                       for node in self.graph.nodes}
+        for connection in data["graphs"][0]["connections"]:
+            self._index_connection(GraphSession.connection_key(connection))
+        # unique id -> output values of reusable pure nodes from the last run
+        self.outputs: dict[str, list] = {}
+        self.dirty: set[str] = set()
+        self.reindex = False
+        self.retype = False
+
+        self.runs = 0
+        self.reused = 0
+
+    @staticmethod
+    def connection_key(connection: dict) -> tuple[str, str, str, str]:
+        return connection["fromNode"], connection["fromPin"], connection["toNode"], connection["toPin"]
+
+    # region Edits
+
+    def apply(self, edits: list[dict]):
+        """
+        Applies edits of the editor, in order:
+        {"type": "addNode", "node": {"nodeId", "uniqueId", "arguments"}}, {"type": "removeNode", "uniqueId"},
+        {"type": "setArgument", "uniqueId", "pinId", "value"}, {"type": "connect" / "disconnect", "fromNode",
+        "fromPin", "toNode", "toPin"} and {"type": "setVariable", "variable": {"name", "type", "value"}}.
+        Edits are not rolled back when one fails, the editor should start a new session then.
+        """
+        with self.lock:
+            for edit in edits:
+                edit_type = edit["type"]
+                if edit_type == "addNode":
+                    self.add_node(edit["node"])
+                elif edit_type == "removeNode":
+                    self.remove_node(edit["uniqueId"])
+                elif edit_type == "setArgument":
+                    self.set_argument(edit["uniqueId"], edit["pinId"], edit["value"])
+                elif edit_type == "connect":
+                    self.connect(edit)
+                elif edit_type == "disconnect":
+                    self.disconnect(edit)
+                elif edit_type == "setVariable":
+                    self.set_variable(edit["variable"])
+                else:
+                    raise ValueError(f"Unknown edit {edit_type}")
+
+    def add_node(self, data_node: dict):
+        if data_node["uniqueId"] in self.graph.nodes_by_id:
+            raise ValueError(f"Node {data_node['uniqueId']} already exists")
+        node = Bluepynt.create_node(data_node)
+        self.graph.nodes_by_id[node.unique_id] = node
+        self.connections[node.unique_id] = set()
+        self.dirty.add(node.unique_id)
+        self.reindex = True
+
+    def remove_node(self, unique_id: str):
+        node = self.graph.node(unique_id)
+        if node is self.graph.main_node:
+            raise ValueError("The main node cannot be removed")
+        for connection in list(self.connections[unique_id]):
+            self._disconnect(connection)
+        del self.connections[unique_id]
+        del self.graph.nodes_by_id[unique_id]
+        self.outputs.pop(unique_id, None)
+        self.dirty.discard(unique_id)
+        self.reindex = True
+
+    def set_argument(self, unique_id: str, pin_id: str, value):
+        self.graph.node(unique_id).argument_pin(pin_id).set_value(value)
+        self.invalidate(unique_id)
+        self.retype = True
+
+    def connect(self, connection: dict):
+        from_pin, to_pin = Bluepynt.connection_pins(self.graph, connection)
+        from_pin.connect(to_pin)
+        self._index_connection(GraphSession.connection_key(connection))
+        self.invalidate(connection["toNode"])
+        self.reindex = True
+
+    def disconnect(self, connection: dict):
+        key = GraphSession.connection_key(connection)
+        if key not in self.connections.get(connection["toNode"], ()):
+            raise ValueError(f"Node {connection['fromNode']} is not connected to {connection['toNode']}")
+        self._disconnect(key)
+
+    def set_variable(self, data_variable: dict):
+        variable = Bluepynt.create_variable(data_variable)
+        self.graph.variables = tuple(existing for existing in self.graph.variables
+                                     if existing.name != variable.name) + (variable,)
+        self.reindex = True
+
+    def _index_connection(self, key: tuple[str, str, str, str]):
+        self.connections[key[0]].add(key)
+        self.connections[key[2]].add(key)
+
+    def _disconnect(self, key: tuple[str, str, str, str]):
+        from_node_id, from_pin_id, to_node_id, to_pin_id = key
+        to_pin = self.graph.node(to_node_id).any_input_pin(to_pin_id)
+        if isinstance(to_pin, InputArgumentPin):
+            to_pin.disconnect()
+        else:
+            self.graph.node(from_node_id).any_output_pin(from_pin_id).disconnect()
+        self.connections[from_node_id].discard(key)
+        self.connections[to_node_id].discard(key)
+        self.invalidate(to_node_id)
+        self.reindex = True
+
+    def invalidate(self, unique_id: str):
+        """
+        Marks the node and every node using its outputs dirty, their outputs are evaluated again on the next run.
+        """
+        pending = [unique_id]
+        while pending:
+            node_id = pending.pop()
+            if node_id in self.dirty:
+                continue
+            self.dirty.add(node_id)
+            self.outputs.pop(node_id, None)
+            pending.extend(to_node_id for from_node_id, _, to_node_id, to_pin_id in self.connections[node_id]
+                           if from_node_id == node_id
+                           and isinstance(self.graph.node(to_node_id).any_input_pin(to_pin_id), ArgumentPin))
+
+    # endregion
+
+    def execute(self, progress_callback: Callable[[str, dict], None] | None = None) -> ExecutionFrame:
+        with self.lock:
+            graph = self.graph
+            if self.reindex:
+                graph.nodes = tuple(graph.nodes_by_id.values())
+                graph.reindex()
+            if self.reindex or self.retype:
+                for node in graph.nodes:
+                    for pin in node.in_pins + node.out_pins:
+                        if isinstance(pin, ArgumentPin):
+                            pin.inferred_type = None
+                infer_types(graph)
+            # Only once the graph checked out, a failed check is repeated on the next run
+            self.reindex = self.retype = False
+
+            reusable = self.reusable_nodes()
+            frame = ExecutionFrame(graph, progress_callback, None, self.output_cache)
+            for node in reusable:
+                outputs = self.outputs.get(node.unique_id)
+                if outputs is not None:
+                    frame.reuse_outputs(node, outputs)
+                    self.reused += 1
+            graph.compile().execute_frame(frame)
+
+            for node in reusable:
+                if frame.evaluated_epochs[node.slot] >= 0:
+                    self.outputs[node.unique_id] = frame.output_values(node)
+            self.dirty.clear()
+            self.runs += 1
+            return frame
+
+    def reusable_nodes(self) -> list[Node]:
+        """
+        Pure nodes whose outputs only depend on literal values, so they do not change while the graph runs.
+        """
+        reusable: set[Node] = set()
+        for node in pure_post_order(self.graph, lambda n: n.is_pure and (n.FOLDABLE or n.CACHE_OUTPUTS)):
+            if all(source in reusable for source in argument_sources(node)):
+                reusable.add(node)
+        return list(reusable)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "nodes": len(self.graph.nodes_by_id),
+                "dirty": len(self.dirty),
+                "cachedNodes": len(self.outputs),
+                "runs": self.runs,
+                "reused": self.reused,
+            }
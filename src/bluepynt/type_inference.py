@@ -0,0 +1,57 @@
+from collections import deque
+from types import UnionType
+from typing import Any
+
+from optimizer import argument_consumers
+from pins import Graph, Node, ArgumentPin, InputArgumentPin, check_connection
+
+
+def infer_types(graph: Graph) -> int:
+    """
+    Resolves concrete types of Any pins from the declared types of the pins around them - through connections,
+    type_depends_on and the nodes' own rules (Node.infer_types) - and stores them as the pins' inferred types.
+    Raises ValueError for connections between pins of incompatible types. Returns the number of resolved pins.
+    """
+    consumers = argument_consumers(graph)
+    for node in graph.nodes:
+        for pin in (*node.in_pins, *node.out_pins):
+            if isinstance(pin, ArgumentPin):
+                pin.inferred_type = None
+
+    resolved = 0
+    queue = deque(graph.nodes)
+    queued = set(graph.nodes)
+    while queue:
+        node = queue.popleft()
+        queued.discard(node)
+
+        # Node rules first, they are constraints (a Write Variable value has the type of the variable) while
+        # types taken over from the sources are only a guess the final check verifies
+        changed = [pin for pin, pin_type in node.infer_types().items() if _resolve(pin, pin_type)]
+        inherited = [pin for pin in node.in_pins
+                     if isinstance(pin, InputArgumentPin) and pin.source_pin is not None
+                     and _resolve(pin, pin.source_pin.resolved_type)]
+        resolved += len(changed) + len(inherited)
+
+        # The node rules have to run again with the new input types, new output types flow to the consumers
+        affected = [node] if inherited else []
+        for pin in changed:
+            if pin.is_output:
+                affected += [consumer.parent_node for consumer in consumers.get(pin, ())]
+        for affected_node in affected:
+            if affected_node not in queued:
+                queued.add(affected_node)
+                queue.append(affected_node)
+
+    for node in graph.nodes:
+        for pin in node.in_pins:
+            if isinstance(pin, InputArgumentPin) and pin.source_pin is not None:
+                check_connection(pin)
+    return resolved
+
+
+def _resolve(pin: ArgumentPin, pin_type: type | UnionType) -> bool:
+    if pin.type is not Any or pin.inferred_type is not None or pin_type is Any:
+        return False
+    pin.inferred_type = pin_type
+    return True
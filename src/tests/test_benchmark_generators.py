@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks import generators
+from bluepynt import Bluepynt, mapping
+
+
+class TestBenchmarkGenerators(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(patch.object(mapping, "NODE_MAP", dict(mapping.NODE_MAP)))
+        generators.register_builtin_nodes()
+
+    def execute(self, data: dict):
+        return Bluepynt.load_graph_from_structure(data)[0].execute()
+
+    def test_exec_chain(self):
+        self.assertEqual(99, self.execute(generators.exec_chain(100)).variable("value"))
+
+    def test_pure_dag(self):
+        layer = [0, 1, 2]
+        for _ in range(4):
+            layer = [layer[i] + layer[(i + 1) % 3] for i in range(3)]
+        self.assertEqual(layer[-1], self.execute(generators.pure_dag(3, 4)).variable("value"))
+
+    def test_nested_loops(self):
+        self.assertEqual(2 * 3 * 3, self.execute(generators.nested_loops(2, 3, 2)).variable("sum"))
+        self.assertEqual(2 * 3 * 3, self.execute(generators.nested_loops(2, 3, 2, for_each=True)).variable("sum"))
+
+    def test_variable_heavy(self):
+        frame = self.execute(generators.variable_heavy(4, 10))
+        self.assertEqual([3, 3, 2, 2], [frame.variable(f"var.{i}") for i in range(4)])
@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from bluepynt import mapping
+from bluepynt.builtin import macros, pure_nodes
+from bluepynt.catalog import NodeCatalog, accepts_encoding
+
+
+class TestNodeCatalog(unittest.TestCase):
+    def setUp(self):
+        self.node_map = {**macros.NODE_MAP, **pure_nodes.NODE_MAP}
+        self.catalog = NodeCatalog(self.node_map)
+
+    def test_payload(self):
+        payload = self.catalog.payload()
+        nodes = json.loads(payload.body)
+        self.assertEqual(list(self.node_map), [node["nodeId"] for node in nodes])
+        self.assertEqual(macros.ForLoopNode.catalog_json(), nodes[2])
+        self.assertEqual(payload.body, gzip.decompress(payload.compressed))
+        self.assertIs(payload, self.catalog.cached_payload())
+
+    def test_conditional_headers(self):
+        payload = self.catalog.payload()
+        other_etag = payload.etag[:-2] + '0"'
+        self.assertTrue(payload.matches(payload.etag))
+        self.assertTrue(payload.matches(f'{other_etag}, W/{payload.etag}'))
+        self.assertTrue(payload.matches("*"))
+        self.assertFalse(payload.matches(f'{other_etag}, "{payload.etag}"'))
+        self.assertFalse(payload.matches(""))
+
+        self.assertTrue(accepts_encoding("deflate, gzip;q=0.5", "gzip"))
+        self.assertTrue(accepts_encoding("br, *", "gzip"))
+        self.assertFalse(accepts_encoding("gzip;q=0", "gzip"))
+        self.assertFalse(accepts_encoding("gzip; q=0.0, *", "gzip"))
+        self.assertFalse(accepts_encoding("x-gzip, *;q=0", "gzip"))
+        self.assertFalse(accepts_encoding("", "gzip"))
+
+    def test_category_filter(self):
+        class CategorizedNode(pure_nodes.AddNode):
+            ID = "test.CategorizedNode"
+            CATEGORY = "Math|Comparison"
+
+        self.node_map[CategorizedNode.ID] = CategorizedNode
+        for category in ("Math", "Math|Comparison"):
+            self.assertEqual([CategorizedNode.ID],
+                             [node["nodeId"] for node in json.loads(self.catalog.payload(category).body)])
+        self.assertEqual(b"[]", self.catalog.payload("Mat").body)
+        self.assertNotEqual(self.catalog.payload("Math").etag, self.catalog.payload().etag)
+
+    def test_registry_changes(self):
+        payload = self.catalog.payload()
+        builds = self.catalog.entry_builds
+
+        self.node_map["bluepynt.builtin.ForLoopNode"] = type("ForLoopNode", (macros.ForLoopNode,), {})
+        self.assertIsNone(self.catalog.cached_payload())
+        changed = self.catalog.payload()
+        self.assertEqual(builds + 1, self.catalog.entry_builds)
+        self.assertEqual(payload.body, changed.body)
+        self.assertEqual(payload.etag, changed.etag)
+
+        del self.node_map["bluepynt.builtin.BranchNode"]
+        self.assertNotEqual(payload.etag, self.catalog.payload().etag)
+        self.assertEqual(builds + 1, self.catalog.entry_builds)
+
+    def test_module_reload_invalidates_its_nodes(self):
+        self.enterContext(patch.object(mapping, "NODE_MAP", dict(mapping.NODE_MAP)))
+        self.enterContext(patch.object(mapping, "ON_NODES_LOADED", []))
+        self.enterContext(patch.object(mapping, "LOADED_MODULES", []))
+        self.enterContext(patch.object(mapping, "MODULE_NODE_IDS", {}))
+        catalog = NodeCatalog()
+        mapping.ON_NODES_LOADED.append(catalog.invalidate)
+
+        module_path = os.path.join(os.path.dirname(pure_nodes.__file__), "macros.py")
+        mapping.load_nodes_from_module(module_path)
+        catalog.payload()
+        builds = catalog.entry_builds
+
+        mapping.load_nodes_from_module(module_path)
+        self.assertIsNone(catalog.cached_payload())
+        catalog.payload()
+        self.assertEqual(builds + len(macros.NODE_MAP), catalog.entry_builds)
+        self.assertEqual([module_path], mapping.LOADED_MODULES)
+
+
+if __name__ == '__main__':
+    unittest.main()
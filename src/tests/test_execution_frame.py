@@ -0,0 +1,45 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from builtin.macros import ForLoopNode
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, ReadVariableNode, WriteVariableNode
+from pins import Graph, GraphVariable
+
+
+def build_sum_graph(end: int) -> Graph:
+    begin_node = BeginNode()
+    for_loop_node = ForLoopNode()
+    for_loop_node.argument_pin("start").set_value(0)
+    for_loop_node.argument_pin("end").set_value(end)
+    for_loop_node.argument_pin("step").set_value(1)
+    read_node = ReadVariableNode()
+    read_node.argument_pin("variable").set_value("sum")
+    add_node = AddNode()
+    write_node = WriteVariableNode()
+    write_node.argument_pin("variable").set_value("sum")
+
+    begin_node.output_flow_pin("exec_out").connect(for_loop_node.input_flow_pin("exec_in"))
+    for_loop_node.output_flow_pin("exec_body").connect(write_node.input_flow_pin("exec_in"))
+    read_node.output_pin("value").connect(add_node.argument_pin("a"))
+    for_loop_node.output_pin("i").connect(add_node.argument_pin("b"))
+    add_node.output_pin("result").connect(write_node.argument_pin("value"))
+
+    return Graph(begin_node, (begin_node, for_loop_node, read_node, add_node, write_node),
+                 (GraphVariable("sum", int, 0),))
+
+
+class TestExecutionFrame(unittest.TestCase):
+    def test_definition_is_not_modified(self):
+        graph = build_sum_graph(10)
+        self.assertEqual(55, graph.execute().variable("sum"))
+        self.assertEqual(55, graph.execute().variable("sum"))
+        self.assertEqual(0, graph.variable("sum").value)
+        self.assertIsNone(graph.nodes[1].output_pin("i").value)
+
+    def test_concurrent_executions(self):
+        graph = build_sum_graph(2000)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            frames = list(executor.map(lambda _: graph.execute(), range(16)))
+
+        self.assertEqual([2001000] * 16, [frame.variable("sum") for frame in frames])
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+
+from builtin.macros import BranchNode
+from builtin.nodes import BeginNode, ConsoleLogNode
+from pins import Graph
+
+
+class TestExecutionPlan(unittest.TestCase):
+    def test_function_chain(self):
+        begin_node = BeginNode()
+        log_nodes = [ConsoleLogNode() for _ in range(3)]
+        for i, node in enumerate(log_nodes):
+            node.argument_pin("message").set_value(str(i))
+
+        begin_node.output_flow_pin("exec_out").connect(log_nodes[0].input_flow_pin("exec_in"))
+        log_nodes[0].output_flow_pin("exec_out").connect(log_nodes[1].input_flow_pin("exec_in"))
+        log_nodes[1].output_flow_pin("exec_out").connect(log_nodes[2].input_flow_pin("exec_in"))
+
+        graph = Graph(begin_node, (begin_node, *log_nodes))
+        plan = graph.compile()
+        self.assertEqual(4, len(plan.instructions))
+        self.assertIs(plan, graph.compile())
+
+        with patch("builtins.print") as mock:
+            graph.execute()
+            graph.execute()
+            self.assertEqual(["0", "1", "2", "0", "1", "2"], [call.args[0] for call in mock.call_args_list])
+
+    def test_macro_dispatch(self):
+        begin_node = BeginNode()
+        branch_node = BranchNode()
+        true_node = ConsoleLogNode()
+        true_node.argument_pin("message").set_value("true")
+        false_node = ConsoleLogNode()
+        false_node.argument_pin("message").set_value("false")
+
+        begin_node.output_flow_pin("exec_out").connect(branch_node.input_flow_pin("exec_in"))
+        branch_node.output_flow_pin("exec_true").connect(true_node.input_flow_pin("exec_in"))
+        branch_node.output_flow_pin("exec_false").connect(false_node.input_flow_pin("exec_in"))
+
+        graph = Graph(begin_node, (begin_node, branch_node, true_node, false_node))
+
+        with patch("builtins.print") as mock:
+            branch_node.argument_pin("condition").set_value(True)
+            graph.execute()
+            branch_node.argument_pin("condition").set_value(False)
+            graph.execute()
+            self.assertEqual(["true", "false"], [call.args[0] for call in mock.call_args_list])
+
+    def test_rewired_flow(self):
+        begin_node = BeginNode()
+        old_node = ConsoleLogNode()
+        old_node.argument_pin("message").set_value("old")
+        new_node = ConsoleLogNode()
+        new_node.argument_pin("message").set_value("new")
+
+        begin_node.output_flow_pin("exec_out").connect(old_node.input_flow_pin("exec_in"))
+        graph = Graph(begin_node, (begin_node, old_node, new_node))
+
+        with patch("builtins.print") as mock:
+            graph.execute()
+            begin_node.output_flow_pin("exec_out").connect(new_node.input_flow_pin("exec_in"))
+            graph.execute()
+            begin_node.output_flow_pin("exec_out").disconnect()
+            graph.execute()
+            self.assertEqual(["old", "new"], [call.args[0] for call in mock.call_args_list])
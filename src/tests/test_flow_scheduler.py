@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from builtin.macros import BranchNode, ExecRerouteNode, ForLoopNode
+from builtin.nodes import BeginNode, ConsoleLogNode
+from builtin.pure_nodes import GreaterEqualNode, IntToStringNode
+from pins import Graph
+
+
+class TestFlowScheduler(unittest.TestCase):
+    def test_long_chain_has_constant_stack_depth(self):
+        begin_node = BeginNode()
+        nodes = [begin_node]
+        previous_pin = begin_node.output_flow_pin("exec_out")
+        for i in range(20000):
+            node = BranchNode() if i % 2 else ExecRerouteNode()
+            previous_pin.connect(node.input_flow_pin("exec_in"))
+            previous_pin = node.output_flow_pin("exec_false" if i % 2 else "exec_out")
+            nodes.append(node)
+
+        log_node = ConsoleLogNode()
+        log_node.argument_pin("message").set_value("end")
+        previous_pin.connect(log_node.input_flow_pin("exec_in"))
+        nodes.append(log_node)
+
+        graph = Graph(begin_node, tuple(nodes))
+        with patch("builtins.print") as mock:
+            graph.execute()
+            mock.assert_called_once_with("end")
+
+    def test_loop_break_and_completion(self):
+        begin_node = BeginNode()
+        for_loop_node = ForLoopNode()
+        for_loop_node.argument_pin("start").set_value(0)
+        for_loop_node.argument_pin("end").set_value(10)
+        for_loop_node.argument_pin("step").set_value(1)
+        greater_node = GreaterEqualNode()
+        greater_node.argument_pin("b").set_value(3)
+        branch_node = BranchNode()
+        to_string_node = IntToStringNode()
+        body_log_node = ConsoleLogNode()
+        completed_log_node = ConsoleLogNode()
+        completed_log_node.argument_pin("message").set_value("completed")
+
+        begin_node.output_flow_pin("exec_out").connect(for_loop_node.input_flow_pin("exec_in"))
+        for_loop_node.output_flow_pin("exec_body").connect(branch_node.input_flow_pin("exec_in"))
+        for_loop_node.output_pin("i").connect(greater_node.argument_pin("a"))
+        greater_node.output_pin("result").connect(branch_node.argument_pin("condition"))
+        branch_node.output_flow_pin("exec_true").connect(for_loop_node.input_flow_pin("exec_break"))
+        branch_node.output_flow_pin("exec_false").connect(body_log_node.input_flow_pin("exec_in"))
+        for_loop_node.output_pin("i").connect(to_string_node.argument_pin("value"))
+        to_string_node.output_pin("result").connect(body_log_node.argument_pin("message"))
+        for_loop_node.output_flow_pin("exec_out").connect(completed_log_node.input_flow_pin("exec_in"))
+
+        graph = Graph(begin_node, (begin_node, for_loop_node, greater_node, branch_node, to_string_node,
+                                   body_log_node, completed_log_node))
+        with patch("builtins.print") as mock:
+            graph.execute()
+            self.assertEqual(["0", "1", "2", "completed"], [call.args[0] for call in mock.call_args_list])
+
+    def test_nested_loops(self):
+        begin_node = BeginNode()
+        outer_loop_node = ForLoopNode()
+        inner_loop_node = ForLoopNode()
+        for loop_node in (outer_loop_node, inner_loop_node):
+            loop_node.argument_pin("start").set_value(0)
+            loop_node.argument_pin("end").set_value(1)
+            loop_node.argument_pin("step").set_value(1)
+        body_log_node = ConsoleLogNode()
+        body_log_node.argument_pin("message").set_value("body")
+        inner_completed_node = ConsoleLogNode()
+        inner_completed_node.argument_pin("message").set_value("inner completed")
+
+        begin_node.output_flow_pin("exec_out").connect(outer_loop_node.input_flow_pin("exec_in"))
+        outer_loop_node.output_flow_pin("exec_body").connect(inner_loop_node.input_flow_pin("exec_in"))
+        inner_loop_node.output_flow_pin("exec_body").connect(body_log_node.input_flow_pin("exec_in"))
+        inner_loop_node.output_flow_pin("exec_out").connect(inner_completed_node.input_flow_pin("exec_in"))
+
+        graph = Graph(begin_node, (begin_node, outer_loop_node, inner_loop_node, body_log_node,
+                                   inner_completed_node))
+        with patch("builtins.print") as mock:
+            graph.execute()
+            self.assertEqual(["body", "body", "inner completed"] * 2, [call.args[0] for call in mock.call_args_list])
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+from bluepynt import GraphCache, mapping
+from bluepynt.builtin import nodes, pure_nodes
+
+
+def build_structure(message: str, x: int = 0) -> dict:
+    return {
+        "graphs": [
+            {
+                "nodes": [
+                    {"nodeId": "bluepynt.builtin.BeginNode", "uniqueId": "0", "x": x},
+                    {"nodeId": "bluepynt.builtin.WriteVariableNode", "uniqueId": "1",
+                     "arguments": {"variable": "message", "value": message}},
+                ],
+                "connections": [
+                    {"fromNode": "0", "fromPin": "exec_out", "toNode": "1", "toPin": "exec_in"},
+                ],
+                "variables": [
+                    {"name": "message", "type": "str", "value": ""},
+                ],
+            }
+        ]
+    }
+
+
+@patch.dict(mapping.NODE_MAP, {**nodes.NODE_MAP, **pure_nodes.NODE_MAP})
+class TestGraphCache(unittest.TestCase):
+    def test_hit_ignores_editor_fields(self):
+        cache = GraphCache()
+        graphs = cache.load(build_structure("a"))
+        self.assertIs(graphs, cache.load(build_structure("a", x=100)))
+        self.assertIsNot(graphs, cache.load(build_structure("b")))
+        self.assertEqual({"hits": 1, "misses": 2}, {key: cache.stats()[key] for key in ("hits", "misses")})
+
+        self.assertEqual("a", graphs[0].execute().variable("message"))
+        self.assertEqual("a", graphs[0].execute().variable("message"))
+
+    def test_connection_order_is_kept(self):
+        def build_rewired(order: list[str]) -> dict:
+            data = build_structure("")
+            data["graphs"][0]["variables"] = [{"name": "message", "type": "int", "value": 0}]
+            data["graphs"][0]["nodes"][1]["arguments"] = {"variable": "message"}
+            for unique_id in ("2", "3"):
+                data["graphs"][0]["nodes"].append({"nodeId": pure_nodes.AddNode.ID, "uniqueId": unique_id,
+                                                   "arguments": {"a": int(unique_id), "b": 0}})
+            for unique_id in order:
+                data["graphs"][0]["connections"].append({"fromNode": unique_id, "fromPin": "result", "toNode": "1",
+                                                         "toPin": "value"})
+            return data
+
+        # The last connection to an input wins, the same connections in another order are another graph
+        cache = GraphCache()
+        self.assertEqual(3, cache.load(build_rewired(["2", "3"]))[0].execute().variable("message"))
+        self.assertEqual(2, cache.load(build_rewired(["3", "2"]))[0].execute().variable("message"))
+
+    def test_size_based_eviction(self):
+        cache = GraphCache(max_nodes=4)
+        first = cache.load(build_structure("a"))
+        cache.load(build_structure("b"))
+        cache.load(build_structure("a"))
+        cache.load(build_structure("c"))
+
+        self.assertEqual(1, cache.stats()["evictions"])
+        self.assertEqual(4, cache.stats()["size"])
+        self.assertIs(first, cache.load(build_structure("a")))
+
+    def test_invalidation(self):
+        cache = GraphCache()
+        with_add_node = build_structure("a")
+        # Unused, the optimizer removes it from the graph
+        with_add_node["graphs"][0]["nodes"].append({"nodeId": pure_nodes.AddNode.ID, "uniqueId": "2"})
+        graphs = cache.load(with_add_node)
+        other_graphs = cache.load(build_structure("b"))
+
+        cache.invalidate([pure_nodes.AddNode.ID])
+        self.assertIsNot(graphs, cache.load(with_add_node))
+        self.assertIs(other_graphs, cache.load(build_structure("b")))
+        self.assertEqual("a", graphs[0].execute().variable("message"))
+
+        cache.invalidate([pure_nodes.WriteVariableNode.ID])
+        self.assertEqual({"entries": 0, "size": 0, "invalidations": 3},
+                         {key: cache.stats()[key] for key in ("entries", "size", "invalidations")})
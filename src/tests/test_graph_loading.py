@@ -0,0 +1,22 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.graph_loading import generate_structure
+from bluepynt import Bluepynt, mapping
+from bluepynt.builtin import nodes, pure_nodes
+
+
+@patch.dict(mapping.NODE_MAP, {**nodes.NODE_MAP, **pure_nodes.NODE_MAP})
+class TestGraphLoading(unittest.TestCase):
+    def test_lookups(self):
+        graph = Bluepynt.load_graph_from_structure(generate_structure(101))[0]
+        self.assertEqual(101, len(graph.nodes))
+        self.assertIs(graph.nodes[-1], graph.node("24.write"))
+        self.assertIs(graph.node("24.add").output_pin("result"),
+                      graph.node("24.write").argument_pin("value").source_pin)
+        self.assertEqual(25, graph.execute().variable("result"))
+
+        with self.assertRaises(Exception):
+            graph.node("missing")
+        with self.assertRaises(Exception):
+            graph.node("24.write").output_flow_pin("value")
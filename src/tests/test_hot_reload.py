@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bluepynt import GraphCache, mapping
+from bluepynt.builtin import nodes, pure_nodes
+from bluepynt.hot_reload import ModuleWatcher
+
+MODULE_SOURCE = '''
+from pins import BaseFunctionNode, OutputArgumentPin
+
+
+class AnswerNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.AnswerNode"
+    IS_PURE = True
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="value", name="Value", argument_type=int),
+    )
+
+    def execute(self):
+        self.output_pin("value").set_value({answer})
+
+
+NODE_MAP = {{
+    "test.AnswerNode": AnswerNode,
+}}
+'''
+
+STRUCTURE = {
+    "graphs": [
+        {
+            "nodes": [
+                {"nodeId": nodes.BeginNode.ID, "uniqueId": "begin"},
+                {"nodeId": "test.AnswerNode", "uniqueId": "answer"},
+                {"nodeId": pure_nodes.WriteVariableNode.ID, "uniqueId": "write", "arguments": {"variable": "x"}},
+            ],
+            "connections": [
+                {"fromNode": "begin", "fromPin": "exec_out", "toNode": "write", "toPin": "exec_in"},
+                {"fromNode": "answer", "fromPin": "value", "toNode": "write", "toPin": "value"},
+            ],
+            "variables": [
+                {"name": "x", "type": "int", "value": 0},
+            ],
+        }
+    ]
+}
+
+
+class TestModuleWatcher(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(patch.object(mapping, "NODE_MAP", {**nodes.NODE_MAP, **pure_nodes.NODE_MAP}))
+        self.enterContext(patch.object(mapping, "ON_NODES_LOADED", []))
+        self.enterContext(patch.object(mapping, "LOADED_MODULES", []))
+        self.enterContext(patch.object(mapping, "MODULE_NODE_IDS", {}))
+        self.module_path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "answer_nodes.py")
+        self.write_module(1)
+        mapping.load_nodes_from_module(self.module_path)
+
+    def write_module(self, answer: int, mtime: float = 1_000_000):
+        with open(self.module_path, "w") as f:
+            f.write(MODULE_SOURCE.format(answer=answer))
+        os.utime(self.module_path, (mtime, mtime))
+
+    def test_reloads_changed_modules(self):
+        watcher = ModuleWatcher()
+        self.assertEqual([], watcher.check())
+        self.assertEqual([], watcher.check())
+
+        node_map = mapping.NODE_MAP
+        self.write_module(2, 2_000_000)
+        self.assertEqual([self.module_path], watcher.check())
+        self.assertIsNot(node_map, mapping.NODE_MAP)
+        self.assertIsNot(node_map["test.AnswerNode"], mapping.NODE_MAP["test.AnswerNode"])
+        self.assertIs(node_map[nodes.BeginNode.ID], mapping.NODE_MAP[nodes.BeginNode.ID])
+
+    def test_invalidates_graphs_with_changed_nodes(self):
+        cache = GraphCache()
+        mapping.ON_NODES_LOADED.append(cache.invalidate)
+        watcher = ModuleWatcher()
+        watcher.check()
+
+        graphs = cache.load(STRUCTURE)
+        self.assertEqual(1, graphs[0].execute().variable("x"))
+
+        self.write_module(2, 2_000_000)
+        watcher.check()
+        self.assertEqual(2, cache.load(STRUCTURE)[0].execute().variable("x"))
+        # Graphs loaded before keep the node types they were built with
+        self.assertEqual(1, graphs[0].execute().variable("x"))
+
+    def test_reloads_package_submodules(self):
+        package_path = os.path.join(os.path.dirname(self.module_path), "answer_package")
+        os.mkdir(package_path)
+        with open(os.path.join(package_path, "__init__.py"), "w") as f:
+            f.write("from .nodes import NODE_MAP\n")
+        self.module_path = os.path.join(package_path, "nodes.py")
+        self.addCleanup(sys.modules.pop, "answer_package.nodes", None)
+        self.addCleanup(sys.modules.pop, "answer_package", None)
+        self.write_module(3)
+        mapping.load_nodes_from_module(package_path)
+        watcher = ModuleWatcher()
+        watcher.check()
+        self.assertEqual(3, GraphCache().load(STRUCTURE)[0].execute().variable("x"))
+
+        self.write_module(4, 2_000_000)
+        self.assertEqual([package_path], watcher.check())
+        self.assertEqual(4, GraphCache().load(STRUCTURE)[0].execute().variable("x"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch
 
 from builtin.macros import BranchNode, ForLoopNode
+from pins import OutputFlowPin
 
 
 class TestMacros(unittest.TestCase):
@@ -10,15 +11,15 @@ class TestMacros(unittest.TestCase):
         branch_node = BranchNode()
         branch_node.argument_pin("condition").set_value(True)
 
-        with patch.object(branch_node.output_flow_pin("exec_true"), "execute") as mock:
+        with patch.object(OutputFlowPin, "execute", autospec=True) as mock:
             branch_node.execute()
-            mock.assert_called_once()
+            mock.assert_called_once_with(branch_node.output_flow_pin("exec_true"))
 
         branch_node.argument_pin("condition").set_value(False)
 
-        with patch.object(branch_node.output_flow_pin("exec_false"), "execute") as mock:
+        with patch.object(OutputFlowPin, "execute", autospec=True) as mock:
             branch_node.execute()
-            mock.assert_called_once()
+            mock.assert_called_once_with(branch_node.output_flow_pin("exec_false"))
 
     def test_for_loop(self):
         for_loop_node = ForLoopNode()
@@ -26,6 +27,7 @@ class TestMacros(unittest.TestCase):
         for_loop_node.argument_pin("end").set_value(10)
         for_loop_node.argument_pin("step").set_value(1)
 
-        with patch.object(for_loop_node.output_flow_pin("exec_body"), "execute") as mock:
+        body_pin = for_loop_node.output_flow_pin("exec_body")
+        with patch.object(OutputFlowPin, "execute", autospec=True) as mock:
             for_loop_node.execute()
-            self.assertEqual(mock.call_count, 10)
+            self.assertEqual(len([call for call in mock.call_args_list if call.args[0] is body_pin]), 10)
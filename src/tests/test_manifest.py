@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.generators import StructureBuilder
+from bluepynt import Bluepynt, PluginBase, mapping
+from bluepynt.builtin import nodes, pure_nodes
+from bluepynt.catalog import NodeCatalog
+from bluepynt.manifest import LazyNodeType, load_nodes_from_plugins
+
+
+class ExamplePlugin(PluginBase):
+    loads = 0
+
+    def initialize(self):
+        ExamplePlugin.loads += 1
+
+    def load_nodes(self):
+        return [pure_nodes.AddNode, pure_nodes.IntToStringNode]
+
+
+def plugin_entry_point(version: str = "1.0.0"):
+    return SimpleNamespace(name="test_plugin", dist=SimpleNamespace(name="test-plugin", version=version),
+                           load=lambda: ExamplePlugin)
+
+
+class TestNodeManifest(unittest.TestCase):
+    def setUp(self):
+        self.manifest_path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "manifest.json")
+        self.enterContext(patch.object(mapping, "NODE_MAP", dict(nodes.NODE_MAP)))
+        self.enterContext(patch.object(mapping, "LOADED_MANIFESTS", []))
+        ExamplePlugin.loads = 0
+
+    def test_records_plugins(self):
+        self.assertEqual(2, load_nodes_from_plugins(self.manifest_path, [plugin_entry_point()]))
+        self.assertEqual(1, ExamplePlugin.loads)
+        self.assertIs(pure_nodes.AddNode, mapping.NODE_MAP[pure_nodes.AddNode.ID])
+        self.assertTrue(os.path.isfile(self.manifest_path))
+        self.assertEqual([self.manifest_path], mapping.LOADED_MANIFESTS)
+
+    def test_lazy_registry(self):
+        load_nodes_from_plugins(self.manifest_path, [plugin_entry_point()])
+        eager_payload = NodeCatalog(dict(mapping.NODE_MAP)).payload()
+
+        mapping.NODE_MAP = dict(nodes.NODE_MAP)
+        load_nodes_from_plugins(self.manifest_path, [plugin_entry_point()])
+        self.assertEqual(1, ExamplePlugin.loads)
+        self.assertIsInstance(mapping.NODE_MAP[pure_nodes.AddNode.ID], LazyNodeType)
+        self.assertEqual(eager_payload.body, NodeCatalog(dict(mapping.NODE_MAP)).payload().body)
+
+        builder = StructureBuilder()
+        builder.node("AddNode", "add", a=1, b=2)
+        graph = Bluepynt.load_graph_from_structure(builder.build())[0]
+        self.assertIsInstance(graph.node("add"), pure_nodes.AddNode)
+        self.assertEqual(2, ExamplePlugin.loads)
+        self.assertIs(pure_nodes.AddNode, mapping.NODE_MAP[pure_nodes.AddNode.ID])
+        self.assertIs(pure_nodes.IntToStringNode, mapping.NODE_MAP[pure_nodes.IntToStringNode.ID])
+
+    def test_new_version_is_recorded(self):
+        load_nodes_from_plugins(self.manifest_path, [plugin_entry_point()])
+        load_nodes_from_plugins(self.manifest_path, [plugin_entry_point("1.1.0")])
+        self.assertEqual(2, ExamplePlugin.loads)
+        self.assertIs(pure_nodes.AddNode, mapping.NODE_MAP[pure_nodes.AddNode.ID])
+
+
+if __name__ == '__main__':
+    unittest.main()
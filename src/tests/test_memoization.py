@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.pure_memoization import build_diamond_graph
+from builtin.macros import ForLoopNode
+from builtin.nodes import BeginNode, ConsoleLogNode
+from builtin.pure_nodes import AddNode, IntToStringNode, ReadVariableNode, WriteVariableNode
+from pins import Graph, GraphVariable
+
+
+class TestMemoization(unittest.TestCase):
+    def test_diamond_is_evaluated_once(self):
+        graph = build_diamond_graph(10)
+
+        with patch.object(AddNode, "execute", autospec=True, side_effect=AddNode.execute) as mock:
+            frame = graph.execute()
+            self.assertEqual(10, mock.call_count)
+            self.assertEqual(1024, frame.variable("result"))
+
+            graph.memoize_pure_nodes = False
+            graph.execute()
+            self.assertEqual(10 + 2 ** 10 - 1, mock.call_count)
+
+    def test_loop_index_invalidates(self):
+        begin_node = BeginNode()
+        for_loop_node = ForLoopNode()
+        for_loop_node.argument_pin("start").set_value(0)
+        for_loop_node.argument_pin("end").set_value(2)
+        for_loop_node.argument_pin("step").set_value(1)
+        to_string_node = IntToStringNode()
+        log_node = ConsoleLogNode()
+
+        begin_node.output_flow_pin("exec_out").connect(for_loop_node.input_flow_pin("exec_in"))
+        for_loop_node.output_flow_pin("exec_body").connect(log_node.input_flow_pin("exec_in"))
+        for_loop_node.output_pin("i").connect(to_string_node.argument_pin("value"))
+        to_string_node.output_pin("result").connect(log_node.argument_pin("message"))
+
+        graph = Graph(begin_node, (begin_node, for_loop_node, to_string_node, log_node))
+        with patch("builtins.print") as mock:
+            graph.execute()
+            self.assertEqual(["0", "1", "2"], [call.args[0] for call in mock.call_args_list])
+
+    def test_only_dependencies_invalidate(self):
+        """
+        Begin -> a = b + 1 -> a = b + 1 -> b = 0 -> a = b + 1, the sum only goes stale when b is written
+        """
+        begin_node = BeginNode()
+        read_node = ReadVariableNode()
+        read_node.argument_pin("variable").set_value("b")
+        add_node = AddNode()
+        add_node.argument_pin("b").set_value(1)
+        read_node.output_pin("value").connect(add_node.argument_pin("a"))
+        write_nodes = [WriteVariableNode() for _ in range(4)]
+        for write_node, variable in zip(write_nodes, ("a", "a", "b", "a")):
+            write_node.argument_pin("variable").set_value(variable)
+            if variable == "a":
+                add_node.output_pin("result").connect(write_node.argument_pin("value"))
+        write_nodes[2].argument_pin("value").set_value(0)
+        begin_node.output_flow_pin("exec_out").connect(write_nodes[0].input_flow_pin("exec_in"))
+        for previous_node, write_node in zip(write_nodes, write_nodes[1:]):
+            previous_node.output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+
+        graph = Graph(begin_node, (begin_node, read_node, add_node, *write_nodes),
+                      (GraphVariable("a", int, 0), GraphVariable("b", int, 10)))
+        with patch.object(AddNode, "execute", autospec=True, side_effect=AddNode.execute) as mock:
+            self.assertEqual(1, graph.execute().variable("a"))
+            self.assertEqual(2, mock.call_count)
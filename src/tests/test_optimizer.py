@@ -0,0 +1,188 @@
+import unittest
+
+from builtin.macros import BranchNode, ExecRerouteNode
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, ConstantIntNode, DivideNode, MultiplyNode, ReadVariableNode, \
+    RerouteNode, WriteVariableNode
+from optimizer import Optimizer, eliminate_common_subexpressions, elide_reroutes, fold_constants, register_pass, \
+    remove_dead_nodes, PASSES
+from pins import Graph, GraphVariable
+
+
+def build_arithmetic_graph(a, b, c) -> Graph:
+    """
+    result = (a * b) + c, with a and b coming from Constant Int nodes
+    """
+    begin_node = BeginNode()
+    constant_a = ConstantIntNode()
+    constant_a.argument_pin("value").set_value(a)
+    constant_b = ConstantIntNode()
+    constant_b.argument_pin("value").set_value(b)
+    multiply_node = MultiplyNode()
+    add_node = AddNode()
+    add_node.argument_pin("b").set_value(c)
+    write_node = WriteVariableNode()
+    write_node.argument_pin("variable").set_value("result")
+
+    begin_node.output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+    constant_a.output_pin("result").connect(multiply_node.argument_pin("a"))
+    constant_b.output_pin("result").connect(multiply_node.argument_pin("b"))
+    multiply_node.output_pin("result").connect(add_node.argument_pin("a"))
+    add_node.output_pin("result").connect(write_node.argument_pin("value"))
+
+    return Graph(begin_node, (begin_node, constant_a, constant_b, multiply_node, add_node, write_node),
+                 (GraphVariable("result", int, 0),))
+
+
+class TestConstantFolding(unittest.TestCase):
+    def test_folds_constant_subgraph(self):
+        graph = build_arithmetic_graph(6, 7, 8)
+        self.assertEqual(50, graph.execute().variable("result"))
+
+        self.assertEqual(4, fold_constants(graph))
+        self.assertEqual(2, len(graph.nodes))
+        self.assertEqual(50, graph.execute().variable("result"))
+
+    def test_keeps_failing_nodes(self):
+        graph = build_arithmetic_graph(1, 2, 3)
+        divide_node = DivideNode()
+        divide_node.argument_pin("a").set_value(1)
+        divide_node.argument_pin("b").set_value(0)
+        write_node = WriteVariableNode()
+        write_node.argument_pin("variable").set_value("result")
+        graph.nodes[-1].output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+        divide_node.output_pin("result").connect(write_node.argument_pin("value"))
+        graph = Graph(graph.main_node, graph.nodes + (divide_node, write_node), graph.variables)
+
+        fold_constants(graph)
+        self.assertIn(divide_node, graph.nodes)
+        with self.assertRaises(ZeroDivisionError):
+            graph.execute()
+
+    def test_keeps_impure_sources(self):
+        graph = build_arithmetic_graph(2, 3, 4)
+        read_node = ReadVariableNode()
+        read_node.argument_pin("variable").set_value("result")
+        add_node = graph.nodes[4]
+        read_node.output_pin("value").connect(add_node.argument_pin("a"))
+        graph = Graph(graph.main_node, graph.nodes + (read_node,), graph.variables)
+
+        report = Optimizer().optimize(graph)
+        self.assertEqual(3, report["fold_constants"])
+        self.assertIn(add_node, graph.nodes)
+        self.assertEqual(4, graph.execute().variable("result"))
+
+
+class TestCommonSubexpressionElimination(unittest.TestCase):
+    def build_graph(self, second_b: int) -> Graph:
+        """
+        result = (x + 1) * (x + second_b), x is read twice and the second write reads x after the first one
+        """
+        begin_node = BeginNode()
+        nodes = [begin_node]
+        adds = []
+        for b in (1, second_b):
+            read_node = ReadVariableNode()
+            read_node.argument_pin("variable").set_value("x")
+            add_node = AddNode()
+            add_node.argument_pin("b").set_value(b)
+            read_node.output_pin("value").connect(add_node.argument_pin("a"))
+            nodes += [read_node, add_node]
+            adds.append(add_node)
+        multiply_node = MultiplyNode()
+        adds[0].output_pin("result").connect(multiply_node.argument_pin("a"))
+        adds[1].output_pin("result").connect(multiply_node.argument_pin("b"))
+
+        previous_pin = begin_node.output_flow_pin("exec_out")
+        for variable in ("result", "x", "result"):
+            write_node = WriteVariableNode()
+            write_node.argument_pin("variable").set_value(variable)
+            multiply_node.output_pin("result").connect(write_node.argument_pin("value"))
+            previous_pin.connect(write_node.input_flow_pin("exec_in"))
+            previous_pin = write_node.output_flow_pin("exec_out")
+            nodes.append(write_node)
+
+        return Graph(begin_node, tuple(nodes) + (multiply_node,),
+                     (GraphVariable("x", int, 2), GraphVariable("result", int, 0)))
+
+    def test_merges_identical_nodes(self):
+        graph = self.build_graph(1)
+        self.assertEqual(2, eliminate_common_subexpressions(graph))
+        self.assertEqual(7, len(graph.nodes))
+        # x = 3 * 3, result = 10 * 10 - the merged read still sees the write
+        self.assertEqual(100, graph.execute().variable("result"))
+
+    def test_keeps_different_literals(self):
+        graph = self.build_graph(2)
+        self.assertEqual(1, eliminate_common_subexpressions(graph))
+        self.assertEqual(182, graph.execute().variable("result"))
+
+    def test_literal_types_are_distinguished(self):
+        graph = self.build_graph(1)
+        graph.nodes[4].argument_pin("b").set_value(1.0)
+        self.assertEqual(1, eliminate_common_subexpressions(graph))
+
+
+class TestPipeline(unittest.TestCase):
+    def build_rerouted_graph(self) -> Graph:
+        """
+        Begin -> Exec Reroute -> Exec Reroute -> Write Variable, the value comes from Read Variable through two
+        Reroute nodes. Branch and its Write Variable are not connected to Begin.
+        """
+        begin_node = BeginNode()
+        exec_reroutes = [ExecRerouteNode(), ExecRerouteNode()]
+        read_node = ReadVariableNode()
+        read_node.argument_pin("variable").set_value("x")
+        reroutes = [RerouteNode(), RerouteNode()]
+        add_node = AddNode()
+        add_node.argument_pin("b").set_value(1)
+        write_node = WriteVariableNode()
+        write_node.argument_pin("variable").set_value("x")
+
+        begin_node.output_flow_pin("exec_out").connect(exec_reroutes[0].input_flow_pin("exec_in"))
+        exec_reroutes[0].output_flow_pin("exec_out").connect(exec_reroutes[1].input_flow_pin("exec_in"))
+        exec_reroutes[1].output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+        read_node.output_pin("value").connect(reroutes[0].argument_pin("in"))
+        reroutes[0].output_pin("out").connect(reroutes[1].argument_pin("in"))
+        reroutes[1].output_pin("out").connect(add_node.argument_pin("a"))
+        add_node.output_pin("result").connect(write_node.argument_pin("value"))
+
+        branch_node = BranchNode()
+        dead_write_node = WriteVariableNode()
+        dead_write_node.argument_pin("variable").set_value("x")
+        branch_node.output_flow_pin("exec_true").connect(dead_write_node.input_flow_pin("exec_in"))
+        reroutes[1].output_pin("out").connect(dead_write_node.argument_pin("value"))
+
+        return Graph(begin_node, (begin_node, *exec_reroutes, read_node, *reroutes, add_node, write_node,
+                                  branch_node, dead_write_node), (GraphVariable("x", int, 41),))
+
+    def test_elide_reroutes(self):
+        graph = self.build_rerouted_graph()
+        self.assertEqual(4, elide_reroutes(graph))
+        self.assertFalse(any(node.REROUTE for node in graph.nodes))
+        self.assertIs(graph.nodes[3], graph.main_node.output_flow_pin("exec_out").destination_pin.parent_node)
+        self.assertEqual(42, graph.execute().variable("x"))
+
+    def test_remove_dead_nodes(self):
+        graph = self.build_rerouted_graph()
+        self.assertEqual(2, remove_dead_nodes(graph))
+        self.assertEqual(42, graph.execute().variable("x"))
+
+    def test_default_pipeline(self):
+        graph = self.build_rerouted_graph()
+        report = Optimizer().optimize(graph)
+        self.assertEqual({"elide_reroutes": 4, "fold_constants": 0, "eliminate_common_subexpressions": 0,
+                          "remove_dead_nodes": 2}, report)
+        self.assertEqual(4, len(graph.nodes))
+        self.assertEqual(42, graph.execute().variable("x"))
+
+    def test_register_pass(self):
+        self.addCleanup(PASSES.remove, ("count_nodes", len))
+        register_pass("count_nodes", len, before="fold_constants")
+        self.assertEqual(["elide_reroutes", "count_nodes"], [name for name, _ in Optimizer().passes[:2]])
+        with self.assertRaises(ValueError):
+            register_pass("count_nodes", len)
+
+
+if __name__ == '__main__':
+    unittest.main()
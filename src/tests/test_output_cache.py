@@ -0,0 +1,175 @@
+import os
+import tempfile
+import unittest
+
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import WriteVariableNode
+from output_cache import OutputCache
+from pins import BaseFunctionNode, Graph, GraphVariable, InputArgumentPin, OutputArgumentPin
+
+
+class SlowSquareNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.SlowSquareNode"
+    IS_PURE = True
+    CACHE_OUTPUTS = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="x", name="X", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
+    executions = 0
+
+    def execute(self):
+        SlowSquareNode.executions += 1
+        self.output_pin("result").set_value(self.argument_pin("x").value ** 2)
+
+
+class SlowIncrementNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.SlowIncrementNode"
+    CACHE_OUTPUTS = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="x", name="X", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
+    executions = 0
+
+    def execute(self):
+        SlowIncrementNode.executions += 1
+        self.output_pin("result").set_value(self.argument_pin("x").value + 1)
+
+
+def build_graph(x: int) -> Graph:
+    """
+    Begin -> Slow Increment (Slow Square x) -> Write Variable "result"
+    """
+    begin_node = BeginNode()
+    square_node = SlowSquareNode()
+    square_node.argument_pin("x").set_value(x)
+    increment_node = SlowIncrementNode()
+    write_node = WriteVariableNode()
+    write_node.argument_pin("variable").set_value("result")
+
+    begin_node.output_flow_pin("exec_out").connect(increment_node.input_flow_pin("exec_in"))
+    increment_node.output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+    square_node.output_pin("result").connect(increment_node.argument_pin("x"))
+    increment_node.output_pin("result").connect(write_node.argument_pin("value"))
+    return Graph(begin_node, (begin_node, square_node, increment_node, write_node), (GraphVariable("result", int, 0),))
+
+
+class TestOutputCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        SlowSquareNode.executions = 0
+        SlowIncrementNode.executions = 0
+
+    def test_reruns_are_served_from_cache(self):
+        cache = OutputCache(directory=self.directory)
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual((1, 1), (SlowSquareNode.executions, SlowIncrementNode.executions))
+
+        self.assertEqual(17, build_graph(4).execute(output_cache=cache).variable("result"))
+        self.assertEqual((2, 2), (SlowSquareNode.executions, SlowIncrementNode.executions))
+        self.assertEqual({"hits": 2, "misses": 4, "entries": 4},
+                         {key: cache.stats()[key] for key in ("hits", "misses", "entries")})
+
+    def test_not_cached_without_cache(self):
+        build_graph(3).execute()
+        build_graph(3).execute()
+        self.assertEqual((2, 2), (SlowSquareNode.executions, SlowIncrementNode.executions))
+
+    def test_disk_tier(self):
+        build_graph(3).execute(output_cache=OutputCache(directory=self.directory))
+        # A new process starts with an empty memory tier
+        cache = OutputCache(directory=self.directory)
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual((1, 1), (SlowSquareNode.executions, SlowIncrementNode.executions))
+        self.assertEqual(2, cache.stats()["diskHits"])
+
+    def test_eviction(self):
+        key = OutputCache.key("node", [1])
+        self.assertEqual(key, OutputCache.key("node", [1]))
+        self.assertNotEqual(key, OutputCache.key("node", [2]))
+        self.assertIsNone(OutputCache.key("node", [lambda: None]))
+
+        cache = OutputCache(max_bytes=100, directory=self.directory, max_disk_bytes=250)
+        for i in range(3):
+            cache.put(OutputCache.key("node", [i]), [bytes(80)])
+        stats = cache.stats()
+        self.assertEqual((1, 2), (stats["entries"], stats["evictions"]))
+        self.assertEqual((2, 1), (stats["diskEntries"], stats["diskEvictions"]))
+        self.assertFalse(os.path.exists(cache.path(OutputCache.key("node", [0]))))
+        self.assertIsNone(cache.get(OutputCache.key("node", [0])))
+        self.assertEqual([bytes(80)], cache.get(OutputCache.key("node", [1])))
+
+    def test_hits_are_copies(self):
+        cache = OutputCache(directory=None)
+        key = OutputCache.key("node", [1])
+        cache.put(key, [[1, 2]])
+        cache.get(key)[0].append(3)
+        self.assertEqual([[1, 2]], cache.get(key))
+
+    def test_unusable_directory(self):
+        path = os.path.join(self.directory, "file")
+        with open(path, "w"):
+            pass
+        cache = OutputCache(directory=path)
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual((1, 1), (SlowSquareNode.executions, SlowIncrementNode.executions))
+        self.assertEqual(1, cache.stats()["diskErrors"])
+
+    def test_shared_directory_is_not_used(self):
+        os.chmod(self.directory, 0o777)
+        cache = OutputCache(directory=self.directory)
+        self.assertEqual(10, build_graph(3).execute(output_cache=cache).variable("result"))
+        self.assertEqual([], [files for _, _, files in os.walk(self.directory) if files])
+        self.assertEqual(1, cache.stats()["diskErrors"])
+
+    def test_created_private(self):
+        directory = os.path.join(self.directory, "node_outputs")
+        build_graph(3).execute(output_cache=OutputCache(directory=directory))
+        self.assertEqual(0, os.stat(directory).st_mode & 0o077)
+
+    def test_unreadable_files_are_misses(self):
+        cache = OutputCache(directory=self.directory)
+        key = OutputCache.key("node", [1])
+        cache.put(key, [1])
+        with open(cache.path(key), "wb") as f:
+            # Pickles of a class that no longer exists raise AttributeError
+            f.write(b"\x80\x04\x95\x12\x00\x00\x00\x00\x00\x00\x00\x8c\x08builtins\x8c\x07missing\x93.")
+        self.assertIsNone(OutputCache(directory=self.directory).get(key))
+
+    def test_versions_and_invalidation(self):
+        self.assertNotEqual(OutputCache.key("node", [1], "a"), OutputCache.key("node", [1], "b"))
+        self.assertTrue(OutputCache.node_version(SlowSquareNode))
+
+        cache = OutputCache(directory=self.directory)
+        build_graph(3).execute(output_cache=cache)
+        cache.invalidate([SlowSquareNode.ID])
+        self.assertEqual(1, cache.stats()["entries"])
+        build_graph(3).execute(output_cache=cache)
+        self.assertEqual((2, 1), (SlowSquareNode.executions, SlowIncrementNode.executions))
+
+        cache.clear()
+        self.assertEqual([], [files for _, _, files in os.walk(self.directory) if files])
+        build_graph(3).execute(output_cache=OutputCache(directory=self.directory))
+        self.assertEqual((3, 2), (SlowSquareNode.executions, SlowIncrementNode.executions))
+
+    def test_disk_budget_is_shared(self):
+        caches = [OutputCache(directory=self.directory, max_disk_bytes=250) for _ in range(2)]
+        for i in range(6):
+            caches[i % 2].put(OutputCache.key("node", [i]), [bytes(80)])
+        sizes = [os.path.getsize(os.path.join(directory, file_name))
+                 for directory, _, file_names in os.walk(self.directory) for file_name in file_names]
+        self.assertLessEqual(sum(sizes), 250)
+        self.assertEqual([bytes(80)], caches[0].get(OutputCache.key("node", [5])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from benchmarks.generators import StructureBuilder
+from benchmarks.pure_memoization import build_diamond_graph
+from bluepynt import Bluepynt, mapping
+from builtin import macros, nodes, pure_nodes
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, WriteVariableNode
+from bluepynt.parallel import ParallelEvaluator, PureBranches, loop_body, shutdown_process_pools
+from pins import BaseFunctionNode, Graph, GraphVariable, InputArgumentPin, OutputArgumentPin
+
+
+class SlowIdentityNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.SlowIdentityNode"
+    IS_PURE = True
+    COST = 1.0
+    IN_PINS = (
+        InputArgumentPin(pin_id="x", name="X", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
+    # Only passed by branches evaluated at the same time
+    barrier: threading.Barrier | None = None
+
+    def execute(self):
+        if SlowIdentityNode.barrier is not None:
+            SlowIdentityNode.barrier.wait()
+        self.output_pin("result").set_value(self.argument_pin("x").value)
+
+
+def build_graph(shared: bool = False) -> Graph:
+    """
+    Begin -> Write Variable "result" = Slow Identity (1) + Slow Identity (2), or (Slow Identity (1) + 1) +
+    (Slow Identity (1) + 2) when shared
+    """
+    begin_node = BeginNode()
+    left_node = SlowIdentityNode()
+    left_node.argument_pin("x").set_value(1)
+    right_node = SlowIdentityNode()
+    right_node.argument_pin("x").set_value(2)
+    add_node = AddNode()
+    write_node = WriteVariableNode()
+    write_node.argument_pin("variable").set_value("result")
+    nodes = [begin_node, left_node, right_node, add_node, write_node]
+
+    begin_node.output_flow_pin("exec_out").connect(write_node.input_flow_pin("exec_in"))
+    add_node.output_pin("result").connect(write_node.argument_pin("value"))
+    if not shared:
+        left_node.output_pin("result").connect(add_node.argument_pin("a"))
+        right_node.output_pin("result").connect(add_node.argument_pin("b"))
+    else:
+        for pin_id, value in (("a", 1), ("b", 2)):
+            branch_node = AddNode()
+            branch_node.argument_pin("b").set_value(value)
+            left_node.output_pin("result").connect(branch_node.argument_pin("a"))
+            branch_node.output_pin("result").connect(add_node.argument_pin(pin_id))
+            nodes.append(branch_node)
+    return Graph(begin_node, tuple(nodes), (GraphVariable("result", int, 0),))
+
+
+class TestParallelEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = ParallelEvaluator(max_workers=2)
+        self.addCleanup(self.evaluator.shutdown)
+        self.addCleanup(setattr, SlowIdentityNode, "barrier", None)
+
+    def test_branches_run_at_once(self):
+        # Evaluated one after another, the first branch would wait for the second one forever
+        SlowIdentityNode.barrier = threading.Barrier(2, timeout=5)
+        self.assertEqual(3, build_graph().execute(parallel=self.evaluator).variable("result"))
+        self.assertEqual(1, self.evaluator.stats()["dispatched"])
+
+    def test_shared_nodes_join_branches(self):
+        graph = build_graph(shared=True)
+        branches = PureBranches.split(graph.nodes[3])
+        self.assertEqual([2], [len(pins) for pins, _ in branches])
+        self.assertEqual(5, graph.execute(parallel=self.evaluator).variable("result"))
+        self.assertEqual(0, self.evaluator.stats()["dispatched"])
+
+    def test_cheap_branches_are_not_dispatched(self):
+        graph = build_diamond_graph(10)
+        with patch.object(AddNode, "execute", autospec=True, side_effect=AddNode.execute) as mock:
+            self.assertEqual(1024, graph.execute(parallel=self.evaluator).variable("result"))
+        self.assertEqual(10, mock.call_count)
+        self.assertEqual(0, self.evaluator.stats()["dispatched"])
+        # Nodes without costly sources are skipped before their branches are split
+        self.assertEqual({}, self.evaluator.plan_branches[graph.plan]._branches)
+
+        self.evaluator.min_cost = 0
+        with patch.object(SlowIdentityNode, "COST", 0):
+            self.assertEqual(3, build_graph().execute(parallel=self.evaluator).variable("result"))
+        self.assertEqual(1, self.evaluator.stats()["dispatched"])
+
+
+class ProcessIdNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.ProcessIdNode"
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="pid", name="Process id", argument_type=int),
+    )
+
+    def execute(self):
+        self.output_pin("pid").set_value(os.getpid())
+
+
+# Loaded by the worker processes of the loops (see bluepynt.parallel.process_pool)
+NODE_MAP = {ProcessIdNode.ID: ProcessIdNode}
+
+
+def build_loop_structure(result_node: str, result_pin: str, write_in_body: bool = False,
+                         last: tuple[str, str] | None = None) -> dict:
+    """
+    Begin -> Parallel For Each Loop (0 .. 19) -> Write Variable "results" = results (-> Write Variable "last" =
+    last), the body running Process Id (and Write Variable "last" = item)
+    """
+    builder = StructureBuilder()
+    builder.variable("factor", "int", 3)
+    builder.variable("last", "int", 0)
+    builder.variable("results", "list", [])
+    builder.node("ParallelForEachLoopNode", "loop", list=list(range(20)), workers=2, chunk_size=3)
+    builder.node("ReadVariableNode", "read", variable="factor")
+    builder.node("MultiplyNode", "multiply")
+    builder.nodes.append({"nodeId": ProcessIdNode.ID, "uniqueId": "pid"})
+    builder.node("WriteVariableNode", "write", variable="results")
+    builder.connect("begin", "exec_out", "loop", "exec_in")
+    builder.connect("loop", "exec_body", "pid", "exec_in")
+    builder.connect("loop", "item", "multiply", "a")
+    builder.connect("read", "value", "multiply", "b")
+    builder.connect(result_node, result_pin, "loop", "result")
+    builder.connect("loop", "exec_out", "write", "exec_in")
+    builder.connect("loop", "results", "write", "value")
+    if write_in_body:
+        builder.node("WriteVariableNode", "write_last", variable="last")
+        builder.connect("pid", "exec_out", "write_last", "exec_in")
+        builder.connect("loop", "item", "write_last", "value")
+    if last is not None:
+        builder.node("WriteVariableNode", "write_after", variable="last")
+        builder.connect("write", "exec_out", "write_after", "exec_in")
+        builder.connect(*last, "write_after", "value")
+    return builder.build()
+
+
+class TestParallelForEachLoop(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(patch.object(mapping, "NODE_MAP", {**macros.NODE_MAP, **nodes.NODE_MAP,
+                                                             **pure_nodes.NODE_MAP, ProcessIdNode.ID: ProcessIdNode}))
+        self.enterContext(patch.object(mapping, "LOADED_MODULES", [macros.__file__, nodes.__file__,
+                                                                   pure_nodes.__file__, __file__]))
+        self.addCleanup(shutdown_process_pools)
+
+    def run_loop(self, data: dict) -> tuple[list, int]:
+        frame = Bluepynt.load_graph_from_structure(data)[0].execute()
+        return frame.variable("results"), frame.variable("last")
+
+    def test_results_in_order(self):
+        results = self.run_loop(build_loop_structure("multiply", "result"))
+        self.assertEqual(([item * 3 for item in range(20)], 0), results)
+
+    def test_body_runs_in_worker_processes(self):
+        graph = Bluepynt.load_graph_from_structure(build_loop_structure("pid", "pid"))[0]
+        self.assertEqual(["pid"], [node.unique_id for node in loop_body(graph.node("loop"), "exec_body", ("result",))])
+        results, _ = self.run_loop(build_loop_structure("pid", "pid"))
+        self.assertEqual(20, len(results))
+        self.assertNotIn(os.getpid(), results)
+
+    def test_last_item_after_loop(self):
+        self.assertEqual(57, self.run_loop(build_loop_structure("multiply", "result", last=("multiply", "result")))[1])
+
+        data = build_loop_structure("pid", "pid", last=("pid", "pid"))
+        self.assertIsNone(loop_body(Bluepynt.load_graph_from_structure(data)[0].node("loop"), "exec_body", ("result",)))
+        self.assertEqual(([os.getpid()] * 20, os.getpid()), self.run_loop(data))
+
+    def test_shared_side_effects_run_sequentially(self):
+        data = build_loop_structure("pid", "pid", write_in_body=True)
+        self.assertIsNone(loop_body(Bluepynt.load_graph_from_structure(data)[0].node("loop"), "exec_body"))
+        self.assertEqual(([os.getpid()] * 20, 19), self.run_loop(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from builtin.macros import ForLoopNode
+from builtin.pure_nodes import AddNode, WriteVariableNode
+from pins import BaseFunctionNode, BaseMacroNode, GraphVariable, InputArgumentPin, InputFlowPin, \
+    OutputArgumentPin, OutputFlowPin, pin_schema
+
+
+class TestPinSchemas(unittest.TestCase):
+    def test_schemas_are_shared(self):
+        first, second = AddNode(), AddNode()
+        self.assertIs(first.argument_pin("a").schema, second.argument_pin("a").schema)
+        self.assertIs(first._in_index, second._in_index)
+        self.assertIsNot(first.argument_pin("a"), second.argument_pin("a"))
+
+    def test_type_change_is_local(self):
+        first, second = AddNode(), AddNode()
+        first.argument_pin("a").type = int
+        self.assertIs(int, first.argument_pin("a").type)
+        self.assertEqual(float | int, second.argument_pin("a").type)
+        self.assertEqual("a", first.argument_pin("a").pin_id)
+
+    def test_union_order_is_kept(self):
+        # Equal types, shared schemas would give the catalog the order of whichever was declared first
+        first = pin_schema("value", "Value", "", int | float)
+        second = pin_schema("value", "Value", "", float | int)
+        self.assertEqual(("int | float", "float | int"), (str(first.type), str(second.type)))
+        self.assertIs(first, pin_schema("value", "Value", "", int | float))
+
+    def test_compact_instances(self):
+        for instance in (AddNode(), ForLoopNode(), AddNode().argument_pin("a"), AddNode().output_pin("result"),
+                         GraphVariable("x", int, 0)):
+            self.assertFalse(hasattr(instance, "__dict__"), type(instance).__name__)
+
+
+class TestDeclaredNodes(unittest.TestCase):
+    def test_instances_own_their_pins(self):
+        first, second = ForLoopNode(), ForLoopNode()
+        self.assertIsNot(first.input_flow_pin("exec_in"), second.input_flow_pin("exec_in"))
+        self.assertIs(first, first.argument_pin("start").parent_node)
+        self.assertEqual(first.flow, first.input_flow_pin("exec_in").flow_method)
+        self.assertEqual(["exec_in", "variable", "value"], [pin.pin_id for pin in WriteVariableNode().in_pins])
+
+    def test_catalog_without_instances(self):
+        for node_class in (AddNode, WriteVariableNode, ForLoopNode):
+            self.assertEqual(node_class().to_json(), node_class.catalog_json())
+
+    def test_constructor_pins(self):
+        class ConstructedNode(BaseFunctionNode):
+            def __init__(self):
+                super().__init__("test.ConstructedNode", "Constructed",
+                                 in_pins=(InputArgumentPin(pin_id="a", name="A", argument_type=int),))
+
+            def execute(self):
+                pass
+
+        node = ConstructedNode()
+        self.assertEqual(["exec_in", "a"], [pin.pin_id for pin in node.in_pins])
+        self.assertEqual("Constructed", ConstructedNode.catalog_json()["name"])
+
+    def test_declarations_are_validated(self):
+        with self.assertRaises(Exception):
+            class FlowFunctionNode(BaseFunctionNode):
+                IN_PINS = (InputFlowPin(pin_id="exec_extra", name="", execute_method="execute"),)
+
+        with self.assertRaises(Exception):
+            class DuplicateNode(BaseFunctionNode):
+                IN_PINS = (InputArgumentPin(pin_id="a", name="A", argument_type=int),
+                           InputArgumentPin(pin_id="a", name="A", argument_type=int))
+
+        with self.assertRaises(Exception):
+            class UnknownMethodNode(BaseMacroNode):
+                IN_PINS = (InputFlowPin(pin_id="exec_in", name="", execute_method="missing"),)
+                OUT_PINS = (OutputFlowPin(pin_id="exec_out"),)
+
+        with self.assertRaises(Exception):
+            class UnknownDependencyNode(BaseFunctionNode):
+                IS_PURE = True
+                OUT_PINS = (OutputArgumentPin(pin_id="out", name="", argument_type=int, type_depends_on="in"),)
+
+
+if __name__ == '__main__':
+    unittest.main()
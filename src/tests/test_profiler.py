@@ -0,0 +1,81 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from builtin.macros import ForLoopNode
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, ReadVariableNode, WriteVariableNode
+import pins
+from pins import Graph, GraphVariable, Node
+from profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        begin_node = BeginNode()
+        begin_node.unique_id = "begin"
+        for_loop_node = ForLoopNode()
+        for_loop_node.unique_id = "loop"
+        for_loop_node.argument_pin("start").set_value(0)
+        for_loop_node.argument_pin("end").set_value(4)
+        for_loop_node.argument_pin("step").set_value(1)
+        read_node = ReadVariableNode()
+        read_node.unique_id = "read"
+        read_node.argument_pin("variable").set_value("sum")
+        add_node = AddNode()
+        add_node.unique_id = "add"
+        write_node = WriteVariableNode()
+        write_node.unique_id = "write"
+        write_node.argument_pin("variable").set_value("sum")
+
+        begin_node.output_flow_pin("exec_out").connect(for_loop_node.input_flow_pin("exec_in"))
+        for_loop_node.output_flow_pin("exec_body").connect(write_node.input_flow_pin("exec_in"))
+        read_node.output_pin("value").connect(add_node.argument_pin("a"))
+        for_loop_node.output_pin("i").connect(add_node.argument_pin("b"))
+        add_node.output_pin("result").connect(write_node.argument_pin("value"))
+
+        self.graph = Graph(begin_node, (begin_node, for_loop_node, read_node, add_node, write_node),
+                           (GraphVariable("sum", int, 0),))
+
+    def test_node_timings(self):
+        updates = []
+        profiler = Profiler(on_update=updates.append)
+        frame = profiler.run(self.graph)
+        self.assertEqual(10, frame.variable("sum"))
+
+        profiles = {profile["uniqueId"]: profile for profile in profiler.to_json()["nodes"]}
+        self.assertEqual({"begin": 1, "loop": 1, "read": 5, "add": 5, "write": 5},
+                         {unique_id: profile["calls"] for unique_id, profile in profiles.items()})
+        self.assertGreaterEqual(profiles["begin"]["inclusiveTime"], profiles["loop"]["inclusiveTime"])
+        self.assertLess(profiles["loop"]["exclusiveTime"], profiles["loop"]["inclusiveTime"])
+        self.assertGreater(profiles["write"]["lookupTime"], 0)
+        self.assertGreater(profiles["write"]["sanitizeTime"], 0)
+        self.assertEqual(profiler.to_json(), updates[-1])
+
+    def test_instrumentation_is_removed(self):
+        argument_pin = Node.argument_pin
+        Profiler().run(self.graph)
+        self.assertIs(argument_pin, Node.argument_pin)
+        self.assertEqual(0, pins._profiled_executions)
+        self.assertIsNone(self.graph.execute().profiler)
+
+    def test_concurrent_executions_are_not_profiled(self):
+        # The same (cached) graph executed unprofiled while the profiled execution runs
+        node_types = [type(node) for node in self.graph.nodes]
+        results = []
+        original = ReadVariableNode.execute
+
+        def execute(node):
+            if pins.current_frame().profiler is not None and not results:
+                with ThreadPoolExecutor(1) as executor:
+                    results.append(executor.submit(self.graph.execute).result().variable("sum"))
+                results.append([type(node) for node in self.graph.nodes])
+            original(node)
+
+        with patch.object(ReadVariableNode, "execute", execute):
+            profiler = Profiler()
+            profiler.run(self.graph)
+        self.assertEqual([10, node_types], results)
+        profiles = {profile["uniqueId"]: profile for profile in profiler.to_json()["nodes"]}
+        self.assertEqual(5, profiles["read"]["calls"])
+        self.assertGreater(sum(profile["lookupTime"] for profile in profiles.values()), 0)
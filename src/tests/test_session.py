@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.generators import StructureBuilder
+from bluepynt import mapping
+from bluepynt.builtin import macros, nodes, pure_nodes
+from bluepynt.session import GraphSession
+from pins import BaseFunctionNode, InputArgumentPin, OutputArgumentPin
+
+
+class CountedIncrementNode(BaseFunctionNode):
+    __slots__ = ()
+    ID = "test.CountedIncrementNode"
+    CACHE_OUTPUTS = True
+    IN_PINS = (
+        InputArgumentPin(pin_id="x", name="X", argument_type=int),
+    )
+    OUT_PINS = (
+        OutputArgumentPin(pin_id="result", name="Result", argument_type=int),
+    )
+    executions = 0
+
+    def execute(self):
+        CountedIncrementNode.executions += 1
+        self.output_pin("result").set_value(self.argument_pin("x").value + 1)
+
+
+def build_structure() -> StructureBuilder:
+    """
+    Begin -> Write Variable "result" = (1 + 2) + (3 + 4), then Write Variable "counter" = counter + (1 + 2)
+    """
+    builder = StructureBuilder()
+    builder.variable("result", "int", 0)
+    builder.variable("counter", "int", 0)
+    builder.node("AddNode", "left", a=1, b=2)
+    builder.node("AddNode", "right", a=3, b=4)
+    builder.node("AddNode", "sum")
+    builder.node("WriteVariableNode", "write", variable="result")
+    builder.node("ReadVariableNode", "read", variable="counter")
+    builder.node("AddNode", "increment")
+    builder.node("WriteVariableNode", "write_counter", variable="counter")
+    builder.connect("begin", "exec_out", "write", "exec_in")
+    builder.connect("left", "result", "sum", "a")
+    builder.connect("right", "result", "sum", "b")
+    builder.connect("sum", "result", "write", "value")
+    builder.connect("write", "exec_out", "write_counter", "exec_in")
+    builder.connect("read", "value", "increment", "a")
+    builder.connect("left", "result", "increment", "b")
+    builder.connect("increment", "result", "write_counter", "value")
+    return builder
+
+
+class TestGraphSession(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(patch.dict(mapping.NODE_MAP, {**macros.NODE_MAP, **nodes.NODE_MAP, **pure_nodes.NODE_MAP,
+                                                        CountedIncrementNode.ID: CountedIncrementNode}))
+        CountedIncrementNode.executions = 0
+        self.session = GraphSession(build_structure().build())
+        self.add_executions = self.enterContext(patch.object(pure_nodes.AddNode, "execute", autospec=True,
+                                                             side_effect=pure_nodes.AddNode.execute))
+
+    def run_session(self) -> tuple[dict, int]:
+        self.add_executions.reset_mock()
+        frame = self.session.execute()
+        return frame.to_json()["variables"], self.add_executions.call_count
+
+    def test_unchanged_nodes_are_reused(self):
+        # Writing "result" does not change anything "left" depends on, the increment reuses it
+        self.assertEqual(({"result": 10, "counter": 3}, 4), self.run_session())
+        # The increment depends on a variable, it is evaluated on every run
+        self.assertEqual(({"result": 10, "counter": 3}, 1), self.run_session())
+
+        self.session.apply([{"type": "setArgument", "uniqueId": "right", "pinId": "a", "value": 13}])
+        self.assertEqual({"right", "sum", "write"}, self.session.dirty)
+        self.assertEqual(({"result": 20, "counter": 3}, 3), self.run_session())
+        self.assertEqual(4, self.session.stats()["reused"])
+
+    def test_cached_impure_nodes_are_reused(self):
+        self.session.apply([
+            {"type": "addNode", "node": {"nodeId": CountedIncrementNode.ID, "uniqueId": "cached"}},
+            {"type": "disconnect", "fromNode": "increment", "fromPin": "result", "toNode": "write_counter",
+             "toPin": "value"},
+            {"type": "connect", "fromNode": "write", "fromPin": "exec_out", "toNode": "cached", "toPin": "exec_in"},
+            {"type": "connect", "fromNode": "cached", "fromPin": "exec_out", "toNode": "write_counter",
+             "toPin": "exec_in"},
+            {"type": "connect", "fromNode": "sum", "fromPin": "result", "toNode": "cached", "toPin": "x"},
+            {"type": "connect", "fromNode": "cached", "fromPin": "result", "toNode": "write_counter", "toPin": "value"},
+        ])
+        self.assertEqual({"result": 10, "counter": 11}, self.run_session()[0])
+        self.assertEqual({"result": 10, "counter": 11}, self.run_session()[0])
+        self.assertEqual(1, CountedIncrementNode.executions)
+
+        self.session.apply([{"type": "setArgument", "uniqueId": "right", "pinId": "a", "value": 13}])
+        self.assertEqual({"result": 20, "counter": 21}, self.run_session()[0])
+        self.assertEqual(2, CountedIncrementNode.executions)
+
+    def test_structural_edits(self):
+        self.run_session()
+        self.session.apply([
+            {"type": "addNode", "node": {"nodeId": pure_nodes.MultiplyNode.ID, "uniqueId": "double",
+                                         "arguments": {"b": 2}}},
+            {"type": "disconnect", "fromNode": "sum", "fromPin": "result", "toNode": "write", "toPin": "value"},
+            {"type": "connect", "fromNode": "sum", "fromPin": "result", "toNode": "double", "toPin": "a"},
+            {"type": "connect", "fromNode": "double", "fromPin": "result", "toNode": "write", "toPin": "value"},
+        ])
+        self.assertEqual(({"result": 20, "counter": 3}, 1), self.run_session())
+
+        self.session.apply([
+            {"type": "removeNode", "uniqueId": "write_counter"},
+            {"type": "setVariable", "variable": {"name": "result", "type": "int", "value": 0}},
+        ])
+        self.assertEqual(({"result": 20, "counter": 0}, 0), self.run_session())
+
+    def test_invalid_edits(self):
+        with self.assertRaises(ValueError):
+            self.session.apply([{"type": "removeNode", "uniqueId": "begin"}])
+        with self.assertRaises(ValueError):
+            self.session.apply([{"type": "disconnect", "fromNode": "right", "fromPin": "result", "toNode": "sum",
+                                 "toPin": "a"}])
+
+        self.session.apply([{"type": "connect", "fromNode": "read", "fromPin": "value", "toNode": "write",
+                             "toPin": "value"}])
+        self.session.apply([{"type": "setVariable", "variable": {"name": "counter", "type": "str", "value": ""}}])
+        with self.assertRaises(ValueError):
+            self.session.execute()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.generators import StructureBuilder
+from bluepynt import Bluepynt, mapping
+from bluepynt.builtin import macros, nodes, pure_nodes
+
+
+def build_structure(variable_type: str, value) -> StructureBuilder:
+    """
+    Begin -> Write Variable "result", the value is read from variable "x" through two Reroute nodes and passed
+    through Int To String.
+    """
+    builder = StructureBuilder()
+    builder.variable("x", variable_type, value)
+    builder.variable("result", "str", "")
+    builder.node("ReadVariableNode", "read", variable="x")
+    builder.node("RerouteNode", "reroute.0")
+    builder.node("RerouteNode", "reroute.1")
+    builder.node("IntToStringNode", "to_string")
+    builder.node("WriteVariableNode", "write", variable="result")
+    builder.connect("begin", "exec_out", "write", "exec_in")
+    builder.connect("read", "value", "reroute.0", "in")
+    builder.connect("reroute.0", "out", "reroute.1", "in")
+    builder.connect("reroute.1", "out", "to_string", "value")
+    builder.connect("to_string", "result", "write", "value")
+    return builder
+
+
+@patch.dict(mapping.NODE_MAP, {**macros.NODE_MAP, **nodes.NODE_MAP, **pure_nodes.NODE_MAP})
+class TestTypeInference(unittest.TestCase):
+    def test_resolves_any_pins(self):
+        graph = Bluepynt.load_graph_from_structure(build_structure("int", 5).build())[0]
+        self.assertIs(int, graph.node("read").output_pin("value").resolved_type)
+        self.assertIs(int, graph.node("reroute.1").argument_pin("in").inferred_type)
+        self.assertIs(int, graph.node("reroute.1").output_pin("out").inferred_type)
+        self.assertIs(str, graph.node("write").argument_pin("value").inferred_type)
+        self.assertEqual("5", graph.execute().variable("result"))
+
+    def test_rejects_incompatible_connection(self):
+        with self.assertRaises(ValueError):
+            Bluepynt.load_graph_from_structure(build_structure("str", "5").build())
+
+    def test_rejects_incompatible_variable_write(self):
+        builder = build_structure("int", 5)
+        builder.variables[1]["type"] = "int"
+        builder.variables[1]["value"] = 0
+        with self.assertRaises(ValueError):
+            Bluepynt.load_graph_from_structure(builder.build())
+
+    def test_for_each_item(self):
+        builder = StructureBuilder()
+        builder.node("ForEachLoopNode", "loop", list=[1, 2, 3])
+        builder.node("RerouteNode", "reroute")
+        builder.connect("begin", "exec_out", "loop", "exec_in")
+        builder.connect("loop", "item", "reroute", "in")
+        graph = Bluepynt.load_graph_from_structure(builder.build())[0]
+        self.assertIs(int, graph.node("reroute").output_pin("out").inferred_type)
+
+    def test_unknown_types_stay_any(self):
+        builder = StructureBuilder()
+        builder.node("ForEachLoopNode", "loop", list=[1, "a"])
+        builder.node("RerouteNode", "reroute")
+        builder.connect("begin", "exec_out", "loop", "exec_in")
+        builder.connect("loop", "item", "reroute", "in")
+        graph = Bluepynt.load_graph_from_structure(builder.build())[0]
+        self.assertIsNone(graph.node("reroute").output_pin("out").inferred_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from typing import Any
+
+from builtin.nodes import BeginNode
+from builtin.pure_nodes import AddNode, IntToStringNode, ReadVariableNode, WriteVariableNode
+from pins import Graph, GraphVariable, is_assignable, make_validator, sanitize_value
+from test_execution_frame import build_sum_graph
+
+
+class TestValidators(unittest.TestCase):
+    def test_validators_are_shared(self):
+        self.assertIs(make_validator(int), make_validator(int))
+        self.assertIs(make_validator(float | int), make_validator(int | float))
+        self.assertIs(AddNode().argument_pin("a").validator, AddNode().argument_pin("b").validator)
+
+    def test_conversions(self):
+        self.assertEqual(3, sanitize_value("3", int))
+        self.assertEqual(2.5, sanitize_value("2.5", float))
+        self.assertEqual(2.5, sanitize_value("2.5", float | int))
+        self.assertIsInstance(sanitize_value("2", float | int), int)
+        self.assertEqual([1], sanitize_value([1], list[Any]))
+        self.assertEqual("3", sanitize_value("3", Any))
+        with self.assertRaises(ValueError):
+            sanitize_value("3", list)
+        with self.assertRaises(ValueError):
+            sanitize_value(3, str)
+
+    def test_type_change_updates_validator(self):
+        variable = GraphVariable("x", int, 0)
+        variable.type = str
+        variable.set_value("3")
+        self.assertEqual("3", variable.value)
+
+    def test_is_assignable(self):
+        self.assertTrue(is_assignable(int, float | int))
+        self.assertTrue(is_assignable(int, float))
+        self.assertTrue(is_assignable(Any, int))
+        self.assertTrue(is_assignable(float | int, int))
+        self.assertFalse(is_assignable(str, int))
+        self.assertFalse(is_assignable(list[Any], str))
+
+
+class TestTrustedGraphs(unittest.TestCase):
+    def test_trusted_execution(self):
+        graph = build_sum_graph(10)
+        graph.trust()
+        frame = graph.execute()
+        self.assertFalse(frame.validate)
+        self.assertEqual(55, frame.variable("sum"))
+
+    def test_values_are_not_validated(self):
+        graph = build_sum_graph(3)
+        # The Add node produces ints, a trusted graph believes the declared type
+        graph.nodes[3].output_pin("result").type = str
+        with self.assertRaises(ValueError):
+            graph.execute()
+
+        graph.trust()
+        self.assertEqual(6, graph.execute().variable("sum"))
+
+    def test_incompatible_connection(self):
+        begin_node = BeginNode()
+        to_string_node = IntToStringNode()
+        add_node = AddNode()
+        to_string_node.output_pin("result").connect(add_node.argument_pin("a"))
+        graph = Graph(begin_node, (begin_node, to_string_node, add_node))
+        with self.assertRaises(ValueError):
+            graph.trust()
+        self.assertFalse(graph.trusted)
+
+    def test_invalid_default_value(self):
+        begin_node = BeginNode()
+        read_node = ReadVariableNode()
+        write_node = WriteVariableNode()
+        graph = Graph(begin_node, (begin_node, read_node, write_node), (GraphVariable("x", int, "text"),))
+        with self.assertRaises(ValueError):
+            graph.trust()
+
+
+if __name__ == '__main__':
+    unittest.main()
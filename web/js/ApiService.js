@@ -16,10 +16,13 @@ export class ApiService {
     return await this.fetchApi('/api/nodes');
   }
 
-  /** @param {Graph} graph */
+  /**
+   * Queues the graph for execution and returns the created job, progress is sent over the websocket.
+   * @param {Graph} graph
+   */
   async executeGraph(graph) {
     const json = graph.toJson();
-    const response = await this.fetchApi('/api/execute', {
+    return await this.fetchApi('/api/execute', {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -29,4 +32,53 @@ export class ApiService {
       }),
     });
   }
+
+  /**
+   * Starts a live session of the graph for the websocket client, replacing its previous session.
+   * @param {Graph} graph
+   * @param {string} clientId sid of the websocket
+   */
+  async startSession(graph, clientId) {
+    return await this.fetchApi(`/api/session?clientId=${clientId}`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        "graphs": [graph.toJson()]
+      }),
+    });
+  }
+
+  /**
+   * Sends edits made since the last call - addNode, removeNode, setArgument, connect, disconnect, setVariable.
+   * @param {Object[]} edits
+   * @param {string} clientId
+   */
+  async editSession(edits, clientId) {
+    return await this.fetchApi(`/api/session/edits?clientId=${clientId}`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({edits}),
+    });
+  }
+
+  /**
+   * Runs the session graph. Pure nodes computed from literal values and nodes with CACHE_OUTPUTS whose inputs did
+   * not change are reused from the last run, every other node runs again.
+   * @param {string} clientId
+   */
+  async executeSession(clientId) {
+    return await this.fetchApi(`/api/session/execute?clientId=${clientId}`, {method: "POST"});
+  }
+
+  async getJob(jobId) {
+    return await this.fetchApi(`/api/jobs/${jobId}`);
+  }
+
+  async getJobResult(jobId) {
+    return await this.fetchApi(`/api/jobs/${jobId}/result`);
+  }
 }
\ No newline at end of file